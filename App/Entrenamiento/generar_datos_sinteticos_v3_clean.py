@@ -2,6 +2,10 @@ import pandas as pd
 import numpy as np
 from sklearn.utils import resample
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "comun"))
+from derivacion_features import derivar_dataframe
 
 # === CONFIGURACIÓN ===
 INPUT_PATH = "data/datos_balanceados_limpio.csv"
@@ -74,9 +78,8 @@ df_sintetico = pd.concat(data_final).sample(frac=1, random_state=42).reset_index
 # === CALCULAR FEATURES DERIVADAS ===
 print("🧠 Calculando características derivadas...")
 
-df_sintetico["magnitud_acc"] = np.sqrt(df_sintetico["ax"]**2 + df_sintetico["ay"]**2 + df_sintetico["az"]**2)
-df_sintetico["velocidad_ang"] = np.sqrt(df_sintetico["gx"]**2 + df_sintetico["gy"]**2 + df_sintetico["gz"]**2)
-df_sintetico["energia_mov"] = df_sintetico["magnitud_acc"] * df_sintetico["velocidad_ang"]
+# Módulo compartido con la API y los clientes: misma derivación en entrenamiento y servicio
+df_sintetico = derivar_dataframe(df_sintetico)
 
 # === LIMPIEZA FINAL ===
 df_sintetico = df_sintetico.loc[:, ~df_sintetico.columns.str.contains('^Unnamed')]
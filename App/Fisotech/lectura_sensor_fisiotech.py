@@ -1,27 +1,58 @@
-import serial
-import requests
 import time
-import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "comun"))
+from cliente_api import ClienteFisiotech, EnviadorLotes
+from clasificador_local import ClienteLocal
+from trama_serial import DecodificadorTramas, leer_bloque
+from fuentes_muestras import abrir_puerto
 
 # Configuración del puerto serial (ajusta si no es COM3)
-PORT = "COM3"
+PORT = os.environ.get("FISIOTECH_PUERTO", "COM3")  # "sim:data/datos_reales.csv?hz=..." sin Arduino
 BAUD_RATE = 9600
-API_URL = "http://127.0.0.1:5000/predict"
+FORMATO_SERIAL = os.environ.get("FISIOTECH_FORMATO_SERIAL", "csv")  # "binario": tramas de comun/trama_serial.py
+INFERENCIA = os.environ.get("FISIOTECH_INFERENCIA", "api").lower()  # "local": modelo v22 en este proceso
+API_URL = "http://127.0.0.1:5000"
+MAX_LOTE = 16       # muestras por /predict_batch
+ESPERA_LOTE_MS = 100  # latencia máxima añadida por juntar muestras
 
 print("🚀 Iniciando lectura del Arduino (modo simulación)...")
 print("📡 Conectando al puerto", PORT)
 
 # Intentar conexión serial
 try:
-    arduino = serial.Serial(PORT, BAUD_RATE, timeout=1)
+    arduino = abrir_puerto(PORT, BAUD_RATE, timeout=1)
     time.sleep(2)
     print("✅ Conectado correctamente al Arduino.\n")
 except Exception as e:
     print("❌ Error al conectar con Arduino:", e)
     exit()
 
+
+def mostrar(_, resultado):
+    if "error" in resultado:
+        print("⚠️ Error en la API:", resultado["error"])
+        return
+    print(f"🧩 Movimiento: {resultado['prediccion']:<10} | Confianza: {resultado['confianza']:.3f}")
+
+
+cliente = ClienteLocal() if INFERENCIA == "local" else ClienteFisiotech(API_URL)
+enviador = EnviadorLotes(cliente, mostrar, max_lote=MAX_LOTE, espera_ms=ESPERA_LOTE_MS)
+decodificador = DecodificadorTramas()
+
 while True:
     try:
+        if FORMATO_SERIAL == "binario":
+            # Todas las tramas disponibles de una vez, sin decode/split/float por línea
+            perdidas = decodificador.contadores["perdidas"]
+            _, canales = leer_bloque(arduino, decodificador)
+            if decodificador.contadores["perdidas"] > perdidas:
+                print(f"⚠️ Tramas perdidas: {decodificador.contadores['perdidas'] - perdidas}")
+            for valores in canales.tolist():
+                enviador.agregar(valores)
+            continue
+
         # Leer línea desde Arduino
         linea = arduino.readline().decode('utf-8').strip()
 
@@ -34,26 +65,18 @@ while True:
         if len(valores) != 7:
             continue
 
-        ax, ay, az, gx, gy, gz, intensidad = valores
-
-        # Calcular features derivadas
-        magnitud_acc = math.sqrt(ax**2 + ay**2 + az**2)
-        velocidad_ang = math.sqrt(gx**2 + gy**2 + gz**2)
-        energia_mov = magnitud_acc * velocidad_ang
-
-        features = [ax, ay, az, gx, gy, gz, intensidad, magnitud_acc, velocidad_ang, energia_mov]
-
-        # Enviar a la API IA v22
-        response = requests.post(API_URL, json={"features": features})
-        data = response.json()
-
-        pred = data.get("prediccion", "?")
-        conf = data.get("confianza", 0.0)
-
-        print(f"🧩 Movimiento: {pred:<10} | Confianza: {conf:.3f}")
+        # Enviar los 7 canales crudos: la API v22 calcula magnitud_acc, velocidad_ang y energia_mov
+        enviador.agregar(valores)
 
     except KeyboardInterrupt:
+        enviador.cerrar()
+        estadisticas = cliente.estadisticas()
         print("\n🛑 Lectura detenida por el usuario.")
+        print(f"📊 {estadisticas['filas']} muestras en {estadisticas['llamadas']} llamadas | "
+              f"p50 {estadisticas['latencia_ms']['p50']:.1f} ms | p99 {estadisticas['latencia_ms']['p99']:.1f} ms | "
+              f"reintentos {estadisticas['reintentos']} | descartadas {enviador.descartadas}")
+        if FORMATO_SERIAL == "binario":
+            print(f"📡 Tramas: {decodificador.contadores}")
         break
     except Exception as e:
         print("⚠️ Error en lectura:", e)
@@ -1,29 +1,21 @@
 import tkinter as tk
 from tkinter import ttk
-import threading
-import serial
-import requests
-import joblib
-import time
-import math
+import os
+import sys
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "comun"))
+from lectura_dashboard import LecturaDashboard, HZ_SENSOR, MUESTRAS_VENTANA, VENTANA_S
 
 # === CONFIGURACIÓN ===
-PORT = "COM3"
+PORT = os.environ.get("FISIOTECH_PUERTO", "COM3")  # "sim:data/datos_reales.csv?hz=..." sin Arduino
 BAUDRATE = 9600
-API_URL = "http://127.0.0.1:5000/predict"
-scaler = joblib.load("models/scaler_v22.pkl")
-
-arduino = None
-is_running = False
-
-# === HISTORIAL ===
-hist_size = 50
-intensity_history = deque(maxlen=hist_size)
-confidence_history = deque(maxlen=hist_size)
-movement_history = deque(maxlen=5)
+FORMATO_SERIAL = os.environ.get("FISIOTECH_FORMATO_SERIAL", "csv")  # "binario": tramas de comun/trama_serial.py
+# Modo de inferencia (FISIOTECH_INFERENCIA) y lotes: comun/lectura_dashboard.py
+hist_size = MUESTRAS_VENTANA  # últimos VENTANA_S segundos en las gráficas y en el diagnóstico
+eje_x = np.arange(hist_size) / HZ_SENSOR  # segundos
 
 # === INTERFAZ PRINCIPAL ===
 root = tk.Tk()
@@ -86,11 +78,11 @@ ax2.set_facecolor("#101830")
 
 ax1.set_title("📈 Intensidad del Movimiento", color="#00FFFF")
 ax1.set_ylim(0, 2)
-ax1.set_xlim(0, hist_size)
+ax1.set_xlim(0, VENTANA_S)
 
 ax2.set_title("💪 Nivel de Confianza del Modelo", color="#00FFFF")
 ax2.set_ylim(0, 1)
-ax2.set_xlim(0, hist_size)
+ax2.set_xlim(0, VENTANA_S)
 
 line1, = ax1.plot([], [], color="#00FFAA", lw=2)
 line2, = ax2.plot([], [], color="#FFFF00", lw=2)
@@ -102,59 +94,20 @@ canvas.get_tk_widget().pack(fill="both", expand=True)
 
 # === FUNCIONES ===
 def conectar_arduino():
-    global arduino, is_running
     try:
-        arduino = serial.Serial(PORT, BAUDRATE)
-        time.sleep(2)
+        lectura.conectar()
         status_label.config(text="✅ Conectado a Arduino", fg="lime")
-        is_running = True
-        threading.Thread(target=leer_datos, daemon=True).start()
         actualizar_graficas()
     except Exception as e:
         status_label.config(text=f"❌ Error: {e}", fg="red")
 
 
 def desconectar_arduino():
-    global is_running
-    is_running = False
-    if arduino and arduino.is_open:
-        arduino.close()
+    if lectura.desconectar():
         status_label.config(text="🔌 Desconectado", fg="orange")
 
 
-def leer_datos():
-    global is_running
-    while is_running:
-        try:
-            line = arduino.readline().decode(errors="ignore").strip()
-            if not line or "," not in line:
-                continue
-            valores = [float(x) for x in line.split(",")]
-            if len(valores) < 7:
-                continue
-
-            ax, ay, az, gx, gy, gz, intensidad = valores
-            magnitud_acc = math.sqrt(ax**2 + ay**2 + az**2)
-            velocidad_ang = math.sqrt(gx**2 + gy**2 + gz**2)
-            energia_mov = magnitud_acc * velocidad_ang
-
-            features = [ax, ay, az, gx, gy, gz, intensidad, magnitud_acc, velocidad_ang, energia_mov]
-            features_scaled = scaler.transform([features])[0].tolist()
-
-            r = requests.post(API_URL, json={"features": features_scaled})
-            data = r.json()
-            pred = data.get("prediccion", "?").upper()
-            conf = float(data.get("confianza", 0.0))
-
-            actualizar_ui(pred, conf, intensidad)
-            time.sleep(0.3)
-
-        except Exception as e:
-            status_label.config(text=f"⚠️ Error: {e}", fg="red")
-            time.sleep(0.5)
-
-
-def actualizar_ui(pred, conf, intensidad):
+def actualizar_ui(pred, conf):
     mov_label.config(text=f"🧩 Movimiento: {pred}")
     conf_label.config(text=f"💪 Confianza: {conf:.3f}")
 
@@ -169,24 +122,28 @@ def actualizar_ui(pred, conf, intensidad):
     else:
         progress.configure(style="Rojo.Horizontal.TProgressbar")
 
-    confidence_history.append(conf)
-    intensity_history.append(intensidad)
-    movement_history.append(pred)
-
 
 def actualizar_graficas():
-    if is_running:
-        line1.set_data(range(len(intensity_history)), list(intensity_history))
-        line2.set_data(range(len(confidence_history)), list(confidence_history))
-        ax1.set_xlim(0, hist_size)
-        ax2.set_xlim(0, hist_size)
+    if lectura.activa:
+        # Vistas del historial, sin copias a listas
+        intensidades = historial.ultimas(hist_size, "intensidad")
+        line1.set_data(eje_x[:len(intensidades)], intensidades)
+        line2.set_data(eje_x[:len(intensidades)], historial.ultimas(hist_size, "confianza"))
+        ax1.set_xlim(0, VENTANA_S)
+        ax2.set_xlim(0, VENTANA_S)
         canvas.draw()
     root.after(500, actualizar_graficas)
 
 
+# Lectura del sensor y clasificación en segundo plano; los widgets solo se tocan desde el hilo de Tk
+lectura = LecturaDashboard(root, actualizar_ui, lambda texto, color: status_label.config(text=texto, fg=color),
+                           PORT, BAUDRATE, FORMATO_SERIAL)
+historial = lectura.historial
+
+
 # === CIERRE SEGURO ===
 def cerrar_app():
-    desconectar_arduino()
+    lectura.cerrar()
     root.destroy()
 
 
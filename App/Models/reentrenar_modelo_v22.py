@@ -1,12 +1,15 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
-from tensorflow.keras import layers, models
 import joblib
 import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+from extractor_numpy import ExtractorNumpy
+from bosque_compilado import BosqueCompilado
+from paquete_modelo import escribir_paquete
+from cascada import PrimeraEtapa, calibrar_temperatura, elegir_umbral
 
 # === CONFIGURACIÓN ===
 DATA_PATH = "data/datos_sinteticos_v3.csv"
@@ -14,6 +17,10 @@ MODEL_RF_PATH = "models/modelo_rf_v22.pkl"
 MODEL_NN_PATH = "models/modelo_nn_v22.h5"
 ENCODER_PATH = "models/encoder_v22.pkl"
 SCALER_PATH = "models/scaler_v22.pkl"
+MODEL_BUNDLE_PATH = "models/modelo_v22.fisio"
+CASCADA_PATH = "models/cascada_v22.npz"
+REPORTE_CASCADA_PATH = "reportes/cascada_v22.txt"
+TOLERANCIA_CASCADA = 0.005  # caída de precisión máxima aceptada por salir antes
 
 np.random.seed(42)
 
@@ -32,6 +39,14 @@ if not all(c in data.columns for c in required_cols):
 
 print(f"✅ Dataset cargado correctamente: {len(data)} muestras")
 
+# === IMPORTS PESADOS (tras validar el dataset: un CSV ausente falla sin cargar TensorFlow) ===
+from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from tensorflow.keras import layers, models
+
 # === PREPROCESAMIENTO ===
 X = data.drop(columns=["etiqueta"])
 y = data["etiqueta"]
@@ -91,17 +106,74 @@ print(classification_report(y_test, preds, target_names=encoder.classes_))
 print("🧩 Matriz de confusión:")
 print(confusion_matrix(y_test, preds))
 
+# === CASCADA: PRIMERA ETAPA BARATA CON SALIDA TEMPRANA ===
+print("\n⚡ Entrenando primera etapa de la cascada (regresión logística sobre las 10 features)...")
+primera = PrimeraEtapa.desde_sklearn(LogisticRegression(max_iter=2000).fit(X_train, y_train))
+
+# Mitad del test calibra temperatura y umbral; la otra mitad solo se usa para el informe
+mitad = len(X_test) // 2
+X_cal, y_cal, preds_cal = X_test[:mitad], y_test[:mitad], preds[:mitad]
+X_inf, y_inf, preds_inf = X_test[mitad:], y_test[mitad:], preds[mitad:]
+
+primera.temperatura = calibrar_temperatura(primera.logits(X_cal), y_cal)
+proba_cal = primera.predict_proba(X_cal)
+primera.umbral = elegir_umbral(proba_cal.max(axis=1), proba_cal.argmax(axis=1) == y_cal,
+                               preds_cal == y_cal, TOLERANCIA_CASCADA)
+
+proba_inf = primera.predict_proba(X_inf)
+salida_temprana = proba_inf.max(axis=1) >= primera.umbral
+preds_cascada = np.where(salida_temprana, proba_inf.argmax(axis=1), preds_inf)
+acc_hibrido = accuracy_score(y_inf, preds_inf)
+acc_cascada = accuracy_score(y_inf, preds_cascada)
+
+# Latencia por muestra en el camino de servicio (extractor NumPy + bosque compilado), fila a fila
+extractor_np = ExtractorNumpy.desde_keras(nn)
+bosque = BosqueCompilado.desde_sklearn(rf)
+n_tiempos = min(300, len(X_inf))
+t0 = time.perf_counter()
+for fila in X_inf[:n_tiempos, None]:
+    bosque.predict_proba(extractor_np.predict(fila))
+t_hibrido = (time.perf_counter() - t0) / n_tiempos
+t0 = time.perf_counter()
+for fila in X_inf[:n_tiempos, None]:
+    if primera.predict_proba(fila).max() < primera.umbral:
+        bosque.predict_proba(extractor_np.predict(fila))
+t_cascada = (time.perf_counter() - t0) / n_tiempos
+
+reporte_cascada = (
+    f"Umbral de confianza: {primera.umbral:.3f} (temperatura {primera.temperatura:.3f}, "
+    f"tolerancia {TOLERANCIA_CASCADA * 100:.1f} %)\n"
+    f"Salidas tempranas: {salida_temprana.mean() * 100:.1f} % de {len(X_inf)} muestras\n"
+    f"Precisión híbrido: {acc_hibrido:.4f} | cascada: {acc_cascada:.4f} | "
+    f"delta: {(acc_cascada - acc_hibrido) * 100:+.2f} puntos\n"
+    f"Latencia media por muestra: híbrido {t_hibrido * 1000:.3f} ms | cascada {t_cascada * 1000:.3f} ms | "
+    f"ahorro {(t_hibrido - t_cascada) * 1000:.3f} ms ({(1 - t_cascada / t_hibrido) * 100:.1f} %)\n"
+)
+print("\n📉 RESULTADOS DE LA CASCADA")
+print(reporte_cascada)
+
 # === GUARDAR MODELOS Y ARTEFACTOS ===
 os.makedirs("export", exist_ok=True)
+os.makedirs("reportes", exist_ok=True)
+# La cascada se escribe primero: la API recarga en caliente cuando cambian los cuatro artefactos siguientes
+primera.guardar(CASCADA_PATH)
+with open(REPORTE_CASCADA_PATH, "w", encoding="utf-8") as f:
+    f.write(reporte_cascada)
 nn.save(MODEL_NN_PATH)
 joblib.dump(rf, MODEL_RF_PATH)
 joblib.dump(encoder, ENCODER_PATH)
 joblib.dump(scaler, SCALER_PATH)
 
+# === PAQUETE ÚNICO MAPEABLE PARA SERVIR SIN TENSORFLOW ===
+escribir_paquete(MODEL_BUNDLE_PATH, scaler, extractor_np, bosque, encoder, list(X.columns))
+
 print("\n💾 Modelos y transformadores guardados exitosamente:")
 print(f" - Red neuronal: {MODEL_NN_PATH}")
 print(f" - Random Forest: {MODEL_RF_PATH}")
 print(f" - Encoder: {ENCODER_PATH}")
 print(f" - Scaler: {SCALER_PATH}")
+print(f" - Paquete de servicio: {MODEL_BUNDLE_PATH}")
+print(f" - Cascada (primera etapa): {CASCADA_PATH}")
+print(f" - Informe de la cascada: {REPORTE_CASCADA_PATH}")
 
 print("\n🎉 Entrenamiento híbrido v22 completado correctamente.")
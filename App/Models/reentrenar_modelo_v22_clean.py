@@ -1,12 +1,5 @@
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from tensorflow.keras.models import Sequential, Model
-from tensorflow.keras.layers import Dense, Dropout, Input
-from tensorflow.keras.optimizers import Adam
-from sklearn.metrics import classification_report, confusion_matrix
 import joblib, os, sys
 
 DATA_PATH = "data/datos_sinteticos_v3_limpio.csv"
@@ -34,6 +27,15 @@ y = data["etiqueta"].values
 
 print(f"✅ Dataset con {X.shape[0]} muestras y {X.shape[1]} features")
 
+# === IMPORTS PESADOS (tras validar el dataset: un CSV ausente falla sin cargar TensorFlow) ===
+from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+from tensorflow.keras.models import Sequential, Model
+from tensorflow.keras.layers import Dense, Dropout, Input
+from tensorflow.keras.optimizers import Adam
+from sklearn.metrics import classification_report, confusion_matrix
+
 encoder = LabelEncoder()
 y_encoded = encoder.fit_transform(y)
 
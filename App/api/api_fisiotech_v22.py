@@ -1,75 +1,552 @@
-import pandas as pd
 import numpy as np
-from flask import Flask, request, jsonify
-import joblib, os
-from tensorflow.keras.models import load_model, Model
+from flask import Flask, request, jsonify, Response, stream_with_context, g
+import json
+import os
+import sys
+import time
+from extractor_numpy import ExtractorNumpy, cargar_o_exportar
+from extractor_cuantizado import ExtractorCuantizado, PRECISIONES
+from modelo_onnx import cargar_o_exportar_extractor, cargar_o_exportar_bosque
+from bosque_compilado import BosqueCompilado
+from planificador_lotes import PlanificadorLotes, ColaLlena, LatenciaExcedida
+from paquete_modelo import cargar_paquete, MODEL_BUNDLE_PATH
+from cache_predicciones import CachePredicciones
+from sesiones_streaming import RegistroSesiones
+from metricas import RegistroMetricas
+from formato_binario import MIME_BINARIO, ErrorFormato, decodificar_filas, codificar_respuesta
+from version_modelo import VersionModelo, VigilanteModelos, firma_archivos
+from registro_modelos import RegistroModelos, ModeloDesconocido, ClasificadorKeras
+from cascada import PrimeraEtapa, CASCADA_PATH
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "comun"))
+from derivacion_features import derivar_features, N_CANALES
 
 # === RUTAS ===
 MODEL_NN_PATH = "models/modelo_nn_v22.h5"
 MODEL_RF_PATH = "models/modelo_rf_v22.pkl"
 SCALER_PATH = "models/scaler_v22.pkl"
 ENCODER_PATH = "models/encoder_v22.pkl"
+EXTRACTOR_NPZ_PATH = "models/extractor_v22.npz"
+RUTAS_V22 = [MODEL_NN_PATH, MODEL_RF_PATH, SCALER_PATH, ENCODER_PATH, EXTRACTOR_NPZ_PATH]
+
+# Copia híbrida de reentrenar_modelo_v22_clean.py y modelos Keras finales (7 features crudas)
+RUTAS_V22_EXPORT = ["export/modelo_nn_v22.h5", "export/modelo_rf_v22.pkl", "export/scaler_v22.pkl",
+                    "export/encoder_v22.pkl", "export/extractor_v22.npz"]
+MODEL_FINAL_PATH = "export/modelo_final.keras"
+MODEL_FINAL_CALIBRADO_PATH = "export/modelo_final_calibrado.keras"
+SCALER_FINAL_PATH = "export/scaler_final.pkl"
+ENCODER_FINAL_PATH = "export/encoder_final.pkl"
+
+# === FUENTE DE LOS MODELOS ===
+# "artefactos": h5 + pickles de joblib | "paquete": modelo_v22.fisio mapeado en memoria (sin TensorFlow)
+FUENTE_MODELOS = os.environ.get("FISIOTECH_FUENTE", "artefactos").lower()
+if FUENTE_MODELOS not in ("artefactos", "paquete"):
+    raise ValueError(f"❌ FISIOTECH_FUENTE debe ser 'artefactos' o 'paquete', no '{FUENTE_MODELOS}'.")
+
+# === MOTOR DEL EXTRACTOR ===
+# "keras": Model.predict sobre modelo_nn_v22.h5 | "numpy": pesos Dense exportados, sin TensorFlow
+# "onnx": grafo extractor_v22.onnx en onnxruntime (modelo_onnx.py lo exporta)
+MOTOR_EXTRACTOR = os.environ.get("FISIOTECH_EXTRACTOR", "keras").lower()
+if MOTOR_EXTRACTOR not in ("keras", "numpy", "onnx"):
+    raise ValueError(f"❌ FISIOTECH_EXTRACTOR debe ser 'keras', 'numpy' u 'onnx', no '{MOTOR_EXTRACTOR}'.")
+
+# === MOTOR DEL RANDOM FOREST ===
+# "sklearn": RandomForestClassifier original | "compilado": árboles aplanados en arrays NumPy
+# "onnx": TreeEnsembleClassifier de modelo_rf_v22.onnx en onnxruntime
+MOTOR_BOSQUE = os.environ.get("FISIOTECH_BOSQUE", "sklearn").lower()
+if MOTOR_BOSQUE not in ("sklearn", "compilado", "onnx"):
+    raise ValueError(f"❌ FISIOTECH_BOSQUE debe ser 'sklearn', 'compilado' u 'onnx', no '{MOTOR_BOSQUE}'.")
+
+# === MICRO-LOTES PARA /predict ===
+MICROLOTES = os.environ.get("FISIOTECH_MICROLOTES", "0") == "1"
+VENTANA_MS = float(os.environ.get("FISIOTECH_VENTANA_MS", "2"))
+MAX_LOTE = int(os.environ.get("FISIOTECH_MAX_LOTE", "64"))
+MAX_COLA = int(os.environ.get("FISIOTECH_MAX_COLA", "1024"))
+LATENCIA_MAX_MS = float(os.environ.get("FISIOTECH_LATENCIA_MAX_MS", "100"))
+
+# === CACHÉ DE PREDICCIONES (entradas cuantizadas, LRU) ===
+# FISIOTECH_CACHE_PASO: un paso para las 10 features o 10 pasos separados por comas
+CACHE_ACTIVA = os.environ.get("FISIOTECH_CACHE", "0") == "1"
+CACHE_PASO = [float(p) for p in os.environ.get("FISIOTECH_CACHE_PASO", "0.01").split(",")]
+CACHE_CAPACIDAD = int(os.environ.get("FISIOTECH_CACHE_CAPACIDAD", "4096"))
+
+# === STREAMING NDJSON (/stream) ===
+MAX_SESIONES = int(os.environ.get("FISIOTECH_MAX_SESIONES", "64"))
+
+# === INSTRUMENTACIÓN (/metrics) ===
+# "0" elimina por completo los temporizadores y hooks: ni una llamada extra en el camino caliente
+METRICAS_ACTIVAS = os.environ.get("FISIOTECH_METRICAS", "1") == "1"
+
+# === CASCADA CON SALIDA TEMPRANA ===
+# "1": una regresión logística calibrada (cascada_v22.npz) responde las muestras claras;
+# solo las inciertas pasan por extractor + RF. FISIOTECH_CASCADA_UMBRAL sustituye al umbral entrenado.
+CASCADA_ACTIVA = os.environ.get("FISIOTECH_CASCADA", "0") == "1"
+CASCADA_UMBRAL = os.environ.get("FISIOTECH_CASCADA_UMBRAL")
+
+# === ESCALADOR FUSIONADO ===
+# "1": media/escala del StandardScaler plegadas en la primera Dense (y en la cascada); sin etapa scaler.
+# Se decide en cada carga: solo se pliega en un extractor NumPy (paquete o FISIOTECH_EXTRACTOR=numpy);
+# un juego cargado con Keras u ONNX (p. ej. v22_export) conserva su scaler aparte
+FUSIONADO = os.environ.get("FISIOTECH_FUSIONADO", "0") == "1"
+if FUSIONADO and FUENTE_MODELOS == "artefactos" and MOTOR_EXTRACTOR != "numpy":
+    raise ValueError("❌ FISIOTECH_FUSIONADO=1 requiere FISIOTECH_EXTRACTOR=numpy o FISIOTECH_FUENTE=paquete.")
+
+# === PRECISIÓN DEL EXTRACTOR ===
+# "float16" | "int8" (escala por neurona): pesos Dense cuantizados al cargar; "float32" los deja intactos.
+# Solo mide la pérdida de exactitud: se descuantiza una vez y se calcula en float32, así que no ahorra
+# ni tiempo ni RAM, y los artefactos y el paquete siguen guardando los pesos en float32.
+# Todo juego v22 debe tener extractor NumPy; v22_export se carga siempre de artefactos con FISIOTECH_EXTRACTOR
+PRECISION = os.environ.get("FISIOTECH_PRECISION", "float32").lower()
+if PRECISION not in PRECISIONES:
+    raise ValueError(f"❌ FISIOTECH_PRECISION debe ser uno de {PRECISIONES}, no '{PRECISION}'.")
+if PRECISION != "float32" and MOTOR_EXTRACTOR != "numpy":
+    raise ValueError("❌ FISIOTECH_PRECISION reducida requiere FISIOTECH_EXTRACTOR=numpy "
+                     "(también con FISIOTECH_FUENTE=paquete: v22_export se carga de artefactos).")
 
 # === NÚMERO DE FEATURES ORIGINALES ===
 FEATURE_COUNT = 10  # ax ay az gx gy gz intensidad mag_acc vel_ang energia_mov
+# También se aceptan filas de N_CANALES = 7 canales crudos: las 3 derivadas se calculan aquí
+
+# === RECARGA EN CALIENTE ===
+# Cada cuántos segundos se buscan artefactos nuevos en models/ ("0" desactiva el vigilante)
+RECARGA_S = float(os.environ.get("FISIOTECH_RECARGA_S", "5"))
+
+
+def rutas_vigiladas(fuente=FUENTE_MODELOS, rutas=RUTAS_V22):
+    if fuente == "paquete":
+        return [MODEL_BUNDLE_PATH]
+    return rutas[:4]  # el .npz se deriva del .h5
+
+
+def cargar_cascada(ruta):
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"❌ No se encontró {ruta}. Ejecuta el reentrenamiento v22 para entrenar la primera etapa.")
+    cascada = PrimeraEtapa.cargar(ruta)
+    if CASCADA_UMBRAL:
+        cascada.umbral = float(CASCADA_UMBRAL)
+    return cascada
+
+
+def cargar_modelos(fuente=FUENTE_MODELOS, rutas=RUTAS_V22, ruta_cascada=CASCADA_PATH if CASCADA_ACTIVA else None):
+    """Carga y calienta un juego completo de modelos como una VersionModelo nueva."""
+    firma = firma_archivos(rutas_vigiladas(fuente, rutas))
+    t_carga = time.perf_counter()
+    cascada = cargar_cascada(ruta_cascada) if ruta_cascada else None
+    fusionado = False  # solo si este juego tiene de verdad el scaler plegado en W0/b0
+
+    if fuente == "paquete":
+        if firma is None:
+            raise FileNotFoundError(f"❌ No se encontró {MODEL_BUNDLE_PATH}. Ejecuta el reentrenamiento v22 o paquete_modelo.py.")
+
+        # El paquete ya trae el extractor en NumPy y el bosque aplanado
+        paquete = cargar_paquete(MODEL_BUNDLE_PATH)
+        scaler, extractor, rf, encoder = paquete.scaler, paquete.extractor, paquete.rf, paquete.encoder
+        if FUSIONADO:
+            extractor, fusionado = paquete.extractor_fusionado, True
+        motor_extractor, motor_bosque = "numpy", "compilado"
+    else:
+        if firma is None:
+            raise FileNotFoundError("❌ No se encontraron todos los modelos entrenados. Ejecuta el reentrenamiento v22 primero.")
+
+        import joblib
+
+        ruta_nn, ruta_rf, ruta_scaler, ruta_encoder, ruta_npz = rutas
+        motor_extractor, motor_bosque = MOTOR_EXTRACTOR, MOTOR_BOSQUE
+        if MOTOR_BOSQUE == "onnx":
+            rf = cargar_o_exportar_bosque(ruta_rf, os.path.splitext(ruta_rf)[0] + ".onnx")
+        else:
+            rf = joblib.load(ruta_rf)
+            if MOTOR_BOSQUE == "compilado":
+                rf = BosqueCompilado.desde_sklearn(rf)
+        scaler = joblib.load(ruta_scaler)
+        encoder = joblib.load(ruta_encoder)
+
+        # ✅ EXTRAER CAPA INTERMEDIA (64 FEATURES)
+        if MOTOR_EXTRACTOR == "numpy":
+            extractor = cargar_o_exportar(ruta_nn, ruta_npz)
+            if FUSIONADO:
+                extractor, fusionado = extractor.fusionar_escalador(scaler.mean_, scaler.scale_), True
+        elif MOTOR_EXTRACTOR == "onnx":
+            extractor = cargar_o_exportar_extractor(ruta_nn, ruta_npz, os.path.splitext(ruta_npz)[0] + ".onnx")
+        else:
+            from tensorflow.keras.models import load_model, Model
+
+            nn = load_model(ruta_nn)
+            extractor = Model(inputs=nn.inputs, outputs=nn.layers[-2].output)
+
+    if fusionado:
+        # El escalado ya va dentro de W0/b0: las filas crudas entran directas al extractor
+        if cascada is not None:
+            cascada = cascada.fusionar_escalador(scaler.mean_, scaler.scale_)
+        scaler = None
+
+    if PRECISION != "float32":
+        if not isinstance(extractor, ExtractorNumpy):
+            raise ValueError(f"❌ FISIOTECH_PRECISION={PRECISION} requiere un extractor NumPy, no {motor_extractor}.")
+        extractor = ExtractorCuantizado.desde_extractor(extractor, PRECISION)
+        motor_extractor = f"{motor_extractor}-{PRECISION}"
+
+    version = VersionModelo(scaler, extractor, rf, encoder, fuente, motor_extractor, motor_bosque,
+                            firma, time.perf_counter() - t_carga, cascada)
+    version.calentar(FEATURE_COUNT)
+    return version
+
 
 print("🚀 Cargando modelos híbridos v22...")
+modelo = cargar_modelos()
+
+cache = CachePredicciones(CACHE_PASO if len(CACHE_PASO) > 1 else CACHE_PASO[0], CACHE_CAPACIDAD) if CACHE_ACTIVA else None
+print(f"✅ Modelos v{modelo.version} cargados correctamente en {modelo.t_carga * 1000:.0f} ms "
+      f"(fuente: {FUENTE_MODELOS}, extractor: {modelo.motor_extractor}, bosque: {modelo.motor_bosque}).")
+
+
+def activar_modelos(nueva):
+    """Sustitución atómica: las peticiones en curso terminan con la versión que ya tomaron."""
+    global modelo
+    modelo = nueva
+    if cache:
+        cache.invalidar()
+
+
+vigilante = VigilanteModelos(rutas_vigiladas(), cargar_modelos, activar_modelos,
+                             lambda: modelo, RECARGA_S) if RECARGA_S > 0 else None
+
+
+# === REGISTRO DE MODELOS (campo "model" o cabecera X-Fisiotech-Modelo) ===
+MODELO_POR_DEFECTO = "v22"
+PRESUPUESTO_MB = float(os.environ.get("FISIOTECH_PRESUPUESTO_MB", "512"))
+
+
+def cargar_keras_final(ruta_modelo):
+    faltan = [r for r in (ruta_modelo, SCALER_FINAL_PATH, ENCODER_FINAL_PATH) if not os.path.exists(r)]
+    if faltan:
+        raise FileNotFoundError(f"❌ Faltan artefactos del modelo: {', '.join(faltan)}. Ejecuta cache/exportar_modelo_final.py.")
+
+    import joblib
+    from tensorflow.keras.models import load_model
+
+    clasificador = ClasificadorKeras(load_model(ruta_modelo), joblib.load(SCALER_FINAL_PATH),
+                                     joblib.load(ENCODER_FINAL_PATH), columnas=7)  # ax..gz + intensidad
+    clasificador.predecir_lote(np.zeros((1, FEATURE_COUNT)))  # calentamiento
+    return clasificador
+
+
+registro = RegistroModelos(PRESUPUESTO_MB)
+# El v22 por defecto es la versión activa (recarga en caliente): se consulta en cada petición
+registro.registrar_activo(MODELO_POR_DEFECTO, lambda: modelo, rutas_vigiladas())
+registro.registrar("v22_export", lambda: cargar_modelos("artefactos", RUTAS_V22_EXPORT, None), RUTAS_V22_EXPORT[:4])
+registro.registrar("final", lambda: cargar_keras_final(MODEL_FINAL_PATH),
+                   [MODEL_FINAL_PATH, SCALER_FINAL_PATH, ENCODER_FINAL_PATH])
+registro.registrar("final_calibrado", lambda: cargar_keras_final(MODEL_FINAL_CALIBRADO_PATH),
+                   [MODEL_FINAL_CALIBRADO_PATH, SCALER_FINAL_PATH, ENCODER_FINAL_PATH])
+
+# === PREDICCIÓN VECTORIZADA ===
+MAX_FILAS_LOTE = 4096  # límite de filas por petición a /predict_batch
+
+metricas = RegistroMetricas() if METRICAS_ACTIVAS else None
+
+
+def predecir_lote(X):
+    """Escalar → extractor (64 deep features) → RandomForest con la versión activa."""
+    return modelo.predecir_lote(X, metricas)
+
+
+def predecir(X, calcular=predecir_lote):
+    """Resuelve desde la caché las filas conocidas y calcula el resto en una sola llamada."""
+    if cache is None:
+        return calcular(X)
+
+    claves = cache.claves(X)
+    resultados = cache.obtener(claves)
+    faltan = [i for i, r in enumerate(resultados) if r is None]
+    if faltan:
+        version = modelo
+        nuevos = list(zip(*calcular(X[faltan])))
+        if modelo is version:  # no guardar en la caché recién vaciada resultados de la versión anterior
+            cache.guardar([claves[i] for i in faltan], nuevos)
+        for i, resultado in zip(faltan, nuevos):
+            resultados[i] = resultado
+
+    labels, confianzas = zip(*resultados)
+    return np.array(labels), np.array(confianzas)
 
-# === CARGA DE MODELOS ===
-if not all(os.path.exists(p) for p in [MODEL_NN_PATH, MODEL_RF_PATH, SCALER_PATH, ENCODER_PATH]):
-    raise FileNotFoundError("❌ No se encontraron todos los modelos entrenados. Ejecuta el reentrenamiento v22 primero.")
 
-nn = load_model(MODEL_NN_PATH)
-rf = joblib.load(MODEL_RF_PATH)
-scaler = joblib.load(SCALER_PATH)
-encoder = joblib.load(ENCODER_PATH)
+def modelo_solicitado(data=None):
+    """Campo "model" del JSON, o cabecera X-Fisiotech-Modelo, o el v22 por defecto."""
+    if isinstance(data, dict) and data.get("model"):
+        return str(data["model"])
+    return request.headers.get("X-Fisiotech-Modelo", MODELO_POR_DEFECTO)
 
-# ✅ EXTRAER CAPA INTERMEDIA (64 FEATURES)
-extractor = Model(inputs=nn.inputs, outputs=nn.layers[-2].output)
 
-print("✅ Modelos cargados correctamente.")
+def predecir_con(nombre, X, calcular=predecir_lote):
+    """Enruta al modelo pedido; el v22 por defecto conserva caché, planificador y recarga en caliente."""
+    with registro.usar(nombre, len(X)) as elegido:
+        if nombre == MODELO_POR_DEFECTO:
+            return predecir(X, calcular)
+        return elegido.predecir_lote(X)
+
+
+def completar_features(X):
+    """Filas de 7 canales crudos → 10 features (misma derivación que el entrenamiento); las de 10 pasan tal cual."""
+    return derivar_features(X) if X.shape[1] == N_CANALES else X
+
+
+def validar_fila(fila):
+    """Devuelve el mensaje de error de una fila inválida, o None si es correcta."""
+    if not isinstance(fila, (list, tuple)):
+        return "Cada fila debe ser una lista de valores."
+    if len(fila) not in (FEATURE_COUNT, N_CANALES):
+        return f"X has {len(fila)} features, but the API expects {FEATURE_COUNT} (or {N_CANALES} raw channels)."
+    try:
+        valores = np.asarray(fila, dtype=float)
+    except (TypeError, ValueError):
+        return "La fila contiene valores no numéricos."
+    if not np.all(np.isfinite(valores)):
+        return "La fila contiene valores NaN o infinitos."
+    return None
+
+
+planificador = PlanificadorLotes(
+    lambda X: list(zip(*predecir_lote(X))),
+    ventana_ms=VENTANA_MS, max_lote=MAX_LOTE, max_cola=MAX_COLA, latencia_max_ms=LATENCIA_MAX_MS
+) if MICROLOTES else None
+
+
+def calcular_por_planificador(X):
+    label, confianza = planificador.enviar(X)
+    return [label], [confianza]
+
+
+sesiones = RegistroSesiones(MAX_SESIONES)
+
+
+def predecir_binario():
+    """Atiende un cuerpo float32 compacto (ver formato_binario.py) y responde en el mismo formato."""
+    try:
+        X = completar_features(decodificar_filas(request.get_data(), (FEATURE_COUNT, N_CANALES)))
+    except ErrorFormato as e:
+        return jsonify({"error": str(e)}), 400
+    if len(X) > MAX_FILAS_LOTE:
+        return jsonify({"error": f"El lote tiene {len(X)} filas; el máximo es {MAX_FILAS_LOTE}."}), 413
+
+    # Filas con NaN/inf: clase -1 y confianza NaN, sin abortar el resto del lote
+    nombre = modelo_solicitado()
+    validas = np.all(np.isfinite(X), axis=1)
+    indices = np.full(len(X), -1, dtype=np.int16)
+    confianzas = np.full(len(X), np.nan, dtype=np.float32)
+    with registro.usar(nombre, int(validas.sum())) as elegido:
+        # Una sola versión para predecir e indexar las clases, aunque haya una recarga a mitad
+        version = modelo if nombre == MODELO_POR_DEFECTO else elegido
+        if validas.any():
+            if nombre == MODELO_POR_DEFECTO:
+                labels, confianzas_validas = predecir(X[validas], lambda X: version.predecir_lote(X, metricas))
+            else:
+                labels, confianzas_validas = version.predecir_lote(X[validas])
+            confianzas[validas] = confianzas_validas
+            indices[validas] = [version.indice_clase.get(str(label), -1) for label in labels]
+
+    return Response(codificar_respuesta(indices, confianzas, len(version.indice_clase)), mimetype=MIME_BINARIO,
+                    headers={"X-Fisiotech-Clases": ",".join(version.indice_clase)})
+
 
 # === FLASK API ===
 app = Flask(__name__)
 
+if metricas:
+    @app.before_request
+    def iniciar_medicion():
+        g.t_inicio = time.perf_counter()
+        if request.is_json:
+            # El JSON queda en caché de Flask: la vista no lo vuelve a parsear
+            t0 = time.perf_counter()
+            request.get_json(silent=True)
+            metricas.observar_etapa("parseo_json", time.perf_counter() - t0)
+
+    @app.after_request
+    def registrar_medicion(respuesta):
+        metricas.observar_peticion(request.endpoint or "desconocido", respuesta.status_code,
+                                   time.perf_counter() - g.t_inicio)
+        return respuesta
+
 @app.route("/predict", methods=["POST"])
 def predict():
     try:
+        if request.mimetype == MIME_BINARIO:
+            return predecir_binario()
+
         data = request.get_json()
         if not data or "features" not in data:
             return jsonify({"error": "Formato inválido. Se esperaba {'features': [valores...]}"})
         
-        features = np.array(data["features"]).reshape(1, -1)
+        # ✅ Validar tamaño (10 features o 7 canales crudos) y valores finitos, como en /predict_batch
+        error = validar_fila(data["features"])
+        if error:
+            return jsonify({"error": error}), 400
+        features = completar_features(np.asarray(data["features"], dtype=float).reshape(1, -1))
+
+        # ✅ Escalar → extractor (64 deep features) → RandomForest
+        labels, confianzas = predecir_con(modelo_solicitado(data), features,
+                                          calcular_por_planificador if planificador else predecir_lote)
+        label, confianza = labels[0], confianzas[0]
+
+        return jsonify({
+            "prediccion": label,
+            "confianza": round(float(confianza), 3)
+        })
 
-        # ✅ Validar tamaño correcto
-        if features.shape[1] != FEATURE_COUNT:
-            return jsonify({"error": f"X has {features.shape[1]} features, but the API expects {FEATURE_COUNT}."})
+    except ModeloDesconocido as e:
+        return jsonify({"error": e.args[0]}), 404
+    except (ColaLlena, LatenciaExcedida, FileNotFoundError) as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/predict_batch", methods=["POST"])
+def predict_batch():
+    try:
+        if request.mimetype == MIME_BINARIO:
+            return predecir_binario()
+
+        data = request.get_json()
+        if not data or not isinstance(data.get("features"), list):
+            return jsonify({"error": "Formato inválido. Se esperaba {'features': [[valores...], ...]}"}), 400
 
-        # ✅ Escalar features
-        X_scaled = scaler.transform(features)
+        filas = data["features"]
+        if len(filas) > MAX_FILAS_LOTE:
+            return jsonify({"error": f"El lote tiene {len(filas)} filas; el máximo es {MAX_FILAS_LOTE}."}), 413
 
-        # ✅ Pasar por el extractor (produce 64 features)
-        deep_features = extractor.predict(X_scaled)
+        # ✅ Camino rápido: matriz N×10 (o N×7 crudos) completa y finita, sin validar fila por fila
+        try:
+            X = np.asarray(filas, dtype=float)
+            validas = np.arange(len(filas)) if (
+                X.ndim == 2 and X.shape[1] in (FEATURE_COUNT, N_CANALES) and np.all(np.isfinite(X))
+            ) else None
+            if validas is not None:
+                X = completar_features(X)
+        except (TypeError, ValueError):
+            validas = None
 
-        # ✅ Predicción RandomForest usando las 64 deep features
-        pred_rf = rf.predict(deep_features)
-        probs = rf.predict_proba(deep_features)
+        errores = {}
+        if validas is None:
+            for i, fila in enumerate(filas):
+                error = validar_fila(fila)
+                if error:
+                    errores[i] = error
+            validas = np.array([i for i in range(len(filas)) if i not in errores], dtype=int)
+            # Se admiten lotes que mezclan filas de 10 features y de 7 canales crudos
+            X = np.vstack([completar_features(np.asarray(filas[i], dtype=float).reshape(1, -1)) for i in validas]) \
+                if len(validas) else np.empty((0, FEATURE_COUNT))
 
-        label = encoder.inverse_transform(pred_rf)[0]
-        confianza = float(np.max(probs))
+        resultados = [None] * len(filas)
+        if len(validas):
+            labels, confianzas = predecir_con(modelo_solicitado(data), X)
+            for i, label, confianza in zip(validas, labels, confianzas):
+                resultados[i] = {"prediccion": label, "confianza": round(float(confianza), 3)}
+        for i, error in errores.items():
+            resultados[i] = {"error": error}
 
         return jsonify({
-            "prediccion": label,
-            "confianza": round(confianza, 3)
+            "resultados": resultados,
+            "total": len(filas),
+            "errores": len(errores)
         })
 
+    except ModeloDesconocido as e:
+        return jsonify({"error": e.args[0]}), 404
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 503
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/stream", methods=["POST"])
+def stream():
+    """Sesión continua: NDJSON de entrada (chunked) → NDJSON de predicciones, en el mismo orden.
+
+    Cada línea de entrada es {"features": [10 valores]} o {"features": [[...], ...]}
+    para varias muestras a la vez. La contrapresión es la del propio TCP: si el
+    cliente no lee sus predicciones, el servidor deja de leer sus muestras.
+    """
+    sesion = sesiones.abrir(request.args.get("paciente", "anonimo"))
+    if sesion is None:
+        return jsonify({"error": f"Se alcanzó el máximo de {MAX_SESIONES} sesiones de streaming."}), 503
+    entrada = request.stream
+
+    def generar():
+        try:
+            yield json.dumps({"sesion": sesion.id, "paciente": sesion.paciente}) + "\n"
+            for n_linea, linea in enumerate(iter(entrada.readline, b""), start=1):
+                if not linea.strip():
+                    continue
+                try:
+                    X = np.asarray(json.loads(linea)["features"], dtype=float)
+                    X = X.reshape(1, -1) if X.ndim == 1 else X
+                    if X.ndim != 2 or X.shape[1] not in (FEATURE_COUNT, N_CANALES) or len(X) > MAX_FILAS_LOTE:
+                        raise ValueError(f"Se esperaban filas de {FEATURE_COUNT} features o {N_CANALES} canales crudos "
+                                         f"(máximo {MAX_FILAS_LOTE} por línea).")
+                    if not np.all(np.isfinite(X)):
+                        raise ValueError("La línea contiene valores NaN o infinitos.")
+                    X = completar_features(X)
+                    labels, confianzas = predecir(X)
+                except Exception as e:
+                    sesion.errores += 1
+                    yield json.dumps({"linea": n_linea, "error": str(e)}) + "\n"
+                    continue
+
+                salida = []
+                for label, confianza in zip(labels, confianzas):
+                    salida.append(json.dumps({"seq": sesion.muestras, "prediccion": str(label),
+                                              "confianza": round(float(confianza), 3)}))
+                    sesion.muestras += 1
+                yield "\n".join(salida) + "\n"
+
+            yield json.dumps({"fin": True, **sesion.resumen()}) + "\n"
+        finally:
+            sesiones.cerrar(sesion)
+
+    return Response(stream_with_context(generar()), mimetype="application/x-ndjson")
+
+
+@app.route("/stream/sesiones", methods=["GET"])
+def estado_sesiones():
+    return jsonify(sesiones.estadisticas())
+
+
+@app.route("/metrics", methods=["GET"])
+def exponer_metricas():
+    if not metricas:
+        return jsonify({"error": "Instrumentación desactivada (FISIOTECH_METRICAS=0)."}), 404
+    return Response(metricas.exposicion(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/modelos", methods=["GET"])
+def estado_modelos():
+    return jsonify({"por_defecto": MODELO_POR_DEFECTO, **registro.estadisticas()})
+
+
+@app.route("/planificador", methods=["GET"])
+def estado_planificador():
+    if not planificador:
+        return jsonify({"activo": False})
+    return jsonify({"activo": True, **planificador.estadisticas()})
+
+
+@app.route("/cache", methods=["GET"])
+def estado_cache():
+    if not cache:
+        return jsonify({"activa": False})
+    return jsonify({"activa": True, **cache.estadisticas()})
+
+
 @app.route("/", methods=["GET"])
 def home():
-    return jsonify({"status": "API FisioTech v22 funcionando correctamente ✅"})
+    return jsonify({
+        "status": "API FisioTech v22 funcionando correctamente ✅",
+        **modelo.describir(),
+        "recarga": vigilante.estadisticas() if vigilante else {"activa": False},
+        "pid": os.getpid()  # worker que atendió la petición (modo multiproceso)
+    })
 
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+# Mismos modelos, configuración FISIOTECH_* y pipeline que la API Flask
+import api_fisiotech_v22 as servicio
+
+# === VARIANTE ASÍNCRONA (ASGI) ===
+# Uso, desde la raíz del repositorio:
+#   python App/api/api_fisiotech_v22_asgi.py
+#   uvicorn api_fisiotech_v22_asgi:app --app-dir App/api --port 5000
+# Las conexiones lentas o inactivas solo ocupan el bucle de eventos; la inferencia
+# (CPU) corre en un pool de hilos acotado.
+HILOS_INFERENCIA = int(os.environ.get("FISIOTECH_HILOS_INFERENCIA", "2"))
+MAX_PENDIENTES = int(os.environ.get("FISIOTECH_MAX_PENDIENTES", "256"))  # en ejecución + en espera
+ESPERA_MAX_MS = float(os.environ.get("FISIOTECH_ESPERA_MAX_MS", "1000"))
+KEEPALIVE_S = int(os.environ.get("FISIOTECH_KEEPALIVE_S", "75"))
+
+ejecutor = ThreadPoolExecutor(HILOS_INFERENCIA, thread_name_prefix="inferencia")
+contadores = {"pendientes": 0, "atendidas": 0, "rechazadas_429": 0, "expiradas_503": 0}
+
+
+def liberar(_futuro):
+    # El hilo puede terminar después de un 503: el cupo se libera cuando termina de verdad
+    contadores["pendientes"] -= 1
+
+
+async def inferir(nombre, X):
+    """predecir_con() en el pool; 429 si el pool está saturado, 503 si no responde a tiempo."""
+    if contadores["pendientes"] >= MAX_PENDIENTES:
+        contadores["rechazadas_429"] += 1
+        return None, JSONResponse({"error": f"Servicio saturado ({MAX_PENDIENTES} inferencias pendientes)."},
+                                  status_code=429, headers={"Retry-After": "1"})
+
+    bucle = asyncio.get_running_loop()
+    contadores["pendientes"] += 1
+    futuro = bucle.run_in_executor(ejecutor, servicio.predecir_con, nombre, X)
+    futuro.add_done_callback(liberar)
+    try:
+        resultado = await asyncio.wait_for(asyncio.shield(futuro), ESPERA_MAX_MS / 1000)
+    except asyncio.TimeoutError:
+        contadores["expiradas_503"] += 1
+        return None, JSONResponse({"error": f"Sin respuesta en {ESPERA_MAX_MS:.0f} ms."}, status_code=503)
+    contadores["atendidas"] += 1
+    return resultado, None
+
+
+async def predict(request):
+    t_inicio = time.perf_counter()
+    respuesta = await responder_predict(request)
+    if servicio.metricas:
+        servicio.metricas.observar_peticion("predict", respuesta.status_code, time.perf_counter() - t_inicio)
+    return respuesta
+
+
+async def responder_predict(request):
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        if not isinstance(data, dict) or "features" not in data:
+            return JSONResponse({"error": "Formato inválido. Se esperaba {'features': [valores...]}"})
+
+        features = np.array(data["features"], dtype=float).reshape(1, -1)
+
+        # ✅ Validar tamaño correcto
+        if features.shape[1] not in (servicio.FEATURE_COUNT, servicio.N_CANALES):
+            return JSONResponse({"error": f"X has {features.shape[1]} features, but the API expects "
+                                          f"{servicio.FEATURE_COUNT} (or {servicio.N_CANALES} raw channels)."})
+        features = servicio.completar_features(features)
+
+        nombre = data.get("model") or request.headers.get("X-Fisiotech-Modelo", servicio.MODELO_POR_DEFECTO)
+        resultado, error = await inferir(str(nombre), features)
+        if error:
+            return error
+        labels, confianzas = resultado
+
+        return JSONResponse({
+            "prediccion": str(labels[0]),
+            "confianza": round(float(confianzas[0]), 3)
+        })
+
+    except servicio.ModeloDesconocido as e:
+        return JSONResponse({"error": e.args[0]}, status_code=404)
+    except FileNotFoundError as e:
+        return JSONResponse({"error": str(e)}, status_code=503)
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+
+async def home(request):
+    return JSONResponse({
+        "status": "API FisioTech v22 funcionando correctamente ✅",
+        **servicio.modelo.describir(),
+        "pid": os.getpid(),
+        "servidor": "asgi",
+        "inferencia": {**contadores, "hilos": HILOS_INFERENCIA, "max_pendientes": MAX_PENDIENTES},
+    })
+
+
+app = Starlette(routes=[
+    Route("/", home, methods=["GET"]),
+    Route("/predict", predict, methods=["POST"]),
+])
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    print("✅ Servidor API (ASGI) iniciado en http://127.0.0.1:5000 ...")
+    uvicorn.run(app, host="0.0.0.0", port=5000, timeout_keep_alive=KEEPALIVE_S, log_level="warning")
@@ -0,0 +1,126 @@
+import numpy as np
+
+
+class BosqueCompilado:
+    """RandomForestClassifier aplanado en arrays contiguos de NumPy.
+
+    Todos los árboles comparten los arrays `feature`, `umbral`, `hijos` y
+    `valores`, indexados por nodo global. Las hojas apuntan a sí mismas, así el
+    recorrido avanza `profundidad` pasos sobre todas las filas y todos los
+    árboles a la vez, sin ramas por nodo. Las probabilidades se acumulan árbol
+    por árbol en el mismo orden que sklearn, por lo que el resultado es
+    idéntico bit a bit.
+
+    Los arrays del recorrido ya están en su forma compacta (int32 y umbrales
+    float32) y se usan tal cual: los que vienen mapeados del paquete se leen
+    sin copiarlos a memoria privada.
+
+    Con pocas filas se recorren todos los árboles juntos (menos llamadas a NumPy).
+    En lotes grandes cada paso es una lectura aleatoria sobre cientos de miles de
+    nodos que no caben en caché, así que a partir de FILAS_POR_GRUPOS filas se
+    recorren grupos de ARBOLES_POR_GRUPO árboles, cuyos nodos sí caben.
+    """
+
+    FILAS_POR_GRUPOS = 128    # desde aquí, recorrido por grupos de árboles
+    ARBOLES_POR_GRUPO = 32
+    FILAS_POR_BLOQUE = 1024   # limita la matriz (filas, árboles del grupo) de nodos activos
+
+    def __init__(self, feature, umbral, hijos, valores, raices, classes_, profundidad):
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.umbral = np.ascontiguousarray(umbral, dtype=np.float32)
+        # Hijos intercalados [derecho, izquierdo]: el siguiente nodo es hijos[2 * nodo + ir_izquierda]
+        self.hijos = np.ascontiguousarray(hijos, dtype=np.int32)
+        self.valores = np.ascontiguousarray(valores, dtype=np.float64)
+        self.raices = np.ascontiguousarray(raices, dtype=np.int32)
+        self.classes_ = np.asarray(classes_)
+        self.profundidad = int(profundidad)
+
+    @staticmethod
+    def umbral_float32(umbral):
+        """Umbrales float64 de sklearn en float32 sin cambiar ninguna decisión.
+
+        Para x en float32, x <= t equivale a x <= el mayor float32 que no supera t.
+        """
+        umbral = np.asarray(umbral, dtype=np.float64)
+        umbral32 = umbral.astype(np.float32)
+        redondeado_arriba = umbral32.astype(np.float64) > umbral
+        umbral32[redondeado_arriba] = np.nextafter(umbral32[redondeado_arriba], np.float32(-np.inf))
+        return umbral32
+
+    @classmethod
+    def desde_sklearn(cls, rf):
+        features, umbrales, hijos, valores, raices = [], [], [], [], []
+        desplazamiento = 0
+
+        for estimador in rf.estimators_:
+            arbol = estimador.tree_
+            n = arbol.node_count
+            indices = np.arange(n) + desplazamiento
+            hoja = arbol.children_left == -1
+
+            features.append(np.where(hoja, 0, arbol.feature))
+            umbrales.append(arbol.threshold)
+            izquierdo = np.where(hoja, indices, arbol.children_left + desplazamiento)
+            derecho = np.where(hoja, indices, arbol.children_right + desplazamiento)
+            hijos.append(np.stack([derecho, izquierdo], axis=1).ravel())
+
+            # sklearn < 1.4 guarda conteos y los normaliza en predict_proba; desde 1.4 guarda
+            # fracciones y las devuelve tal cual. Se replica cada caso para coincidir bit a bit.
+            proba = arbol.value[:, 0, :rf.n_classes_].astype(np.float64)
+            normalizador = proba.sum(axis=1)[:, np.newaxis]
+            if not np.allclose(normalizador, 1.0):
+                normalizador[normalizador == 0.0] = 1.0
+                proba = proba / normalizador
+            valores.append(proba)
+
+            raices.append(desplazamiento)
+            desplazamiento += n
+
+        profundidad = max(estimador.tree_.max_depth for estimador in rf.estimators_)
+        return cls(np.concatenate(features), cls.umbral_float32(np.concatenate(umbrales)),
+                   np.concatenate(hijos), np.concatenate(valores), np.array(raices),
+                   rf.classes_, profundidad)
+
+    def _hojas(self, X, raices):
+        """Hoja alcanzada por cada fila en cada árbol de `raices`: (filas, árboles)."""
+        n, n_features = X.shape
+        X_plano = X.ravel()
+        base = (np.arange(n, dtype=np.int32) * n_features)[:, np.newaxis]
+        nodos = np.broadcast_to(raices, (n, len(raices))).copy()
+
+        for _ in range(self.profundidad):
+            ir_izquierda = X_plano.take(base + self.feature.take(nodos)) <= self.umbral.take(nodos)
+            nodos = self.hijos.take(2 * nodos + ir_izquierda)
+        return nodos
+
+    def _proba_bloque(self, X):
+        nodos = self._hojas(X, self.raices)
+        # (árboles, filas, clases) reducido sobre el eje 0: suma árbol por árbol, como sklearn
+        proba = np.add.reduce(self.valores.take(nodos.T, axis=0), axis=0)
+        proba /= nodos.shape[1]
+        return proba
+
+    def _proba_grupos(self, X):
+        proba = np.zeros((X.shape[0], self.valores.shape[1]))
+        for i in range(0, len(self.raices), self.ARBOLES_POR_GRUPO):
+            nodos = self._hojas(X, self.raices[i:i + self.ARBOLES_POR_GRUPO])
+            for hojas in nodos.T:  # mismo orden de suma que sklearn
+                proba += self.valores.take(hojas, axis=0)
+        proba /= len(self.raices)
+        return proba
+
+    def predict_proba(self, X):
+        # sklearn compara en float32 contra umbrales float64; `umbral` ya está ajustado a float32
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.shape[0] < self.FILAS_POR_GRUPOS:
+            return self._proba_bloque(X)
+        return np.vstack([self._proba_grupos(X[i:i + self.FILAS_POR_BLOQUE])
+                          for i in range(0, X.shape[0], self.FILAS_POR_BLOQUE)])
+
+    def predecir(self, X):
+        """Clase y probabilidades en un único recorrido del bosque."""
+        proba = self.predict_proba(X)
+        return self.classes_.take(np.argmax(proba, axis=1)), proba
+
+    def predict(self, X):
+        return self.predecir(X)[0]
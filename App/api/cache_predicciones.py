@@ -0,0 +1,68 @@
+import numpy as np
+import threading
+from collections import OrderedDict
+
+
+class CachePredicciones:
+    """Caché LRU acotada de predicciones indexada por las 10 features cuantizadas.
+
+    Dos vectores que caen en la misma celda de cuantización (`paso`, escalar o uno
+    por feature) comparten predicción: una postura estática (`reposo`) cuesta una
+    búsqueda en diccionario en lugar del pipeline scaler → extractor → RF.
+    """
+
+    def __init__(self, paso=0.01, capacidad=4096):
+        self.paso = np.asarray(paso, dtype=np.float64)
+        if np.any(self.paso <= 0):
+            raise ValueError("❌ El paso de cuantización debe ser positivo.")
+        self.capacidad = int(capacidad)
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self._contadores = {"aciertos": 0, "fallos": 0, "desalojos": 0, "invalidaciones": 0}
+
+    def claves(self, X):
+        """Una clave por fila: celdas enteras de la cuantización serializadas a bytes."""
+        celdas = np.rint(np.asarray(X, dtype=np.float64) / self.paso).astype(np.int64)
+        return [fila.tobytes() for fila in celdas]
+
+    def obtener(self, claves):
+        """Resultados en caché (None si falta) y refresco de su posición LRU."""
+        with self._lock:
+            resultados = []
+            for clave in claves:
+                valor = self._datos.get(clave)
+                if valor is not None:
+                    self._datos.move_to_end(clave)
+                resultados.append(valor)
+            aciertos = sum(r is not None for r in resultados)
+            self._contadores["aciertos"] += aciertos
+            self._contadores["fallos"] += len(claves) - aciertos
+        return resultados
+
+    def guardar(self, claves, valores):
+        with self._lock:
+            for clave, valor in zip(claves, valores):
+                self._datos[clave] = valor
+                self._datos.move_to_end(clave)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+                self._contadores["desalojos"] += 1
+
+    def invalidar(self):
+        """Vacía la caché; se llama cada vez que se (re)cargan los modelos."""
+        with self._lock:
+            self._datos.clear()
+            self._contadores["invalidaciones"] += 1
+
+    def estadisticas(self):
+        with self._lock:
+            contadores = dict(self._contadores)
+            tamano = len(self._datos)
+        consultas = contadores["aciertos"] + contadores["fallos"]
+        return {
+            **contadores,
+            "tamano": tamano,
+            "capacidad": self.capacidad,
+            "tasa_aciertos": round(contadores["aciertos"] / consultas, 4) if consultas else 0.0,
+            "paso": self.paso.tolist(),
+        }
@@ -0,0 +1,74 @@
+import numpy as np
+
+CASCADA_PATH = "models/cascada_v22.npz"
+
+
+class PrimeraEtapa:
+    """Regresión logística multinomial sobre las 10 features escaladas, con temperatura calibrada.
+
+    Es la salida temprana de la cascada: si su confianza calibrada alcanza `umbral`
+    la muestra no pasa por el extractor ni por los 400 árboles.
+    """
+
+    def __init__(self, coef, intercepto, umbral, temperatura=1.0):
+        self.coef_t = np.ascontiguousarray(np.asarray(coef, dtype=np.float64).T)  # (features, clases)
+        self.intercepto = np.asarray(intercepto, dtype=np.float64)
+        self.umbral = float(umbral)
+        self.temperatura = float(temperatura)
+
+    @classmethod
+    def desde_sklearn(cls, lr, umbral=1.0, temperatura=1.0):
+        return cls(lr.coef_, lr.intercept_, umbral, temperatura)
+
+    def fusionar_escalador(self, media, escala):
+        """Primera etapa equivalente sobre features sin escalar (mismo plegado que el extractor)."""
+        media = np.asarray(media, dtype=np.float64)
+        escala = np.asarray(escala, dtype=np.float64)
+        coef_t = self.coef_t / escala[:, None]
+        return PrimeraEtapa(coef_t.T, self.intercepto - (media / escala) @ self.coef_t,
+                            self.umbral, self.temperatura)
+
+    def logits(self, X_scaled):
+        return X_scaled @ self.coef_t + self.intercepto
+
+    def predict_proba(self, X_scaled):
+        z = self.logits(X_scaled) / self.temperatura
+        z -= z.max(axis=1, keepdims=True)
+        np.exp(z, out=z)
+        z /= z.sum(axis=1, keepdims=True)
+        return z
+
+    def guardar(self, ruta):
+        np.savez(ruta, coef=self.coef_t.T, intercepto=self.intercepto,
+                 umbral=self.umbral, temperatura=self.temperatura)
+
+    @classmethod
+    def cargar(cls, ruta):
+        datos = np.load(ruta)
+        return cls(datos["coef"], datos["intercepto"], datos["umbral"], datos["temperatura"])
+
+
+def calibrar_temperatura(logits, y, candidatas=np.geomspace(0.2, 5.0, 81)):
+    """Temperatura que minimiza la log-verosimilitud negativa en datos no vistos al entrenar."""
+    mejor, mejor_nll = 1.0, np.inf
+    for t in candidatas:
+        z = logits / t
+        z = z - z.max(axis=1, keepdims=True)
+        log_p = z - np.log(np.exp(z).sum(axis=1, keepdims=True))
+        nll = -log_p[np.arange(len(y)), y].mean()
+        if nll < mejor_nll:
+            mejor, mejor_nll = t, nll
+    return mejor
+
+
+def elegir_umbral(confianza, acierto_etapa, acierto_hibrido, tolerancia=0.005,
+                  candidatos=np.linspace(0.5, 0.995, 100)):
+    """Umbral más bajo (más salidas tempranas) cuya precisión en cascada no cae más de `tolerancia`.
+
+    Devuelve 1.01 (nunca sale antes) si ningún umbral respeta la tolerancia.
+    """
+    objetivo = acierto_hibrido.mean() - tolerancia
+    for umbral in candidatos:
+        if np.where(confianza >= umbral, acierto_etapa, acierto_hibrido).mean() >= objetivo:
+            return float(umbral)
+    return 1.01
@@ -0,0 +1,59 @@
+import numpy as np
+
+PRECISIONES = ("float32", "float16", "int8")
+
+
+class ExtractorCuantizado:
+    """Extractor NumPy con la pérdida de precisión de pesos Dense en float16 o int8 (escala por neurona).
+
+    Sirve para medir cuánta exactitud se pierde, no para ahorrar: NumPy no tiene
+    matmul rápido en float16/int8 en CPU, así que los pesos cuantizados se
+    descuantizan una sola vez al construirlo (en int8 con la escala de cada neurona
+    ya aplicada) y solo se conserva esa copia float32. predict() va a la misma
+    velocidad y ocupa la misma RAM que el extractor original; la forma compacta no
+    se guarda en ningún artefacto, solo se informa de su tamaño (memoria_bytes).
+    Los sesgos y las activaciones siguen en float32.
+    """
+
+    def __init__(self, pesos, escalas, sesgos, precision):
+        if precision not in ("float16", "int8"):
+            raise ValueError(f"❌ Precisión no soportada: '{precision}'. Usa 'float16' o 'int8'.")
+        self.precision = precision
+        self.sesgos = [np.ascontiguousarray(b, dtype=np.float32) for b in sesgos]
+        self._bytes_compactos = sum(w.nbytes for w in pesos) + sum(s.nbytes for s in escalas if s is not None)
+        # Pesos efectivos W ≈ Wq * s, con el redondeo de la cuantización ya incluido
+        self.pesos = [np.ascontiguousarray(w.astype(np.float32) if s is None else w.astype(np.float32) * s)
+                      for w, s in zip(pesos, escalas)]
+
+    @classmethod
+    def desde_extractor(cls, extractor, precision):
+        """Cuantiza las capas de un ExtractorNumpy (float32)."""
+        pesos, escalas = [], []
+        for W in extractor.pesos:
+            if precision == "float16":
+                pesos.append(W.astype(np.float16))
+                escalas.append(None)
+            else:
+                # Simétrica por canal de salida: el peso de mayor magnitud de cada neurona va a ±127
+                maximo = np.abs(W).max(axis=0)
+                escala = np.where(maximo > 0, maximo / 127.0, 1.0).astype(np.float32)
+                pesos.append(np.clip(np.rint(W / escala), -127, 127).astype(np.int8))
+                escalas.append(escala)
+        return cls(pesos, escalas, extractor.sesgos, precision)
+
+    def memoria_bytes(self):
+        """Lo que ocuparía la forma compacta (pesos cuantizados, escalas y sesgos) si se guardara."""
+        return self._bytes_compactos + sum(b.nbytes for b in self.sesgos)
+
+    def memoria_residente_bytes(self):
+        """Lo que ocupa en RAM: los pesos descuantizados en float32 y los sesgos, como el original."""
+        return sum(a.nbytes for a in self.pesos + self.sesgos)
+
+    def predict(self, X, verbose=0):
+        """Misma firma que ExtractorNumpy.predict: (N, 10) → (N, 64) deep features en float32."""
+        h = np.asarray(X, dtype=np.float32)
+        for W, b in zip(self.pesos, self.sesgos):
+            h = h @ W
+            h += b
+            np.maximum(h, 0.0, out=h)
+        return h
@@ -0,0 +1,75 @@
+import numpy as np
+import os
+
+
+class ExtractorNumpy:
+    """Extractor de 64 deep features evaluado con multiplicaciones de NumPy (sin TensorFlow)."""
+
+    def __init__(self, pesos, sesgos):
+        self.pesos = [np.ascontiguousarray(w, dtype=np.float32) for w in pesos]
+        self.sesgos = [np.ascontiguousarray(b, dtype=np.float32) for b in sesgos]
+
+    @classmethod
+    def desde_keras(cls, nn):
+        """Copia las capas Dense ocultas del modelo v22 (se descarta la capa softmax final)."""
+        densas = [capa for capa in nn.layers if capa.__class__.__name__ == "Dense"][:-1]
+        if not densas:
+            raise ValueError("❌ El modelo no tiene capas Dense ocultas que exportar.")
+
+        for capa in densas:
+            activacion = capa.get_config().get("activation")
+            if activacion != "relu":
+                raise ValueError(f"❌ Activación no soportada en '{capa.name}': {activacion}")
+
+        pesos, sesgos = zip(*(capa.get_weights() for capa in densas))
+        return cls(pesos, sesgos)
+
+    @classmethod
+    def cargar(cls, ruta):
+        with np.load(ruta) as datos:
+            n_capas = int(datos["n_capas"])
+            pesos = [datos[f"W{i}"] for i in range(n_capas)]
+            sesgos = [datos[f"b{i}"] for i in range(n_capas)]
+        return cls(pesos, sesgos)
+
+    def guardar(self, ruta):
+        arrays = {"n_capas": np.array(len(self.pesos))}
+        for i, (W, b) in enumerate(zip(self.pesos, self.sesgos)):
+            arrays[f"W{i}"] = W
+            arrays[f"b{i}"] = b
+        np.savez(ruta, **arrays)
+
+    def fusionar_escalador(self, media, escala):
+        """Extractor equivalente que recibe las features sin escalar.
+
+        (x - media) / escala @ W0 + b0 = x @ (W0 / escala) + (b0 - (media / escala) @ W0):
+        el StandardScaler queda plegado en la primera capa Dense (cálculo en float64).
+        """
+        media = np.asarray(media, dtype=np.float64)
+        escala = np.asarray(escala, dtype=np.float64)
+        W0 = self.pesos[0].astype(np.float64)
+        W0_fusionado = W0 / escala[:, None]
+        b0_fusionado = self.sesgos[0].astype(np.float64) - (media / escala) @ W0
+        return ExtractorNumpy([W0_fusionado] + self.pesos[1:], [b0_fusionado] + self.sesgos[1:])
+
+    def predict(self, X, verbose=0):
+        """Misma firma que Model.predict: (N, 10) escaladas → (N, 64) deep features."""
+        h = np.asarray(X, dtype=np.float32)
+        for W, b in zip(self.pesos, self.sesgos):
+            h = h @ W
+            h += b
+            np.maximum(h, 0.0, out=h)
+        return h
+
+
+def cargar_o_exportar(ruta_nn, ruta_npz):
+    """Carga los pesos exportados; si faltan o el .h5 es más reciente, los exporta una vez."""
+    if os.path.exists(ruta_npz) and os.path.getmtime(ruta_npz) >= os.path.getmtime(ruta_nn):
+        return ExtractorNumpy.cargar(ruta_npz)
+
+    from tensorflow.keras.models import load_model
+
+    print(f"📤 Exportando pesos Dense de {ruta_nn} → {ruta_npz} ...")
+    extractor = ExtractorNumpy.desde_keras(load_model(ruta_nn))
+    extractor.guardar(ruta_npz)
+    return extractor
@@ -0,0 +1,64 @@
+import numpy as np
+import struct
+
+# === FORMATO BINARIO COMPACTO ===
+# Petición:  cabecera "<4sHHI" (firma b"FT22", versión de esquema, columnas, filas)
+#            + filas × columnas float32 little-endian
+# Respuesta: cabecera "<4sHHI" (firma b"FT2R", versión de esquema, nº de clases, filas)
+#            + por fila (int16 índice de clase, float32 confianza); clase -1 = fila inválida
+# Los nombres de clase viajan en la cabecera HTTP X-Fisiotech-Clases, en el orden del encoder.
+MIME_BINARIO = "application/x-fisiotech-f32"
+CABECERA = struct.Struct("<4sHHI")
+FIRMA_PETICION = b"FT22"
+FIRMA_RESPUESTA = b"FT2R"
+VERSION_ESQUEMA = 1
+
+DTYPE_FILA = np.dtype("<f4")
+DTYPE_RESPUESTA = np.dtype([("clase", "<i2"), ("confianza", "<f4")])
+
+
+class ErrorFormato(ValueError):
+    """El cuerpo binario no respeta el esquema esperado."""
+
+
+def codificar_filas(X):
+    X = np.ascontiguousarray(X, dtype=DTYPE_FILA)
+    if X.ndim != 2:
+        raise ErrorFormato("Se esperaba una matriz (filas, columnas).")
+    return CABECERA.pack(FIRMA_PETICION, VERSION_ESQUEMA, X.shape[1], X.shape[0]) + X.tobytes()
+
+
+def decodificar_filas(datos, columnas):
+    """Vista de solo lectura (filas, columnas) sobre el buffer recibido, sin copiar.
+
+    `columnas` es el número esperado o una tupla de números admitidos.
+    """
+    if len(datos) < CABECERA.size:
+        raise ErrorFormato("Cuerpo demasiado corto para la cabecera binaria.")
+    firma, version, n_columnas, n_filas = CABECERA.unpack_from(datos)
+    if firma != FIRMA_PETICION:
+        raise ErrorFormato("Firma binaria desconocida.")
+    if version != VERSION_ESQUEMA:
+        raise ErrorFormato(f"Versión de esquema {version} no soportada (se esperaba {VERSION_ESQUEMA}).")
+    admitidas = columnas if isinstance(columnas, tuple) else (columnas,)
+    if n_columnas not in admitidas:
+        raise ErrorFormato(f"X has {n_columnas} features, but the API expects {' or '.join(map(str, admitidas))}.")
+    esperado = CABECERA.size + n_filas * n_columnas * DTYPE_FILA.itemsize
+    if len(datos) != esperado:
+        raise ErrorFormato(f"Se esperaban {esperado} bytes para {n_filas} filas, llegaron {len(datos)}.")
+    return np.frombuffer(datos, dtype=DTYPE_FILA, count=n_filas * n_columnas,
+                         offset=CABECERA.size).reshape(n_filas, n_columnas)
+
+
+def codificar_respuesta(indices, confianzas, n_clases):
+    salida = np.empty(len(indices), dtype=DTYPE_RESPUESTA)
+    salida["clase"] = indices
+    salida["confianza"] = confianzas
+    return CABECERA.pack(FIRMA_RESPUESTA, VERSION_ESQUEMA, n_clases, len(salida)) + salida.tobytes()
+
+
+def decodificar_respuesta(datos):
+    firma, version, _, n_filas = CABECERA.unpack_from(datos)
+    if firma != FIRMA_RESPUESTA or version != VERSION_ESQUEMA:
+        raise ErrorFormato("Respuesta binaria con firma o versión desconocida.")
+    return np.frombuffer(datos, dtype=DTYPE_RESPUESTA, count=n_filas, offset=CABECERA.size)
@@ -0,0 +1,36 @@
+# === SERVIDOR MULTIPROCESO (gunicorn) ===
+# Uso, desde la raíz del repositorio (las rutas models/... son relativas a ella):
+#   FISIOTECH_FUENTE=paquete FISIOTECH_WORKERS=4 gunicorn -c App/api/gunicorn_fisiotech.py api_fisiotech_v22:app
+#
+# Los modelos se cargan una sola vez en el proceso maestro (preload_app) y los
+# workers los heredan por fork. Con FISIOTECH_FUENTE=paquete los pesos son un
+# np.memmap de solo lectura sobre modelo_v22.fisio: todas las páginas se comparten
+# desde la caché del sistema y ningún worker duplica el modelo.
+import multiprocessing
+import os
+
+# Un hilo BLAS por worker: los workers ya reparten los núcleos entre sí.
+# Debe fijarse antes de que el preload importe NumPy.
+for variable in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(variable, "1")
+
+if (os.environ.get("FISIOTECH_FUENTE", "artefactos").lower() != "paquete"
+        and os.environ.get("FISIOTECH_EXTRACTOR", "keras").lower() == "keras"):
+    # TensorFlow no sobrevive a un fork tras inicializarse
+    raise SystemExit("❌ El modo multiproceso requiere FISIOTECH_FUENTE=paquete o FISIOTECH_EXTRACTOR=numpy.")
+
+pythonpath = os.path.dirname(os.path.abspath(__file__))
+bind = os.environ.get("FISIOTECH_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("FISIOTECH_WORKERS", multiprocessing.cpu_count()))
+
+# Hilos por worker: /stream mantiene la conexión abierta durante toda la sesión
+worker_class = "gthread"
+threads = int(os.environ.get("FISIOTECH_HILOS", "4"))
+
+preload_app = True
+timeout = 60
+keepalive = 5
+
+
+def post_fork(server, worker):
+    server.log.info(f"✅ Worker {worker.pid} listo (modelos heredados del maestro).")
@@ -0,0 +1,213 @@
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "comun"))
+from derivacion_features import derivar_features, N_CANALES
+from trama_serial import DecodificadorTramas
+
+
+class Flujo:
+    """Un sensor (paciente/sesión) leído sin bloquear: solo se consume lo que ya está en el puerto."""
+
+    def __init__(self, id_flujo, fuente, paciente=None, sesion=None, formato="csv"):
+        if formato not in ("csv", "binario"):
+            raise ValueError(f"❌ Formato serie no soportado: '{formato}'. Usa 'csv' o 'binario'.")
+        self.id = id_flujo
+        self.fuente = fuente
+        self.paciente = paciente or id_flujo
+        self.sesion = sesion
+        self.formato = formato
+        self.decodificador = DecodificadorTramas() if formato == "binario" else None
+        self._resto = b""  # línea CSV incompleta del bloque anterior
+        self.suscriptores = set()
+        self.latencias_ms = deque(maxlen=1024)
+        self.contadores = {"muestras": 0, "malformadas": 0, "descartadas": 0, "predicciones": 0,
+                           "eventos_perdidos": 0}
+
+    def leer_disponible(self):
+        """Canales crudos (N, 7) de lo que haya en el puerto ahora mismo; (0, 7) si no hay nada."""
+        n = self.fuente.in_waiting
+        datos = self.fuente.read(n) if n else b""
+        if self.decodificador is not None:
+            canales = self.decodificador.alimentar(datos)[1].astype(np.float64)
+        else:
+            canales = self._parsear_csv(datos)
+        self.contadores["muestras"] += len(canales)
+        return canales
+
+    def _parsear_csv(self, datos):
+        *lineas, self._resto = (self._resto + datos).split(b"\n")
+        filas = []
+        for linea in lineas:
+            try:
+                valores = [float(x) for x in linea.split(b",")]
+            except ValueError:
+                valores = ()
+            if len(valores) == N_CANALES:
+                filas.append(valores)
+            elif linea.strip():
+                self.contadores["malformadas"] += 1
+        return np.array(filas, dtype=np.float64).reshape(-1, N_CANALES)
+
+    def publicar(self, evento):
+        """Entrega a cada suscriptor; a uno lento se le descarta su evento más antiguo."""
+        for cola in self.suscriptores:
+            if cola.full():
+                cola.get_nowait()
+                self.contadores["eventos_perdidos"] += 1
+            cola.put_nowait(evento)
+
+    def describir(self):
+        latencias = np.array(self.latencias_ms)
+        p50, p99 = np.percentile(latencias, [50, 99]) if len(latencias) else (0.0, 0.0)
+        return {"paciente": self.paciente, "sesion": self.sesion, "formato": self.formato,
+                **self.contadores, "suscriptores": len(self.suscriptores),
+                "latencia_ms": {"p50": round(float(p50), 3), "p99": round(float(p99), 3)},
+                "tramas": self.decodificador.contadores if self.decodificador else None}
+
+
+class IngestaMultisensor:
+    """Lee N sensores desde un solo bucle asyncio y comparte una inferencia por lotes entre todos.
+
+    Una sola tarea recorre todos los flujos cada `sondeo_ms` y vacía sus puertos
+    sin bloquear (una tarea por flujo multiplica los despertares del bucle: con
+    64 sensores a 10 ms son 6400 por segundo). Los bloques leídos entran en una
+    cola común; otra tarea los junta hasta `max_lote` filas o `ventana_ms`, llama a
+    `predecir_lote(X) → (labels, confianzas)` en un hilo del ejecutor y reparte
+    los resultados: cada flujo publica un evento por bloque a sus suscriptores
+    (y a los suscritos a todos los flujos). Con la cola común llena, los bloques
+    nuevos se descartan y se cuentan en su flujo.
+    """
+
+    def __init__(self, predecir_lote, max_lote=256, ventana_ms=20.0, sondeo_ms=20.0, max_pendientes=1024,
+                 ejecutor=None):
+        self.predecir_lote = predecir_lote
+        self.max_lote = max_lote
+        self.ventana = ventana_ms / 1000.0
+        self.sondeo = sondeo_ms / 1000.0
+        self.ejecutor = ejecutor
+        self.flujos = {}
+        self.suscriptores_todos = set()
+        self._cola = asyncio.Queue(maxsize=max_pendientes)
+        self._tareas = []
+        self._tamanos = deque(maxlen=1024)
+        self.contadores = {"lotes": 0, "filas": 0, "errores": 0}
+
+    def arrancar(self):
+        if not self._tareas:
+            bucle = asyncio.get_running_loop()
+            self._tareas = [bucle.create_task(self._sondear()), bucle.create_task(self._inferir())]
+
+    async def detener(self):
+        """Cancela sondeo e inferencia y cierra todos los puertos."""
+        for tarea in self._tareas:
+            tarea.cancel()
+        await asyncio.gather(*self._tareas, return_exceptions=True)
+        self._tareas = []
+        for id_flujo in list(self.flujos):
+            self.quitar(id_flujo)
+
+    def agregar(self, flujo):
+        if flujo.id in self.flujos:
+            raise ValueError(f"❌ Ya existe un flujo con id '{flujo.id}'.")
+        self.arrancar()
+        self.flujos[flujo.id] = flujo
+
+    def quitar(self, id_flujo):
+        """Deja de leer el flujo (los bloques ya encolados aún se publican) y cierra su puerto."""
+        flujo = self.flujos.pop(id_flujo)
+        flujo.fuente.close()
+        return flujo
+
+    def suscribir(self, id_flujo=None, capacidad=256):
+        """Cola de eventos de un flujo (o de todos con id_flujo=None)."""
+        cola = asyncio.Queue(maxsize=capacidad)
+        (self.suscriptores_todos if id_flujo is None else self.flujos[id_flujo].suscriptores).add(cola)
+        return cola
+
+    def desuscribir(self, cola, id_flujo=None):
+        destino = self.suscriptores_todos if id_flujo is None else getattr(self.flujos.get(id_flujo),
+                                                                            "suscriptores", set())
+        destino.discard(cola)
+
+    async def _sondear(self):
+        bucle = asyncio.get_running_loop()
+        while True:
+            inicio = bucle.time()
+            for flujo in list(self.flujos.values()):
+                try:
+                    canales = flujo.leer_disponible()
+                except (OSError, ValueError) as e:  # sensor desconectado: no frena al resto
+                    print(f"❌ Flujo '{flujo.id}' retirado: {e}")
+                    self.quitar(flujo.id)
+                    continue
+                if not len(canales):
+                    continue
+                try:
+                    self._cola.put_nowait((flujo, canales, time.perf_counter()))
+                except asyncio.QueueFull:
+                    flujo.contadores["descartadas"] += len(canales)
+            await asyncio.sleep(max(self.sondeo - (bucle.time() - inicio), 0))
+
+    async def _inferir(self):
+        bucle = asyncio.get_running_loop()
+        while True:
+            bloques = [await self._cola.get()]
+            filas = len(bloques[0][1])
+            limite = bucle.time() + self.ventana
+            # Sin wait_for: los bloques llegan a ráfagas, una por vuelta de sondeo
+            while True:
+                while filas < self.max_lote and not self._cola.empty():
+                    bloque = self._cola.get_nowait()
+                    bloques.append(bloque)
+                    filas += len(bloque[1])
+                restante = limite - bucle.time()
+                if filas >= self.max_lote or restante <= 0:
+                    break
+                await asyncio.sleep(min(restante, self.sondeo))
+
+            X = derivar_features(np.vstack([canales for _, canales, _ in bloques]))
+            try:
+                labels, confianzas = await bucle.run_in_executor(self.ejecutor, self.predecir_lote, X)
+            except Exception as e:
+                self.contadores["errores"] += 1
+                for flujo, canales, _ in bloques:
+                    self._publicar(flujo, {"flujo": flujo.id, "error": str(e)})
+                continue
+
+            self.contadores["lotes"] += 1
+            self.contadores["filas"] += filas
+            self._tamanos.append(filas)
+            self._repartir(bloques, labels, confianzas)
+
+    def _repartir(self, bloques, labels, confianzas):
+        ahora, inicio = time.perf_counter(), 0
+        for flujo, canales, t_lectura in bloques:
+            fin = inicio + len(canales)
+            flujo.contadores["predicciones"] += len(canales)
+            flujo.latencias_ms.append((ahora - t_lectura) * 1000)
+            self._publicar(flujo, {
+                "flujo": flujo.id, "paciente": flujo.paciente, "sesion": flujo.sesion, "t": time.time(),
+                "predicciones": [{"prediccion": str(p), "confianza": round(float(c), 3)}
+                                 for p, c in zip(labels[inicio:fin], confianzas[inicio:fin])],
+            })
+            inicio = fin
+
+    def _publicar(self, flujo, evento):
+        flujo.publicar(evento)
+        for cola in self.suscriptores_todos:
+            if cola.full():
+                cola.get_nowait()
+            cola.put_nowait(evento)
+
+    def estadisticas(self):
+        tamanos = np.array(self._tamanos)
+        return {**self.contadores, "en_cola": self._cola.qsize(), "flujos": len(self.flujos),
+                "tamano_lote_medio": round(float(tamanos.mean()), 2) if len(tamanos) else 0.0,
+                "config": {"max_lote": self.max_lote, "ventana_ms": self.ventana * 1000,
+                           "sondeo_ms": self.sondeo * 1000}}
@@ -0,0 +1,114 @@
+import bisect
+import threading
+from collections import defaultdict
+
+# Límites de los buckets (segundos): de 10 µs a 5 s, escala ~2.5×
+LIMITES_SEGUNDOS = [1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3,
+                    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+LIMITES_LOTE = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096]
+CUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histograma:
+    """Histograma de buckets fijos (acumulables al exponer), con cuantiles interpolados."""
+
+    def __init__(self, limites):
+        self.limites = list(limites)
+        self.conteos = [0] * (len(self.limites) + 1)  # el último es +Inf
+        self.suma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.conteos[bisect.bisect_left(self.limites, valor)] += 1
+        self.suma += valor
+        self.total += 1
+
+    def cuantil(self, q):
+        """Misma interpolación lineal dentro del bucket que histogram_quantile de Prometheus."""
+        if not self.total:
+            return 0.0
+        objetivo = q * self.total
+        acumulado = 0
+        for i, conteo in enumerate(self.conteos):
+            if acumulado + conteo >= objetivo and conteo:
+                if i == len(self.limites):
+                    return self.limites[-1]
+                inferior = self.limites[i - 1] if i else 0.0
+                return inferior + (self.limites[i] - inferior) * (objetivo - acumulado) / conteo
+            acumulado += conteo
+        return self.limites[-1]
+
+
+class RegistroMetricas:
+    """Latencia por etapa, peticiones, tamaños de lote y errores del servicio de predicción."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.etapas = defaultdict(lambda: Histograma(LIMITES_SEGUNDOS))
+        self.peticiones = defaultdict(lambda: Histograma(LIMITES_SEGUNDOS))
+        self.estados = defaultdict(int)
+        self.tamanos_lote = Histograma(LIMITES_LOTE)
+
+    def observar_etapas(self, duraciones, filas):
+        """Registra de una vez las etapas de una llamada al pipeline y su tamaño de lote."""
+        with self._lock:
+            for etapa, segundos in duraciones.items():
+                self.etapas[etapa].observar(segundos)
+            self.tamanos_lote.observar(filas)
+
+    def observar_etapa(self, etapa, segundos):
+        with self._lock:
+            self.etapas[etapa].observar(segundos)
+
+    def observar_peticion(self, endpoint, estado, segundos):
+        with self._lock:
+            self.peticiones[endpoint].observar(segundos)
+            self.estados[(endpoint, estado)] += 1
+
+    def exposicion(self):
+        """Formato de texto de exposición de Prometheus (text/plain; version=0.0.4)."""
+        lineas = []
+        with self._lock:
+            self._histogramas(lineas, "fisiotech_etapa_segundos",
+                              "Duración de cada etapa del pipeline híbrido.", "etapa", self.etapas)
+            self._histogramas(lineas, "fisiotech_peticion_segundos",
+                              "Duración total de cada petición HTTP.", "endpoint", self.peticiones)
+            self._histogramas(lineas, "fisiotech_tamano_lote_filas",
+                              "Filas por llamada al pipeline.", None, {None: self.tamanos_lote})
+
+            lineas.append("# HELP fisiotech_peticiones_total Peticiones atendidas por endpoint y código HTTP.")
+            lineas.append("# TYPE fisiotech_peticiones_total counter")
+            for (endpoint, estado), n in sorted(self.estados.items()):
+                lineas.append(f'fisiotech_peticiones_total{{endpoint="{endpoint}",estado="{estado}"}} {n}')
+
+            lineas.append("# HELP fisiotech_errores_total Peticiones respondidas con código >= 400.")
+            lineas.append("# TYPE fisiotech_errores_total counter")
+            errores = defaultdict(int)
+            for (endpoint, estado), n in self.estados.items():
+                if estado >= 400:
+                    errores[endpoint] += n
+            for endpoint, n in sorted(errores.items()):
+                lineas.append(f'fisiotech_errores_total{{endpoint="{endpoint}"}} {n}')
+        return "\n".join(lineas) + "\n"
+
+    @staticmethod
+    def _histogramas(lineas, nombre, ayuda, etiqueta, histogramas):
+        lineas.append(f"# HELP {nombre} {ayuda}")
+        lineas.append(f"# TYPE {nombre} histogram")
+        for valor, h in sorted(histogramas.items(), key=lambda par: str(par[0])):
+            base = f'{etiqueta}="{valor}",' if etiqueta else ""
+            acumulado = 0
+            for limite, conteo in zip(h.limites + ["+Inf"], h.conteos):
+                acumulado += conteo
+                lineas.append(f'{nombre}_bucket{{{base}le="{limite}"}} {acumulado}')
+            etiquetas = f"{{{base.rstrip(',')}}}" if etiqueta else ""
+            lineas.append(f"{nombre}_sum{etiquetas} {h.suma}")
+            lineas.append(f"{nombre}_count{etiquetas} {h.total}")
+
+        # p50/p95/p99 estimados desde los buckets, como gauges para paneles sin PromQL
+        lineas.append(f"# HELP {nombre}_cuantil Cuantiles p50/p95/p99 estimados desde los buckets.")
+        lineas.append(f"# TYPE {nombre}_cuantil gauge")
+        for valor, h in sorted(histogramas.items(), key=lambda par: str(par[0])):
+            base = f'{etiqueta}="{valor}",' if etiqueta else ""
+            for q in CUANTILES:
+                lineas.append(f'{nombre}_cuantil{{{base}quantile="{q}"}} {h.cuantil(q):.6g}')
@@ -0,0 +1,141 @@
+import json
+import os
+import sys
+import numpy as np
+
+EXTRACTOR_ONNX_PATH = "models/extractor_v22.onnx"
+BOSQUE_ONNX_PATH = "models/modelo_rf_v22.onnx"
+OPSET = 17
+OPSET_ML = 3
+IR_VERSION = 8  # la que corresponde a opset 17: la leen también onnxruntime antiguos
+
+
+# === EXPORTACIÓN (necesita onnx y skl2onnx, no onnxruntime) ===
+def extractor_a_onnx(extractor):
+    """Grafo MatMul → Add → Relu por capa Dense: (N, 10) escaladas → (N, 64) deep features."""
+    from onnx import TensorProto, helper, numpy_helper
+
+    nodos, inicializadores = [], []
+    entrada = "features"
+    for i, (W, b) in enumerate(zip(extractor.pesos, extractor.sesgos)):
+        inicializadores += [numpy_helper.from_array(W, f"W{i}"), numpy_helper.from_array(b, f"b{i}")]
+        salida = "deep_features" if i == len(extractor.pesos) - 1 else f"h{i}"
+        nodos += [helper.make_node("MatMul", [entrada, f"W{i}"], [f"mm{i}"]),
+                  helper.make_node("Add", [f"mm{i}", f"b{i}"], [f"z{i}"]),
+                  helper.make_node("Relu", [f"z{i}"], [salida])]
+        entrada = salida
+
+    grafo = helper.make_graph(
+        nodos, "extractor_v22",
+        [helper.make_tensor_value_info("features", TensorProto.FLOAT, [None, extractor.pesos[0].shape[0]])],
+        [helper.make_tensor_value_info("deep_features", TensorProto.FLOAT, [None, extractor.pesos[-1].shape[1]])],
+        inicializadores)
+    return helper.make_model(grafo, opset_imports=[helper.make_opsetid("", OPSET)],
+                             ir_version=IR_VERSION)
+
+
+def bosque_a_onnx(rf):
+    """RandomForestClassifier de sklearn como TreeEnsembleClassifier; probabilidades en un tensor (sin ZipMap)."""
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+
+    modelo = convert_sklearn(rf, initial_types=[("deep_features", FloatTensorType([None, rf.n_features_in_]))],
+                             options={id(rf): {"zipmap": False}},
+                             target_opset={"": OPSET, "ai.onnx.ml": OPSET_ML})
+    # Las clases del RF (índices del encoder) viajan con el grafo para no depender del .pkl al servir
+    modelo.metadata_props.add(key="classes", value=json.dumps(rf.classes_.tolist()))
+    return modelo
+
+
+def guardar_onnx(modelo, ruta):
+    import onnx
+
+    onnx.checker.check_model(modelo)
+    ruta_tmp = f"{ruta}.tmp"
+    onnx.save(modelo, ruta_tmp)
+    os.replace(ruta_tmp, ruta)  # atómico: el vigilante de la API nunca ve un grafo a medias
+
+
+def exportar_extractor(ruta_nn, ruta_npz, ruta_onnx):
+    from extractor_numpy import cargar_o_exportar
+
+    print(f"📤 Exportando extractor {ruta_nn} → {ruta_onnx} ...")
+    guardar_onnx(extractor_a_onnx(cargar_o_exportar(ruta_nn, ruta_npz)), ruta_onnx)
+
+
+def exportar_bosque(ruta_rf, ruta_onnx):
+    import joblib
+
+    print(f"📤 Exportando Random Forest {ruta_rf} → {ruta_onnx} ...")
+    guardar_onnx(bosque_a_onnx(joblib.load(ruta_rf)), ruta_onnx)
+
+
+def _vigente(ruta_onnx, ruta_origen):
+    return os.path.exists(ruta_onnx) and os.path.getmtime(ruta_onnx) >= os.path.getmtime(ruta_origen)
+
+
+def cargar_o_exportar_extractor(ruta_nn, ruta_npz, ruta_onnx):
+    """Carga el grafo exportado; si falta o el .h5 es más reciente, lo exporta una vez."""
+    if not _vigente(ruta_onnx, ruta_nn):
+        exportar_extractor(ruta_nn, ruta_npz, ruta_onnx)
+    return ExtractorOnnx(ruta_onnx)
+
+
+def cargar_o_exportar_bosque(ruta_rf, ruta_onnx):
+    """Carga el grafo exportado; si falta o el .pkl es más reciente, lo exporta una vez."""
+    if not _vigente(ruta_onnx, ruta_rf):
+        exportar_bosque(ruta_rf, ruta_onnx)
+    return BosqueOnnx(ruta_onnx)
+
+
+# === EJECUCIÓN (solo onnxruntime) ===
+def _sesion(ruta):
+    import onnxruntime as ort
+
+    opciones = ort.SessionOptions()
+    opciones.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # Con varios workers de gunicorn (OMP_NUM_THREADS=1) cada sesión usa un solo hilo
+    opciones.intra_op_num_threads = int(os.environ.get("OMP_NUM_THREADS", "0"))
+    return ort.InferenceSession(ruta, opciones, providers=["CPUExecutionProvider"])
+
+
+class ExtractorOnnx:
+    """Misma interfaz que ExtractorNumpy / Model de Keras, ejecutado por onnxruntime."""
+
+    def __init__(self, ruta):
+        self.sesion = _sesion(ruta)
+
+    def predict(self, X, verbose=0):
+        return self.sesion.run(["deep_features"], {"features": np.asarray(X, dtype=np.float32)})[0]
+
+
+class BosqueOnnx:
+    """Misma interfaz que BosqueCompilado (predict_proba, predict, classes_), ejecutado por onnxruntime."""
+
+    def __init__(self, ruta):
+        self.sesion = _sesion(ruta)
+        self.classes_ = np.asarray(json.loads(self.sesion.get_modelmeta().custom_metadata_map["classes"]))
+
+    def predict_proba(self, X):
+        return self.sesion.run(["probabilities"], {"deep_features": np.asarray(X, dtype=np.float32)})[0]
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+if __name__ == "__main__":
+    # Exporta el extractor y el RF v22 a ONNX: la API puede servirlos sin TensorFlow
+    MODEL_NN_PATH = "models/modelo_nn_v22.h5"
+    MODEL_RF_PATH = "models/modelo_rf_v22.pkl"
+    EXTRACTOR_NPZ_PATH = "models/extractor_v22.npz"
+
+    destino_extractor = sys.argv[1] if len(sys.argv) > 1 else EXTRACTOR_ONNX_PATH
+    destino_bosque = sys.argv[2] if len(sys.argv) > 2 else BOSQUE_ONNX_PATH
+    for ruta in (MODEL_NN_PATH, MODEL_RF_PATH):
+        if not os.path.exists(ruta):
+            raise FileNotFoundError(f"❌ No se encontró {ruta}. Ejecuta el reentrenamiento v22 primero.")
+
+    exportar_extractor(MODEL_NN_PATH, EXTRACTOR_NPZ_PATH, destino_extractor)
+    exportar_bosque(MODEL_RF_PATH, destino_bosque)
+    print(f"✅ Grafos guardados: {destino_extractor} ({os.path.getsize(destino_extractor) / 1e3:.0f} KB), "
+          f"{destino_bosque} ({os.path.getsize(destino_bosque) / 1e6:.1f} MB)")
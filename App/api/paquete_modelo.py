@@ -0,0 +1,185 @@
+import numpy as np
+import json
+import struct
+import time
+import os
+import sys
+
+from extractor_numpy import ExtractorNumpy
+from bosque_compilado import BosqueCompilado
+
+# === FORMATO DEL PAQUETE v22 ===
+# [0:8]   firma b"FISIO22\0"
+# [8:12]  versión del formato (uint32, little-endian)
+# [12:20] longitud L del manifiesto (uint64, little-endian)
+# [20:20+L] manifiesto JSON: orden de features, clases y {nombre: dtype, shape, offset}
+# resto   arrays crudos little-endian alineados a 64 bytes, mapeables con np.memmap
+FIRMA = b"FISIO22\0"
+VERSION_FORMATO = 2  # v2: bosque en int32/float32, tal como lo recorre BosqueCompilado
+CABECERA = struct.Struct("<8sIQ")
+ALINEACION = 64
+
+MODEL_BUNDLE_PATH = "models/modelo_v22.fisio"
+
+
+class EscaladorNumpy:
+    """StandardScaler.transform con la media y escala guardadas en el paquete."""
+
+    def __init__(self, media, escala):
+        self.mean_ = media
+        self.scale_ = escala
+
+    def transform(self, X):
+        X = np.array(X, dtype=np.float64)
+        X -= self.mean_
+        X /= self.scale_
+        return X
+
+
+class CodificadorEtiquetas:
+    """LabelEncoder.inverse_transform sobre las clases del paquete."""
+
+    def __init__(self, clases):
+        self.classes_ = np.asarray(clases)
+
+    def inverse_transform(self, y):
+        return self.classes_[np.asarray(y, dtype=np.intp)]
+
+
+class PaqueteModelo:
+    """Pipeline híbrido v22 servido desde un único archivo mapeado en memoria (sin TensorFlow ni joblib)."""
+
+    def __init__(self, manifiesto, arrays):
+        self.manifiesto = manifiesto
+        self.features = manifiesto["features"]
+
+        self.scaler = EscaladorNumpy(arrays["scaler_media"], arrays["scaler_escala"])
+        n_capas = manifiesto["capas_extractor"]
+        self.extractor = ExtractorNumpy([arrays[f"W{i}"] for i in range(n_capas)],
+                                        [arrays[f"b{i}"] for i in range(n_capas)])
+        if "W0_fusionado" in arrays:
+            self.extractor_fusionado = ExtractorNumpy([arrays["W0_fusionado"]] + self.extractor.pesos[1:],
+                                                      [arrays["b0_fusionado"]] + self.extractor.sesgos[1:])
+        else:  # paquetes anteriores a la fusión: se pliega al cargar
+            self.extractor_fusionado = self.extractor.fusionar_escalador(self.scaler.mean_, self.scaler.scale_)
+        # Las vistas mapeadas ya tienen el dtype del recorrido: el bosque las usa sin copiarlas
+        self.rf = BosqueCompilado(arrays["bosque_feature"], arrays["bosque_umbral"], arrays["bosque_hijos"],
+                                  arrays["bosque_valores"], arrays["bosque_raices"],
+                                  arrays["bosque_clases"], manifiesto["profundidad_bosque"])
+        self.encoder = CodificadorEtiquetas(manifiesto["clases"])
+
+
+def _alinear(n):
+    return (n + ALINEACION - 1) // ALINEACION * ALINEACION
+
+
+def escribir_paquete(ruta, scaler, extractor, bosque, encoder, features):
+    """Guarda scaler, pesos Dense, bosque aplanado, clases y orden de features en un solo archivo."""
+    arrays = {
+        "scaler_media": scaler.mean_,
+        "scaler_escala": scaler.scale_,
+        "bosque_feature": bosque.feature,
+        "bosque_umbral": bosque.umbral,
+        "bosque_hijos": bosque.hijos,
+        "bosque_valores": bosque.valores,
+        "bosque_raices": bosque.raices,
+        "bosque_clases": bosque.classes_,
+    }
+    for i, (W, b) in enumerate(zip(extractor.pesos, extractor.sesgos)):
+        arrays[f"W{i}"] = W
+        arrays[f"b{i}"] = b
+
+    # Primera capa con el StandardScaler plegado: se sirve sin etapa de escalado
+    fusionado = extractor.fusionar_escalador(scaler.mean_, scaler.scale_)
+    arrays["W0_fusionado"] = fusionado.pesos[0]
+    arrays["b0_fusionado"] = fusionado.sesgos[0]
+
+    # Little-endian explícito: el paquete es portable entre máquinas
+    arrays = {nombre: np.ascontiguousarray(a, dtype=np.dtype(a.dtype).newbyteorder("<"))
+              for nombre, a in arrays.items()}
+
+    manifiesto = {
+        "version": VERSION_FORMATO,
+        "creado": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "features": list(features),
+        "clases": [str(c) for c in encoder.classes_],
+        "capas_extractor": len(extractor.pesos),
+        "profundidad_bosque": bosque.profundidad,
+        "arrays": {},
+    }
+
+    # Los offsets dependen de la longitud del manifiesto: se reserva espacio y se recalcula
+    reserva = 0
+    while True:
+        offset = _alinear(CABECERA.size + reserva)
+        for nombre, a in arrays.items():
+            manifiesto["arrays"][nombre] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": offset}
+            offset = _alinear(offset + a.nbytes)
+        texto = json.dumps(manifiesto, ensure_ascii=False).encode("utf-8")
+        if len(texto) <= reserva:
+            break
+        reserva = len(texto) + ALINEACION
+
+    # Escritura atómica: un servidor nunca ve un paquete a medio escribir
+    ruta_tmp = ruta + ".tmp"
+    with open(ruta_tmp, "wb") as f:
+        f.write(CABECERA.pack(FIRMA, VERSION_FORMATO, len(texto)))
+        f.write(texto)
+        for nombre, a in arrays.items():
+            f.seek(manifiesto["arrays"][nombre]["offset"])
+            f.write(a.tobytes())
+    os.replace(ruta_tmp, ruta)
+
+
+def leer_manifiesto(ruta):
+    with open(ruta, "rb") as f:
+        firma, version, longitud = CABECERA.unpack(f.read(CABECERA.size))
+        if firma != FIRMA:
+            raise ValueError(f"❌ {ruta} no es un paquete de modelo FisioTech.")
+        if version != VERSION_FORMATO:
+            raise ValueError(f"❌ Versión de paquete {version} no soportada (se esperaba {VERSION_FORMATO}).")
+        return json.loads(f.read(longitud).decode("utf-8"))
+
+
+def cargar_paquete(ruta=MODEL_BUNDLE_PATH):
+    """Mapea el paquete en solo lectura: los procesos que lo abren comparten las mismas páginas."""
+    manifiesto = leer_manifiesto(ruta)
+    mapa = np.memmap(ruta, dtype=np.uint8, mode="r")
+
+    arrays = {}
+    for nombre, info in manifiesto["arrays"].items():
+        dtype = np.dtype(info["dtype"])
+        n_bytes = int(np.prod(info["shape"], dtype=np.int64)) * dtype.itemsize
+        inicio = info["offset"]
+        arrays[nombre] = mapa[inicio:inicio + n_bytes].view(dtype).reshape(info["shape"])
+    return PaqueteModelo(manifiesto, arrays)
+
+
+if __name__ == "__main__":
+    # Convierte los artefactos v22 existentes (h5 + pickles) en un paquete
+    import joblib
+    from tensorflow.keras.models import load_model
+
+    MODEL_NN_PATH = "models/modelo_nn_v22.h5"
+    MODEL_RF_PATH = "models/modelo_rf_v22.pkl"
+    SCALER_PATH = "models/scaler_v22.pkl"
+    ENCODER_PATH = "models/encoder_v22.pkl"
+    FEATURES = ["ax", "ay", "az", "gx", "gy", "gz", "intensidad", "magnitud_acc", "velocidad_ang", "energia_mov"]
+
+    destino = sys.argv[1] if len(sys.argv) > 1 else MODEL_BUNDLE_PATH
+    for ruta in (MODEL_NN_PATH, MODEL_RF_PATH, SCALER_PATH, ENCODER_PATH):
+        if not os.path.exists(ruta):
+            raise FileNotFoundError(f"❌ No se encontró {ruta}. Ejecuta el reentrenamiento v22 primero.")
+
+    print("📦 Empaquetando artefactos v22...")
+    escribir_paquete(destino,
+                     joblib.load(SCALER_PATH),
+                     ExtractorNumpy.desde_keras(load_model(MODEL_NN_PATH)),
+                     BosqueCompilado.desde_sklearn(joblib.load(MODEL_RF_PATH)),
+                     joblib.load(ENCODER_PATH),
+                     FEATURES)
+
+    t0 = time.perf_counter()
+    cargar_paquete(destino)
+    print(f"✅ Paquete guardado en {destino} ({os.path.getsize(destino) / 1e6:.1f} MB), "
+          f"carga en {(time.perf_counter() - t0) * 1000:.1f} ms")
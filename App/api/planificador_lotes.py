@@ -0,0 +1,138 @@
+import numpy as np
+import os
+import threading
+import queue
+import time
+from collections import deque
+
+
+class ColaLlena(Exception):
+    """La cola del planificador alcanzó su profundidad máxima."""
+
+
+class LatenciaExcedida(Exception):
+    """La solicitud no pudo resolverse dentro de la latencia máxima garantizada."""
+
+
+class _Solicitud:
+    __slots__ = ("fila", "t_llegada", "resultado", "error", "listo")
+
+    def __init__(self, fila):
+        self.fila = fila
+        self.t_llegada = time.perf_counter()
+        self.resultado = None
+        self.error = None
+        self.listo = threading.Event()
+
+
+class PlanificadorLotes:
+    """Agrupa solicitudes individuales en micro-lotes y las resuelve con una sola llamada vectorizada.
+
+    Un lote se despacha cuando junta `max_lote` filas o cuando vence `ventana_ms`
+    desde la llegada de su primera fila. Ninguna solicitud espera más de
+    `latencia_max_ms`: si la cola está llena se rechaza de inmediato y si expira
+    antes de procesarse se descarta sin calcularla.
+    """
+
+    def __init__(self, funcion_lote, ventana_ms=2.0, max_lote=64, max_cola=1024,
+                 latencia_max_ms=100.0, n_muestras=2048):
+        self.funcion_lote = funcion_lote
+        self.ventana = ventana_ms / 1000.0
+        self.max_lote = max_lote
+        self.latencia_max = latencia_max_ms / 1000.0
+        self.max_cola = max_cola
+        self.n_muestras = n_muestras
+        self._arrancar()
+
+        # Tras un fork (workers de gunicorn con preload) el hilo no existe en el hijo:
+        # cada proceso arranca el suyo, con su propia cola y contadores
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._arrancar)
+
+    def _arrancar(self):
+        self.cola = queue.Queue(maxsize=self.max_cola)
+        self._lock = threading.Lock()
+        self._inicio = time.perf_counter()
+        self._latencias_ms = deque(maxlen=self.n_muestras)
+        self._tamanos = deque(maxlen=self.n_muestras)
+        self._contadores = {"procesadas": 0, "lotes": 0, "rechazadas": 0, "expiradas": 0, "errores": 0}
+
+        self._hilo = threading.Thread(target=self._bucle, name="planificador-lotes", daemon=True)
+        self._hilo.start()
+
+    def enviar(self, fila):
+        """Encola una fila y bloquea hasta tener su resultado individual."""
+        solicitud = _Solicitud(fila)
+        try:
+            self.cola.put_nowait(solicitud)
+        except queue.Full:
+            self._contar("rechazadas")
+            raise ColaLlena(f"Cola del planificador llena ({self.cola.maxsize} solicitudes).")
+
+        if not solicitud.listo.wait(self.latencia_max):
+            self._contar("expiradas")
+            raise LatenciaExcedida(f"Sin respuesta en {self.latencia_max * 1000:.0f} ms.")
+        if solicitud.error is not None:
+            raise solicitud.error
+        return solicitud.resultado
+
+    def _bucle(self):
+        while True:
+            lote = [self.cola.get()]
+            limite = lote[0].t_llegada + self.ventana
+            while len(lote) < self.max_lote:
+                restante = limite - time.perf_counter()
+                try:
+                    lote.append(self.cola.get(timeout=restante) if restante > 0 else self.cola.get_nowait())
+                except queue.Empty:
+                    break
+            self._procesar(lote)
+
+    def _procesar(self, lote):
+        t_inicio = time.perf_counter()
+        # El solicitante ya abandonó las que superaron la latencia máxima: no se calculan
+        vigentes = [s for s in lote if t_inicio - s.t_llegada < self.latencia_max]
+        if not vigentes:
+            return
+
+        try:
+            resultados = self.funcion_lote(np.vstack([s.fila for s in vigentes]))
+            for solicitud, resultado in zip(vigentes, resultados):
+                solicitud.resultado = resultado
+        except Exception as e:
+            self._contar("errores", len(vigentes))
+            for solicitud in vigentes:
+                solicitud.error = e
+
+        with self._lock:
+            self._contadores["procesadas"] += len(vigentes)
+            self._contadores["lotes"] += 1
+            self._tamanos.append(len(vigentes))
+            self._latencias_ms.extend((t_inicio - s.t_llegada) * 1000 for s in vigentes)
+
+        for solicitud in vigentes:
+            solicitud.listo.set()
+
+    def _contar(self, clave, n=1):
+        with self._lock:
+            self._contadores[clave] += n
+
+    def estadisticas(self):
+        """Throughput y latencia añadida por la espera en cola, para ajustar ventana y tamaño."""
+        with self._lock:
+            contadores = dict(self._contadores)
+            latencias = np.array(self._latencias_ms)
+            tamanos = np.array(self._tamanos)
+
+        transcurrido = time.perf_counter() - self._inicio
+        p50, p95, p99 = np.percentile(latencias, [50, 95, 99]) if len(latencias) else (0.0, 0.0, 0.0)
+        return {
+            **contadores,
+            "en_cola": self.cola.qsize(),
+            "throughput_filas_s": round(contadores["procesadas"] / transcurrido, 1),
+            "tamano_lote_medio": round(float(tamanos.mean()), 2) if len(tamanos) else 0.0,
+            "latencia_anadida_ms": {"p50": round(float(p50), 3), "p95": round(float(p95), 3),
+                                    "p99": round(float(p99), 3)},
+            "config": {"ventana_ms": self.ventana * 1000, "max_lote": self.max_lote,
+                       "max_cola": self.cola.maxsize, "latencia_max_ms": self.latencia_max * 1000},
+        }
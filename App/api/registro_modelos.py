@@ -0,0 +1,168 @@
+import numpy as np
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class ModeloDesconocido(KeyError):
+    """La petición pide un modelo que no está registrado."""
+
+
+class ClasificadorKeras:
+    """Red Keras completa (softmax) sobre las primeras `columnas` features, como modelo_final.keras."""
+
+    def __init__(self, modelo, scaler, encoder, columnas):
+        self.modelo = modelo
+        self.scaler = scaler
+        self.encoder = encoder
+        self.columnas = columnas
+        self.indice_clase = {str(c): i for i, c in enumerate(encoder.classes_)}
+
+    def predecir_lote(self, X, metricas=None):
+        probs = self.modelo.predict(self.scaler.transform(X[:, :self.columnas]), verbose=0)
+        idx = np.argmax(probs, axis=1)
+        return self.encoder.inverse_transform(idx), probs[np.arange(len(idx)), idx]
+
+
+class _Entrada:
+    def __init__(self, nombre, cargar, rutas, fijo, actual=None):
+        self.nombre = nombre
+        self.cargar = cargar
+        self.actual = actual  # si existe, el objeto se resuelve en cada petición y no se guarda
+        self.rutas = list(rutas)
+        self.fijo = fijo
+        self.objeto = None
+        self.en_uso = 0
+        self.ultimo_uso = 0.0
+        self.t_carga = None
+        self.lock_carga = threading.Lock()
+        self.latencias_ms = deque(maxlen=1024)
+        self.contadores = {"peticiones": 0, "filas": 0, "errores": 0, "cargas": 0, "desalojos": 0}
+
+    def memoria_mb(self):
+        """Estimación por el tamaño en disco de sus artefactos (pesos y árboles dominan)."""
+        return sum(os.path.getsize(r) for r in self.rutas if os.path.exists(r)) / 2**20
+
+
+class RegistroModelos:
+    """Modelos servibles por nombre: carga perezosa, desalojo LRU bajo un presupuesto de memoria.
+
+    Cada modelo se carga la primera vez que se pide. Si tras una carga los modelos
+    residentes superan `presupuesto_mb`, se descargan los menos usados
+    recientemente que no estén atendiendo ninguna petición. Los modelos `fijo`
+    nunca se desalojan; los registrados con registrar_activo() (el v22 por
+    defecto, que se recarga en caliente) tampoco, y no se guardan aquí.
+    """
+
+    def __init__(self, presupuesto_mb=512):
+        self.presupuesto_mb = presupuesto_mb
+        self._entradas = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, nombre, cargar, rutas, fijo=False):
+        """`cargar()` devuelve un objeto con predecir_lote(X, metricas) → (labels, confianzas)."""
+        self._entradas[nombre] = _Entrada(nombre, cargar, rutas, fijo)
+
+    def registrar_activo(self, nombre, actual, rutas):
+        """Modelo que vive fuera del registro: `actual()` devuelve la versión en servicio en cada petición.
+
+        Así, tras una recarga en caliente el registro no retiene la versión anterior.
+        """
+        self._entradas[nombre] = _Entrada(nombre, None, rutas, fijo=True, actual=actual)
+
+    def nombres(self):
+        return list(self._entradas)
+
+    @contextmanager
+    def usar(self, nombre, filas):
+        """Entrega el modelo cargado y registra la latencia de lo que se haga con él."""
+        entrada = self._entradas.get(nombre)
+        if entrada is None:
+            raise ModeloDesconocido(f"Modelo '{nombre}' no registrado. Disponibles: {', '.join(self._entradas)}.")
+
+        objeto = self._asegurar_cargado(entrada)
+        t0 = time.perf_counter()
+        try:
+            yield objeto
+        except Exception:
+            with self._lock:
+                entrada.contadores["errores"] += 1
+            raise
+        finally:
+            with self._lock:
+                entrada.en_uso -= 1
+                entrada.ultimo_uso = time.time()
+                entrada.contadores["peticiones"] += 1
+                entrada.contadores["filas"] += filas
+                entrada.latencias_ms.append((time.perf_counter() - t0) * 1000)
+
+    def _asegurar_cargado(self, entrada):
+        if entrada.actual is not None:
+            objeto = entrada.actual()
+            with self._lock:
+                entrada.en_uso += 1
+            return objeto
+
+        with self._lock:
+            if entrada.objeto is not None:
+                entrada.en_uso += 1
+                return entrada.objeto
+
+        # Una sola carga por modelo aunque lleguen varias peticiones a la vez
+        with entrada.lock_carga:
+            if entrada.objeto is None:
+                t0 = time.perf_counter()
+                objeto = entrada.cargar()
+                entrada.t_carga = time.perf_counter() - t0
+                with self._lock:
+                    entrada.objeto = objeto
+                    entrada.contadores["cargas"] += 1
+                print(f"📦 Modelo '{entrada.nombre}' cargado en {entrada.t_carga * 1000:.0f} ms.")
+            with self._lock:
+                entrada.en_uso += 1
+                objeto = entrada.objeto
+                self._desalojar(excepto=entrada)
+        return objeto
+
+    def _desalojar(self, excepto):
+        """Descarga modelos inactivos (LRU) hasta volver al presupuesto. Requiere self._lock."""
+        residentes = [e for e in self._entradas.values() if e.objeto is not None or e.actual is not None]
+        total = sum(e.memoria_mb() for e in residentes)
+        candidatos = sorted((e for e in residentes if not e.fijo and e.en_uso == 0 and e is not excepto),
+                            key=lambda e: e.ultimo_uso)
+        for entrada in candidatos:
+            if total <= self.presupuesto_mb:
+                break
+            total -= entrada.memoria_mb()
+            entrada.objeto = None
+            entrada.contadores["desalojos"] += 1
+            print(f"🧹 Modelo '{entrada.nombre}' desalojado (presupuesto {self.presupuesto_mb} MB).")
+
+    def estadisticas(self):
+        with self._lock:
+            modelos = {}
+            for nombre, e in self._entradas.items():
+                latencias = np.array(e.latencias_ms)
+                p50, p95, p99 = np.percentile(latencias, [50, 95, 99]) if len(latencias) else (0.0, 0.0, 0.0)
+                activo = e.actual() if e.actual is not None else None
+                t_carga = getattr(activo, "t_carga", None) if activo is not None else e.t_carga
+                # Lo que se cargó de verdad (p. ej. si el scaler va plegado en el extractor o aparte)
+                cargado = activo if activo is not None else e.objeto
+                descripcion = cargado.describir() if hasattr(cargado, "describir") else {}
+                modelos[nombre] = {
+                    **e.contadores,
+                    "cargado": e.objeto is not None or e.actual is not None,
+                    "fijo": e.fijo,
+                    "en_uso": e.en_uso,
+                    "memoria_mb": round(e.memoria_mb(), 2),
+                    "t_carga_ms": round(t_carga * 1000, 1) if t_carga is not None else None,
+                    "version": getattr(activo, "version", None),
+                    "extractor": descripcion.get("extractor"),
+                    "escalador": descripcion.get("escalador"),
+                    "latencia_ms": {"media": round(float(latencias.mean()), 3) if len(latencias) else 0.0,
+                                    "p50": round(float(p50), 3), "p95": round(float(p95), 3),
+                                    "p99": round(float(p99), 3)},
+                }
+        return {"presupuesto_mb": self.presupuesto_mb, "modelos": modelos}
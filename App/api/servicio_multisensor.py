@@ -0,0 +1,125 @@
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+# Mismos modelos, configuración FISIOTECH_* y pipeline que la API Flask
+import api_fisiotech_v22 as servicio
+from ingesta_multisensor import Flujo, IngestaMultisensor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "comun"))
+from fuentes_muestras import abrir_puerto
+
+# === SERVICIO DE INGESTA MULTISENSOR ===
+# Uso, desde la raíz del repositorio:
+#   FISIOTECH_SENSORES="p1=COM3,p2=COM4" python App/api/servicio_multisensor.py
+#   FISIOTECH_SENSORES="p1=sim:data/datos_reales.csv?hz=100" ...   (sensores simulados)
+# Un solo proceso lee todos los sensores de la sala; las predicciones de cada
+# paciente se siguen en GET /flujos/<id>/predicciones (NDJSON, un evento por bloque leído).
+SENSORES = os.environ.get("FISIOTECH_SENSORES", "")
+BAUDIOS = int(os.environ.get("FISIOTECH_BAUDIOS", "9600"))
+FORMATO_SERIAL = os.environ.get("FISIOTECH_FORMATO_SERIAL", "csv")
+MODELO = os.environ.get("FISIOTECH_FANIN_MODELO", servicio.MODELO_POR_DEFECTO)
+MAX_LOTE = int(os.environ.get("FISIOTECH_FANIN_MAX_LOTE", "256"))
+VENTANA_MS = float(os.environ.get("FISIOTECH_FANIN_VENTANA_MS", "20"))
+SONDEO_MS = float(os.environ.get("FISIOTECH_FANIN_SONDEO_MS", "20"))
+PUERTO_HTTP = int(os.environ.get("FISIOTECH_FANIN_PUERTO", "5100"))
+
+ejecutor = ThreadPoolExecutor(1, thread_name_prefix="inferencia-fanin")
+ingesta = IngestaMultisensor(lambda X: servicio.predecir_con(MODELO, X), max_lote=MAX_LOTE,
+                             ventana_ms=VENTANA_MS, sondeo_ms=SONDEO_MS, ejecutor=ejecutor)
+
+
+def crear_flujo(id_flujo, puerto, paciente=None, sesion=None, formato=None):
+    fuente = abrir_puerto(puerto, BAUDIOS)
+    try:
+        # Un sensor simulado ya sabe en qué formato emite; uno real usa FISIOTECH_FORMATO_SERIAL
+        return Flujo(id_flujo, fuente, paciente, sesion, formato or getattr(fuente, "formato", FORMATO_SERIAL))
+    except ValueError:
+        fuente.close()
+        raise
+
+
+@asynccontextmanager
+async def ciclo_vida(app):
+    for entrada in filter(None, SENSORES.split(",")):
+        id_flujo, puerto = entrada.split("=", 1)
+        ingesta.agregar(crear_flujo(id_flujo, puerto))
+        print(f"📡 Sensor '{id_flujo}' → {puerto}")
+    ingesta.arrancar()
+    yield
+    await ingesta.detener()
+
+
+async def home(request):
+    return JSONResponse({"mensaje": "Servicio multisensor FisioTech v22", "modelo": MODELO,
+                         "ingesta": ingesta.estadisticas()})
+
+
+async def listar_flujos(request):
+    return JSONResponse({id_flujo: f.describir() for id_flujo, f in ingesta.flujos.items()})
+
+
+async def crear(request):
+    try:
+        data = await request.json()
+        id_flujo = str(data["id"])
+        if id_flujo in ingesta.flujos:  # antes de abrir el puerto: un 400 no debe dejarlo abierto
+            return JSONResponse({"error": f"Ya existe un flujo con id '{id_flujo}'."}, status_code=409)
+        flujo = crear_flujo(id_flujo, data["puerto"], data.get("paciente"), data.get("sesion"), data.get("formato"))
+        try:
+            ingesta.agregar(flujo)
+        except ValueError:
+            flujo.fuente.close()
+            raise
+    except (ValueError, KeyError, TypeError) as e:
+        return JSONResponse({"error": f"Flujo inválido: {e}"}, status_code=400)
+    except (OSError, ImportError) as e:  # puerto inexistente u ocupado, o pyserial sin instalar
+        return JSONResponse({"error": f"No se pudo abrir el puerto: {e}"}, status_code=503)
+    return JSONResponse({"flujo": flujo.id, **flujo.describir()}, status_code=201)
+
+
+async def eliminar(request):
+    id_flujo = request.path_params["id_flujo"]
+    if id_flujo not in ingesta.flujos:
+        return JSONResponse({"error": f"Flujo '{id_flujo}' no registrado."}, status_code=404)
+    flujo = ingesta.quitar(id_flujo)
+    return JSONResponse({"flujo": id_flujo, **flujo.describir()})
+
+
+async def predicciones(request):
+    """NDJSON con los eventos de un flujo (o de todos en /predicciones) mientras el cliente siga conectado."""
+    id_flujo = request.path_params.get("id_flujo")
+    if id_flujo is not None and id_flujo not in ingesta.flujos:
+        return JSONResponse({"error": f"Flujo '{id_flujo}' no registrado."}, status_code=404)
+    cola = ingesta.suscribir(id_flujo)
+
+    async def eventos():
+        try:
+            while True:
+                yield json.dumps(await cola.get(), ensure_ascii=False) + "\n"
+        finally:
+            ingesta.desuscribir(cola, id_flujo)
+
+    return StreamingResponse(eventos(), media_type="application/x-ndjson")
+
+
+app = Starlette(routes=[
+    Route("/", home),
+    Route("/flujos", listar_flujos, methods=["GET"]),
+    Route("/flujos", crear, methods=["POST"]),
+    Route("/flujos/{id_flujo}", eliminar, methods=["DELETE"]),
+    Route("/flujos/{id_flujo}/predicciones", predicciones),
+    Route("/predicciones", predicciones),
+], lifespan=ciclo_vida)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    print(f"✅ Servicio multisensor en http://127.0.0.1:{PUERTO_HTTP} ...")
+    uvicorn.run(app, host="0.0.0.0", port=PUERTO_HTTP)
@@ -0,0 +1,56 @@
+import threading
+import time
+import itertools
+
+
+class Sesion:
+    """Un flujo continuo de muestras de un paciente sobre una sola conexión."""
+
+    def __init__(self, id_sesion, paciente):
+        self.id = id_sesion
+        self.paciente = paciente
+        self.inicio = time.time()
+        self.muestras = 0
+        self.errores = 0
+
+    def resumen(self):
+        duracion = max(time.time() - self.inicio, 1e-9)
+        return {
+            "sesion": self.id,
+            "paciente": self.paciente,
+            "muestras": self.muestras,
+            "errores": self.errores,
+            "duracion_s": round(duracion, 3),
+            "muestras_s": round(self.muestras / duracion, 1),
+        }
+
+
+class RegistroSesiones:
+    """Sesiones de streaming abiertas, con un tope de conexiones simultáneas."""
+
+    def __init__(self, max_sesiones=64):
+        self.max_sesiones = max_sesiones
+        self._sesiones = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._cerradas = 0
+
+    def abrir(self, paciente):
+        """Registra una sesión nueva o devuelve None si ya se alcanzó el máximo."""
+        with self._lock:
+            if len(self._sesiones) >= self.max_sesiones:
+                return None
+            sesion = Sesion(next(self._ids), paciente)
+            self._sesiones[sesion.id] = sesion
+            return sesion
+
+    def cerrar(self, sesion):
+        with self._lock:
+            if self._sesiones.pop(sesion.id, None) is not None:
+                self._cerradas += 1
+
+    def estadisticas(self):
+        with self._lock:
+            activas = [s.resumen() for s in self._sesiones.values()]
+            cerradas = self._cerradas
+        return {"activas": activas, "max_sesiones": self.max_sesiones, "cerradas": cerradas}
@@ -0,0 +1,217 @@
+import numpy as np
+import os
+import threading
+import time
+
+
+def firma_archivos(rutas):
+    """(ruta, mtime_ns, tamaño) de cada archivo, o None si falta alguno."""
+    firma = []
+    for ruta in rutas:
+        try:
+            info = os.stat(ruta)
+        except FileNotFoundError:
+            return None
+        firma.append((ruta, info.st_mtime_ns, info.st_size))
+    return tuple(firma)
+
+
+class VersionModelo:
+    """Juego completo scaler + extractor + RF + encoder: se sustituye entero, nunca por partes.
+
+    Cada petición toma la versión activa una sola vez al empezar, así que termina
+    con los mismos modelos aunque a mitad de camino se active otra. Con `scaler=None`
+    el escalado ya está plegado en la primera capa del extractor (y en la cascada).
+    """
+
+    def __init__(self, scaler, extractor, rf, encoder, fuente, motor_extractor, motor_bosque,
+                 firma, t_carga, cascada=None):
+        self.scaler = scaler
+        self.extractor = extractor
+        self.rf = rf
+        self.encoder = encoder
+        self.fuente = fuente
+        self.motor_extractor = motor_extractor
+        self.motor_bosque = motor_bosque
+        self.firma = firma
+        self.t_carga = t_carga
+        self.indice_clase = {str(c): i for i, c in enumerate(encoder.classes_)}
+        self.cascada = cascada
+        self._lock = threading.Lock()
+        self._contadores_cascada = {"filas": 0, "salidas_tempranas": 0}
+        # La versión es la fecha del artefacto más reciente del juego
+        self.version = time.strftime("%Y%m%d-%H%M%S", time.localtime(max(m for _, m, _ in firma) / 1e9))
+
+    def predecir_lote(self, X, metricas=None):
+        """Ejecuta scaler → extractor → RF una sola vez sobre toda la matriz (N, 10)."""
+        if metricas:
+            return self._predecir_lote_medido(X, metricas)
+
+        X_scaled = self._escalar(X)
+        if self.cascada is None:
+            return self._hibrido(X_scaled)
+
+        # Solo las muestras inciertas para la primera etapa pagan extractor + bosque
+        labels, confianzas, inciertas = self._primera_etapa(X_scaled)
+        if inciertas.any():
+            labels[inciertas], confianzas[inciertas] = self._hibrido(X_scaled[inciertas])
+        return labels, confianzas
+
+    def _escalar(self, X):
+        return X if self.scaler is None else self.scaler.transform(X)
+
+    def _hibrido(self, X_scaled):
+        deep_features = self.extractor.predict(X_scaled, verbose=0)
+
+        # rf.predict equivale a argmax de predict_proba: se recorre el bosque una sola vez
+        probs = self.rf.predict_proba(deep_features)
+        idx = np.argmax(probs, axis=1)
+        labels = self.encoder.inverse_transform(self.rf.classes_[idx])
+        confianzas = probs[np.arange(len(idx)), idx]
+        return labels, confianzas
+
+    def _primera_etapa(self, X_scaled):
+        """Predicción de la etapa barata y máscara de las filas que no alcanzan el umbral."""
+        probs = self.cascada.predict_proba(X_scaled)
+        idx = np.argmax(probs, axis=1)
+        confianzas = probs[np.arange(len(idx)), idx]
+        inciertas = confianzas < self.cascada.umbral
+        with self._lock:
+            self._contadores_cascada["filas"] += len(idx)
+            self._contadores_cascada["salidas_tempranas"] += len(idx) - int(inciertas.sum())
+        return self.encoder.inverse_transform(idx), confianzas, inciertas
+
+    def _predecir_lote_medido(self, X, metricas):
+        """predecir_lote con temporizadores por etapa (scaler, [primera_etapa], extractor, bosque, encoder)."""
+        t0 = time.perf_counter()
+        X_scaled = self._escalar(X)
+        t1 = time.perf_counter()
+        etapas = {"scaler": t1 - t0} if self.scaler is not None else {}
+
+        inciertas = None
+        if self.cascada is not None:
+            labels, confianzas, inciertas = self._primera_etapa(X_scaled)
+            t0, t1 = t1, time.perf_counter()
+            etapas["primera_etapa"] = t1 - t0
+            if not inciertas.any():
+                metricas.observar_etapas(etapas, len(X))
+                return labels, confianzas
+            X_scaled = X_scaled[inciertas]
+
+        deep_features = self.extractor.predict(X_scaled, verbose=0)
+        t2 = time.perf_counter()
+        probs = self.rf.predict_proba(deep_features)
+        idx = np.argmax(probs, axis=1)
+        t3 = time.perf_counter()
+        labels_hibrido = self.encoder.inverse_transform(self.rf.classes_[idx])
+        confianzas_hibrido = probs[np.arange(len(idx)), idx]
+        t4 = time.perf_counter()
+
+        if inciertas is None:
+            labels, confianzas = labels_hibrido, confianzas_hibrido
+        else:
+            labels[inciertas], confianzas[inciertas] = labels_hibrido, confianzas_hibrido
+        etapas.update({"extractor": t2 - t1, "bosque": t3 - t2, "encoder": t4 - t3})
+        metricas.observar_etapas(etapas, len(X))
+        return labels, confianzas
+
+    def calentar(self, n_features, filas=64):
+        """Primera pasada fuera del camino de las peticiones (grafo de Keras, páginas del mmap)."""
+        X_scaled = self._escalar(np.zeros((filas, n_features)))
+        self._hibrido(X_scaled)  # aunque la cascada resolviera estas filas, el híbrido también se calienta
+        if self.cascada is not None:
+            self.cascada.predict_proba(X_scaled)
+
+    def estadisticas_cascada(self):
+        if self.cascada is None:
+            return {"activa": False}
+        with self._lock:
+            contadores = dict(self._contadores_cascada)
+        return {
+            "activa": True,
+            "umbral": self.cascada.umbral,
+            "temperatura": self.cascada.temperatura,
+            **contadores,
+            "fraccion_salida_temprana": round(contadores["salidas_tempranas"] / contadores["filas"], 4)
+            if contadores["filas"] else 0.0,
+        }
+
+    def describir(self):
+        return {
+            "version": self.version,
+            "t_carga_ms": round(self.t_carga * 1000, 1),
+            "fuente": self.fuente,
+            "extractor": self.motor_extractor,
+            "escalador": "fusionado" if self.scaler is None else "separado",
+            "bosque": self.motor_bosque,
+            "cascada": self.estadisticas_cascada(),
+        }
+
+
+class VigilanteModelos:
+    """Detecta un juego de artefactos nuevo, lo carga y calienta en segundo plano y lo activa.
+
+    Un juego se considera completo cuando todos sus archivos cambiaron respecto a
+    la versión activa y su firma se mantuvo igual durante dos sondeos seguidos
+    (nadie sigue escribiéndolos). Si la carga falla, la versión activa sigue
+    sirviendo y esa firma no se reintenta.
+    """
+
+    def __init__(self, rutas, cargar, activar, obtener_activa, intervalo_s=5.0):
+        self.rutas = list(rutas)
+        self.cargar = cargar
+        self.activar = activar
+        self.obtener_activa = obtener_activa
+        self.intervalo = intervalo_s
+        self.recargas = 0
+        self.ultimo_error = None
+        self._arrancar()
+
+        # Con gunicorn y preload cada worker necesita su propio hilo vigilante
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._arrancar)
+
+    def _arrancar(self):
+        self._candidata = None
+        self._descartada = None
+        self._hilo = threading.Thread(target=self._bucle, name="vigilante-modelos", daemon=True)
+        self._hilo.start()
+
+    def _bucle(self):
+        while True:
+            time.sleep(self.intervalo)
+            try:
+                self.revisar()
+            except Exception as e:  # el hilo no debe morir por un sondeo fallido
+                self.ultimo_error = str(e)
+
+    def revisar(self):
+        firma = firma_archivos(self.rutas)
+        activa = self.obtener_activa().firma
+        if firma is None or firma == activa or firma == self._descartada:
+            self._candidata = None
+            return
+        if any(nuevo[1:] == viejo[1:] for nuevo, viejo in zip(firma, activa)):
+            self._candidata = None  # juego a medio escribir: aún quedan archivos de la versión activa
+            return
+        if firma != self._candidata:
+            self._candidata = firma  # se confirma en el siguiente sondeo
+            return
+
+        print("🔄 Nuevo juego de modelos detectado, cargando en segundo plano...")
+        try:
+            nueva = self.cargar()  # devuelve la versión ya calentada
+        except Exception as e:
+            self._descartada = firma
+            self.ultimo_error = str(e)
+            print(f"❌ No se pudo cargar el nuevo juego de modelos ({e}); se mantiene la versión activa.")
+            return
+
+        self.activar(nueva)
+        self.recargas += 1
+        self.ultimo_error = None
+        self._candidata = None
+        print(f"✅ Modelos v{nueva.version} activos (carga {nueva.t_carga * 1000:.0f} ms).")
+
+    def estadisticas(self):
+        return {"intervalo_s": self.intervalo, "recargas": self.recargas, "ultimo_error": self.ultimo_error}
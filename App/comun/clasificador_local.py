@@ -0,0 +1,133 @@
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from cliente_api import ErrorApi
+from derivacion_features import derivar_features, N_CANALES, N_FEATURES
+
+# El pipeline (extractor, bosque, VersionModelo) es el mismo código que usa la API
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+
+MODEL_NN_PATH = "models/modelo_nn_v22.h5"
+MODEL_RF_PATH = "models/modelo_rf_v22.pkl"
+SCALER_PATH = "models/scaler_v22.pkl"
+ENCODER_PATH = "models/encoder_v22.pkl"
+EXTRACTOR_NPZ_PATH = "models/extractor_v22.npz"
+
+
+def cargar_modelo_local(fuente=None):
+    """VersionModelo v22 sin servidor: extractor NumPy con el scaler plegado y bosque compilado.
+
+    "paquete" usa models/modelo_v22.fisio (no hace falta ni TensorFlow ni sklearn);
+    "artefactos" los pickles y el .npz del extractor. Por defecto, el paquete si existe.
+    """
+    from paquete_modelo import cargar_paquete, MODEL_BUNDLE_PATH
+    from version_modelo import VersionModelo, firma_archivos
+
+    if fuente is None:
+        fuente = "paquete" if os.path.exists(MODEL_BUNDLE_PATH) else "artefactos"
+    t_carga = time.perf_counter()
+
+    if fuente == "paquete":
+        rutas = [MODEL_BUNDLE_PATH]
+        if not os.path.exists(MODEL_BUNDLE_PATH):
+            raise FileNotFoundError(f"❌ No se encontró {MODEL_BUNDLE_PATH}. Ejecuta paquete_modelo.py.")
+        paquete = cargar_paquete(MODEL_BUNDLE_PATH)
+        extractor, rf, encoder = paquete.extractor_fusionado, paquete.rf, paquete.encoder
+    elif fuente == "artefactos":
+        import joblib
+        from bosque_compilado import BosqueCompilado
+        from extractor_numpy import cargar_o_exportar
+
+        rutas = [MODEL_NN_PATH, MODEL_RF_PATH, SCALER_PATH, ENCODER_PATH]
+        for ruta in rutas:
+            if not os.path.exists(ruta):
+                raise FileNotFoundError(f"❌ No se encontró {ruta}. Ejecuta el reentrenamiento v22 primero.")
+        scaler = joblib.load(SCALER_PATH)
+        extractor = cargar_o_exportar(MODEL_NN_PATH, EXTRACTOR_NPZ_PATH).fusionar_escalador(scaler.mean_,
+                                                                                            scaler.scale_)
+        rf = BosqueCompilado.desde_sklearn(joblib.load(MODEL_RF_PATH))
+        encoder = joblib.load(ENCODER_PATH)
+    else:
+        raise ValueError(f"❌ Fuente de modelos no soportada: '{fuente}'. Usa 'paquete' o 'artefactos'.")
+
+    modelo = VersionModelo(None, extractor, rf, encoder, fuente, "numpy-fusionado", "compilado",
+                           firma_archivos(rutas), time.perf_counter() - t_carga)
+    modelo.calentar(N_FEATURES)
+    return modelo
+
+
+class ClienteLocal:
+    """Sustituto de ClienteFisiotech que clasifica en este mismo proceso, sin HTTP.
+
+    Misma interfaz (predecir, predecir_lote, estadisticas, cerrar), así que
+    EnviadorLotes lo usa igual: los lotes se clasifican en el hilo del enviador.
+    Acepta filas de 7 canales crudos o de 10 features *sin escalar* (el escalado
+    va plegado en el extractor). El modelo se carga en la primera llamada, o
+    antes en segundo plano con precargar().
+    """
+
+    def __init__(self, fuente=None, n_muestras=1024):
+        self.fuente = fuente
+        self._modelo = None
+        self._lock_carga = threading.Lock()
+        self._lock = threading.Lock()
+        self._latencias_ms = deque(maxlen=n_muestras)
+        self._contadores = {"llamadas": 0, "filas": 0, "reintentos": 0, "errores": 0}
+
+    @property
+    def modelo(self):
+        with self._lock_carga:
+            if self._modelo is None:
+                self._modelo = cargar_modelo_local(self.fuente)
+                print(f"✅ Modelo v{self._modelo.version} cargado en el proceso en "
+                      f"{self._modelo.t_carga * 1000:.0f} ms (fuente: {self._modelo.fuente}).")
+        return self._modelo
+
+    def precargar(self):
+        """Carga el modelo en un hilo aparte para que la interfaz no espere."""
+        threading.Thread(target=lambda: self.modelo, name="carga-modelo", daemon=True).start()
+
+    def predecir(self, features):
+        return self.predecir_lote([features])[0]
+
+    def predecir_lote(self, filas):
+        t0 = time.perf_counter()
+        try:
+            X = np.asarray(filas, dtype=np.float64)
+            if X.ndim == 2 and X.shape[1] == N_CANALES:
+                X = derivar_features(X)
+            if X.ndim != 2 or X.shape[1] != N_FEATURES:
+                raise ValueError(f"Se esperaban filas de {N_CANALES} o {N_FEATURES} valores, forma {X.shape}.")
+            labels, confianzas = self.modelo.predecir_lote(X)
+        except (ValueError, OSError) as e:
+            with self._lock:
+                self._contadores["errores"] += 1
+            raise ErrorApi(f"Inferencia local: {e}") from e
+
+        with self._lock:
+            self._latencias_ms.append((time.perf_counter() - t0) * 1000)
+            self._contadores["llamadas"] += 1
+            self._contadores["filas"] += len(X)
+        return [{"prediccion": str(label), "confianza": round(float(confianza), 3)}
+                for label, confianza in zip(labels, confianzas)]
+
+    def estadisticas(self):
+        """Contadores y latencia por lote (solo inferencia: no hay red)."""
+        with self._lock:
+            contadores = dict(self._contadores)
+            latencias = np.array(self._latencias_ms)
+        p50, p95, p99 = np.percentile(latencias, [50, 95, 99]) if len(latencias) else (0.0, 0.0, 0.0)
+        return {
+            **contadores,
+            "latencia_ms": {"media": round(float(latencias.mean()), 3) if len(latencias) else 0.0,
+                            "p50": round(float(p50), 3), "p95": round(float(p95), 3),
+                            "p99": round(float(p99), 3)},
+        }
+
+    def cerrar(self):
+        pass
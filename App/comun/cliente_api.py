@@ -0,0 +1,217 @@
+import queue
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+API_URL = "http://127.0.0.1:5000"
+ESTADOS_REINTENTABLES = (429, 502, 503, 504)
+
+
+class ErrorApi(Exception):
+    """La API respondió con error o no respondió tras agotar los reintentos."""
+
+
+def segundos_retry_after(valor, por_defecto):
+    """Retry-After en segundos ("3") o como fecha HTTP (RFC 9110); si no se entiende, `por_defecto`."""
+    if not valor:
+        return por_defecto
+    try:
+        return max(float(valor), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(valor).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return por_defecto
+
+
+class ClienteFisiotech:
+    """Cliente HTTP de la API v22 sobre una sola requests.Session (conexiones keep-alive reutilizadas).
+
+    Cada llamada tiene timeout de conexión y de lectura. Los fallos de red y las
+    respuestas 429/502/503/504 se reintentan como mucho `reintentos` veces, con
+    espera exponencial (o la que indique Retry-After, sin pasar de `espera_max_s`).
+    Los demás errores HTTP (400, 404...) no se reintentan.
+    """
+
+    def __init__(self, url_base=API_URL, modelo=None, timeout=(2.0, 5.0), reintentos=2,
+                 espera_s=0.2, espera_max_s=2.0, conexiones=4, n_muestras=1024):
+        self.url_base = url_base.rstrip("/")
+        self.modelo = modelo
+        self.timeout = timeout
+        self.reintentos = reintentos
+        self.espera_s = espera_s
+        self.espera_max_s = espera_max_s
+
+        self.sesion = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=conexiones)
+        self.sesion.mount("http://", adaptador)
+        self.sesion.mount("https://", adaptador)
+
+        self._lock = threading.Lock()
+        self._latencias_ms = deque(maxlen=n_muestras)
+        self._contadores = {"llamadas": 0, "filas": 0, "reintentos": 0, "errores": 0}
+
+    def predecir(self, features):
+        """Una muestra por /predict (7 canales crudos o 10 features) → {"prediccion", "confianza"}."""
+        return self._post("/predict", {"features": list(features)}, filas=1)
+
+    def predecir_lote(self, filas):
+        """Varias muestras en una sola petición /predict_batch → lista de resultados en el mismo orden.
+
+        Las filas inválidas vuelven como {"error": ...} sin invalidar el resto del lote.
+        """
+        filas = [list(f) for f in filas]
+        return self._post("/predict_batch", {"features": filas}, filas=len(filas))["resultados"]
+
+    def _post(self, ruta, payload, filas):
+        if self.modelo:
+            payload["model"] = self.modelo
+
+        for intento in range(self.reintentos + 1):
+            t0 = time.perf_counter()
+            espera = self.espera_s * 2 ** intento
+            try:
+                r = self.sesion.post(self.url_base + ruta, json=payload, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = ErrorApi(f"Sin respuesta de {self.url_base}{ruta}: {e}")
+            else:
+                self._registrar(t0, filas)
+                if r.status_code == 200:
+                    return r.json()
+                error = ErrorApi(f"HTTP {r.status_code}: {self._mensaje(r)}")
+                if r.status_code not in ESTADOS_REINTENTABLES:
+                    break
+                espera = segundos_retry_after(r.headers.get("Retry-After"), espera)
+
+            if intento < self.reintentos:
+                self._contar("reintentos")
+                time.sleep(min(espera, self.espera_max_s))
+
+        self._contar("errores")
+        raise error
+
+    @staticmethod
+    def _mensaje(respuesta):
+        try:
+            return respuesta.json().get("error", respuesta.text)
+        except ValueError:
+            return respuesta.text
+
+    def _registrar(self, t0, filas):
+        with self._lock:
+            self._latencias_ms.append((time.perf_counter() - t0) * 1000)
+            self._contadores["llamadas"] += 1
+            self._contadores["filas"] += filas
+
+    def _contar(self, clave):
+        with self._lock:
+            self._contadores[clave] += 1
+
+    def estadisticas(self):
+        """Contadores y latencia por llamada (ida y vuelta HTTP, sin las esperas entre reintentos)."""
+        with self._lock:
+            contadores = dict(self._contadores)
+            latencias = np.array(self._latencias_ms)
+        p50, p95, p99 = np.percentile(latencias, [50, 95, 99]) if len(latencias) else (0.0, 0.0, 0.0)
+        return {
+            **contadores,
+            "latencia_ms": {"media": round(float(latencias.mean()), 3) if len(latencias) else 0.0,
+                            "p50": round(float(p50), 3), "p95": round(float(p95), 3),
+                            "p99": round(float(p99), 3)},
+        }
+
+    def cerrar(self):
+        self.sesion.close()
+
+
+class EnviadorLotes:
+    """Junta muestras sueltas y las envía por /predict_batch al llegar a `max_lote` o a `espera_ms`.
+
+    `al_recibir(contexto, resultado)` se llama desde el hilo del enviador por cada
+    muestra, en orden de llegada; si el lote entero falla (por el motivo que sea),
+    `resultado` es {"error": ...}. Una excepción en `al_recibir` se cuenta en
+    `errores_callback` y no detiene el envío. Con la cola llena la muestra nueva se descarta: para un
+    sensor en tiempo real vale más la siguiente lectura que una atrasada.
+    """
+
+    _FIN = object()
+
+    def __init__(self, cliente, al_recibir, max_lote=32, espera_ms=50.0, max_cola=1024):
+        self.cliente = cliente
+        self.al_recibir = al_recibir
+        self.max_lote = max_lote
+        self.espera = espera_ms / 1000.0
+        self.cola = queue.Queue(maxsize=max_cola)
+        self.descartadas = 0
+        self.errores_callback = 0
+        self._hilo = threading.Thread(target=self._bucle, name="enviador-lotes", daemon=True)
+        self._hilo.start()
+
+    def agregar(self, features, contexto=None):
+        """Encola una muestra sin bloquear. Devuelve False si se descartó por cola llena."""
+        try:
+            self.cola.put_nowait((features, contexto))
+            return True
+        except queue.Full:
+            self.descartadas += 1
+            return False
+
+    def _bucle(self):
+        while True:
+            primera = self.cola.get()
+            if primera is self._FIN:
+                return
+            lote, limite, fin = [primera], time.perf_counter() + self.espera, False
+            while len(lote) < self.max_lote:
+                restante = limite - time.perf_counter()
+                try:
+                    item = self.cola.get(timeout=restante) if restante > 0 else self.cola.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._FIN:
+                    fin = True
+                    break
+                lote.append(item)
+            self._enviar(lote)
+            if fin:
+                return
+
+    def _enviar(self, lote):
+        # Ningún fallo (respuesta ilegible, error de red no previsto...) puede matar el hilo:
+        # la cola se llenaría y todas las muestras siguientes se descartarían en silencio
+        try:
+            resultados = self.cliente.predecir_lote([features for features, _ in lote])
+            if len(resultados) != len(lote):
+                raise ErrorApi(f"La API devolvió {len(resultados)} resultados para {len(lote)} muestras.")
+        except Exception as e:
+            resultados = [{"error": str(e)}] * len(lote)
+        for (_, contexto), resultado in zip(lote, resultados):
+            try:
+                self.al_recibir(contexto, resultado)
+            except Exception as e:
+                self.errores_callback += 1
+                if self.errores_callback == 1:
+                    print(f"⚠️ Error al procesar una predicción (se siguen enviando lotes): {e!r}")
+
+    def cerrar(self, timeout=5.0):
+        """Envía lo que quede en cola y detiene el hilo, sin esperar más de `timeout` segundos.
+
+        Devuelve False si el hilo no terminó (colgado en la API o muerto con la cola llena).
+        """
+        limite = time.perf_counter() + timeout
+        try:
+            self.cola.put(self._FIN, timeout=timeout)
+        except queue.Full:
+            print(f"⚠️ El enviador de lotes no vacía la cola: se cierra con {self.cola.qsize()} muestras sin enviar.")
+            return False
+        self._hilo.join(max(limite - time.perf_counter(), 0.0))
+        if self._hilo.is_alive():
+            print(f"⚠️ El enviador de lotes no terminó en {timeout:.0f} s; el hilo queda en segundo plano.")
+            return False
+        return True
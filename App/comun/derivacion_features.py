@@ -0,0 +1,38 @@
+import numpy as np
+
+# === ORDEN DE LAS FEATURES v22 ===
+CANALES_CRUDOS = ["ax", "ay", "az", "gx", "gy", "gz", "intensidad"]
+FEATURES_DERIVADAS = ["magnitud_acc", "velocidad_ang", "energia_mov"]
+FEATURES = CANALES_CRUDOS + FEATURES_DERIVADAS
+N_CANALES = len(CANALES_CRUDOS)
+N_FEATURES = len(FEATURES)
+
+
+def derivar_features(crudos):
+    """(N, 7) canales crudos → (N, 10) con magnitud_acc, velocidad_ang y energia_mov.
+
+    Acepta también una sola muestra de 7 valores y devuelve entonces un vector de 10.
+    Las sumas se hacen en el mismo orden que la fórmula original (ax² + ay² + az²),
+    así que entrenamiento, API y clientes obtienen exactamente los mismos valores.
+    """
+    crudos = np.asarray(crudos, dtype=np.float64)
+    X = crudos.reshape(1, -1) if crudos.ndim == 1 else crudos
+    if X.ndim != 2 or X.shape[1] != N_CANALES:
+        raise ValueError(f"Se esperaban {N_CANALES} canales crudos ({', '.join(CANALES_CRUDOS)}), llegaron {X.shape[-1]}.")
+
+    salida = np.empty((len(X), N_FEATURES))
+    salida[:, :N_CANALES] = X
+    for destino, (i, j, k) in ((7, (0, 1, 2)), (8, (3, 4, 5))):
+        columna = salida[:, destino]
+        np.square(X[:, i], out=columna)
+        columna += X[:, j] ** 2
+        columna += X[:, k] ** 2
+        np.sqrt(columna, out=columna)
+    np.multiply(salida[:, 7], salida[:, 8], out=salida[:, 9])
+    return salida[0] if crudos.ndim == 1 else salida
+
+
+def derivar_dataframe(df):
+    """Añade (o recalcula) las tres columnas derivadas de un DataFrame con los 7 canales crudos."""
+    df[FEATURES_DERIVADAS] = derivar_features(df[CANALES_CRUDOS].to_numpy(dtype=np.float64))[:, N_CANALES:]
+    return df
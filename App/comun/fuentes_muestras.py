@@ -0,0 +1,207 @@
+import os
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from derivacion_features import CANALES_CRUDOS
+from trama_serial import codificar_tramas
+
+BLOQUE_SIN_LIMITE = 1024  # muestras generadas de golpe con hz=0
+
+
+def abrir_puerto(puerto, baudios, timeout=None):
+    """Abre el Arduino real ("COM3", "/dev/ttyUSB0"...) o un dispositivo simulado con la misma interfaz.
+
+    "sim:data/datos_reales.csv?hz=1000&formato=binario&ruido=0.02&perdidas=0.01&malformadas=0.01&semilla=0"
+    reproduce esa sesión grabada; todas las opciones son opcionales (ver DispositivoSimulado).
+    """
+    if puerto.startswith("sim:"):
+        return DispositivoSimulado.desde_url(puerto, timeout=timeout)
+
+    import serial
+
+    return serial.Serial(puerto, baudios, timeout=timeout)
+
+
+def cargar_sesion(ruta):
+    """Los 7 canales crudos de una sesión grabada (datos_reales.csv o cualquier CSV con esas columnas)."""
+    import pandas as pd
+
+    return pd.read_csv(ruta, usecols=CANALES_CRUDOS)[CANALES_CRUDOS].to_numpy(dtype=np.float32)
+
+
+class DispositivoSimulado:
+    """Sensor simulado con la interfaz de serial.Serial que usan los lectores (readline, read, in_waiting).
+
+    Reproduce `muestras` (N, 7) a `hz` muestras por segundo, en CSV (una línea por
+    muestra, como el firmware actual) o en tramas binarias de trama_serial.py. Las
+    muestras se generan al leer, según el tiempo transcurrido: no hay hilos y el
+    ritmo no depende de lo rápido que lea el consumidor (si se atrasa, se le
+    acumulan bytes como en un puerto real). Con `hz=0` entrega tan rápido como se lea.
+
+    Inyección de fallos, por muestra:
+      ruido        desviación típica del ruido gaussiano, relativa a la de cada canal
+      perdidas     probabilidad de no enviar la muestra (en binario, el hueco de seq lo delata)
+      malformadas  probabilidad de enviarla corrupta (CSV truncado o con texto; trama con un byte alterado)
+    """
+
+    def __init__(self, muestras, hz=100.0, formato="csv", ruido=0.0, perdidas=0.0, malformadas=0.0,
+                 repetir=True, semilla=None, timeout=None):
+        if formato not in ("csv", "binario"):
+            raise ValueError(f"❌ Formato de simulación no soportado: '{formato}'. Usa 'csv' o 'binario'.")
+        self.muestras = np.asarray(muestras, dtype=np.float32)
+        self.hz = float(hz)
+        self.formato = formato
+        self.ruido = float(ruido)
+        self.perdidas = float(perdidas)
+        self.malformadas = float(malformadas)
+        self.repetir = repetir
+        self.timeout = timeout
+        self._rng = np.random.default_rng(semilla)
+        self._escala_ruido = self.ruido * self.muestras.std(axis=0)
+        self._buffer = bytearray()
+        self._t0 = time.perf_counter()
+        self._siguiente = 0  # índice global de la próxima muestra (también es su seq)
+        self.is_open = True
+        self.contadores = {"generadas": 0, "perdidas": 0, "malformadas": 0}
+
+    @classmethod
+    def desde_url(cls, url, timeout=None):
+        partes = urlparse(url)
+        opciones = {k: v[-1] for k, v in parse_qs(partes.query).items()}
+        ruta = partes.path or "data/datos_reales.csv"
+        return cls(cargar_sesion(ruta),
+                   hz=float(opciones.get("hz", 100)),
+                   formato=opciones.get("formato", "csv"),
+                   ruido=float(opciones.get("ruido", 0)),
+                   perdidas=float(opciones.get("perdidas", 0)),
+                   malformadas=float(opciones.get("malformadas", 0)),
+                   repetir=opciones.get("repetir", "1") == "1",
+                   semilla=int(opciones["semilla"]) if "semilla" in opciones else None,
+                   timeout=timeout)
+
+    # === GENERACIÓN ===
+    def _debidas(self, forzar):
+        """Muestras que el dispositivo ya debería haber enviado a estas alturas."""
+        if self.hz <= 0:
+            return self._siguiente + BLOQUE_SIN_LIMITE if forzar or not self._buffer else self._siguiente
+        return int((time.perf_counter() - self._t0) * self.hz)
+
+    def _generar(self, forzar=False):
+        hasta = self._debidas(forzar)
+        if not self.repetir:
+            hasta = min(hasta, len(self.muestras))
+        n = hasta - self._siguiente
+        if n <= 0:
+            return
+
+        indices = np.arange(self._siguiente, hasta)
+        bloque = self.muestras[indices % len(self.muestras)]
+        if self.ruido:
+            bloque = bloque + self._rng.normal(size=bloque.shape).astype(np.float32) * self._escala_ruido
+        enviadas = self._rng.random(n) >= self.perdidas if self.perdidas else np.ones(n, dtype=bool)
+        corruptas = (self._rng.random(n) < self.malformadas) & enviadas if self.malformadas else np.zeros(n, bool)
+
+        if self.formato == "binario":
+            tramas = bytearray(codificar_tramas(bloque, seq_inicial=self._siguiente % 65536))
+            vista = np.frombuffer(tramas, dtype=np.uint8).reshape(n, -1)
+            for i in np.flatnonzero(corruptas):
+                vista[i, self._rng.integers(4, vista.shape[1])] ^= 0xFF
+            self._buffer += vista[enviadas].tobytes()
+        else:
+            for fila, corrupta in zip(bloque[enviadas].tolist(), corruptas[enviadas].tolist()):
+                linea = ",".join(f"{v:.4f}" for v in fila)
+                if corrupta:
+                    linea = linea[:len(linea) // 2] if self._rng.random() < 0.5 else linea.replace(",", ",x", 1)
+                self._buffer += linea.encode() + b"\r\n"  # Serial.println del Arduino
+
+        self.contadores["generadas"] += n
+        self.contadores["perdidas"] += int(n - enviadas.sum())
+        self.contadores["malformadas"] += int(corruptas.sum())
+        self._siguiente = hasta
+
+    def _esperar(self, limite):
+        """Duerme hasta la próxima muestra; False si vence el timeout o la sesión terminó."""
+        if not self.repetir and self._siguiente >= len(self.muestras):
+            return False
+        if self.hz <= 0:
+            return True
+        siguiente = self._t0 + (self._siguiente + 1) / self.hz
+        ahora = time.perf_counter()
+        if limite is not None and siguiente > limite:
+            if limite > ahora:
+                time.sleep(limite - ahora)
+            return False
+        time.sleep(max(siguiente - ahora, 0.0))
+        return True
+
+    def _limite(self):
+        return None if self.timeout is None else time.perf_counter() + self.timeout
+
+    # === INTERFAZ DE serial.Serial ===
+    @property
+    def in_waiting(self):
+        self._generar()
+        return len(self._buffer)
+
+    def read(self, size=1):
+        """Bloquea hasta tener `size` bytes o hasta el timeout, como pyserial."""
+        limite = self._limite()
+        self._generar()
+        while len(self._buffer) < size and self._esperar(limite):
+            self._generar(forzar=True)
+        datos = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return datos
+
+    def readline(self):
+        limite = self._limite()
+        self._generar()
+        while b"\n" not in self._buffer and self._esperar(limite):
+            self._generar(forzar=True)
+        fin = self._buffer.find(b"\n") + 1 or len(self._buffer)
+        linea = bytes(self._buffer[:fin])
+        del self._buffer[:fin]
+        return linea
+
+    def reset_input_buffer(self):
+        self._generar()
+        self._buffer.clear()
+
+    def close(self):
+        self.is_open = False
+
+
+class DispositivoPty:
+    """Expone un DispositivoSimulado como puerto serie real (pseudo-terminal, solo Linux/macOS).
+
+    Los lectores existentes se prueban sin modificar: basta con PORT = disp.ruta.
+    Un hilo copia al maestro del pty todo lo que el simulador va generando.
+    """
+
+    def __init__(self, simulado):
+        import pty
+        import tty
+
+        self.simulado = simulado
+        self._maestro, self._esclavo = pty.openpty()
+        tty.setraw(self._esclavo)  # sin traducción de fin de línea ni eco
+        self.ruta = os.ttyname(self._esclavo)
+        self._activo = True
+        self._hilo = threading.Thread(target=self._bucle, name="dispositivo-pty", daemon=True)
+        self._hilo.start()
+
+    def _bucle(self):
+        self.simulado.timeout = 0.05
+        while self._activo:
+            datos = self.simulado.read(max(self.simulado.in_waiting, 1))
+            while datos:
+                datos = datos[os.write(self._maestro, datos):]
+
+    def cerrar(self):
+        self._activo = False
+        self._hilo.join(1.0)
+        os.close(self._maestro)
+        os.close(self._esclavo)
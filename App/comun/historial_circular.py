@@ -0,0 +1,79 @@
+import numpy as np
+
+from derivacion_features import CANALES_CRUDOS
+
+# Lo que guardan los dashboards por muestra: los 7 canales del sensor y la salida del modelo
+CANALES_HISTORIAL = CANALES_CRUDOS + ["prediccion", "confianza"]
+
+
+class HistorialCircular:
+    """Últimas `capacidad` muestras multicanal en un array NumPy preasignado.
+
+    Cada fila se escribe dos veces, en i y en i + capacidad: las n filas más
+    recientes quedan siempre contiguas y en orden, así que agregar() es O(1) y
+    ultimas() devuelve una vista sin copiar (de la más antigua a la más nueva),
+    lista para set_data o np.std. Tras crearlo no vuelve a reservar memoria.
+
+    El canal "prediccion" guarda el código de la etiqueta (codificar/etiqueta).
+    Un solo hilo escribe; quien lee desde otro hilo puede ver a medio escribir,
+    como mucho, la fila más antigua de la vista.
+    """
+
+    def __init__(self, capacidad, canales=CANALES_HISTORIAL, dtype=np.float64):
+        if capacidad < 1:
+            raise ValueError(f"❌ La capacidad del historial debe ser positiva, no {capacidad}.")
+        self.capacidad = int(capacidad)
+        self.canales = list(canales)
+        self.indice = {canal: i for i, canal in enumerate(self.canales)}
+        self._datos = np.zeros((2 * self.capacidad, len(self.canales)), dtype=dtype)
+        self.total = 0  # muestras agregadas desde el principio (o desde limpiar)
+        self.etiquetas = []
+        self._codigos = {}
+
+    def __len__(self):
+        return min(self.total, self.capacidad)
+
+    def agregar(self, fila):
+        """Una muestra con un valor por canal."""
+        i = self.total % self.capacidad
+        self._datos[i] = fila
+        self._datos[i + self.capacidad] = fila
+        self.total += 1
+
+    def extender(self, filas):
+        """Un bloque (k, canales) de una vez; si k supera la capacidad solo quedan las últimas."""
+        filas = np.asarray(filas)
+        k = len(filas)
+        filas = filas[-self.capacidad:]
+        inicio = (self.total + k - len(filas)) % self.capacidad
+        primero = min(len(filas), self.capacidad - inicio)
+        for desplazamiento in (0, self.capacidad):
+            self._datos[desplazamiento + inicio:desplazamiento + inicio + primero] = filas[:primero]
+            self._datos[desplazamiento:desplazamiento + len(filas) - primero] = filas[primero:]
+        self.total += k
+
+    def ultimas(self, n=None, canal=None):
+        """Vista de solo lectura de las n muestras más recientes: (n, canales), o (n,) para un canal."""
+        n = len(self) if n is None else min(n, len(self))
+        fin = self.total % self.capacidad + self.capacidad
+        vista = self._datos[fin - n:fin] if canal is None else self._datos[fin - n:fin, self._columna(canal)]
+        vista.flags.writeable = False
+        return vista
+
+    def _columna(self, canal):
+        return canal if isinstance(canal, int) else self.indice[canal]
+
+    def codificar(self, etiqueta):
+        """Código numérico de una etiqueta de predicción (se asigna la primera vez que aparece)."""
+        codigo = self._codigos.get(etiqueta)
+        if codigo is None:
+            codigo = self._codigos[etiqueta] = len(self.etiquetas)
+            self.etiquetas.append(etiqueta)
+        return codigo
+
+    def etiqueta(self, codigo):
+        return self.etiquetas[int(codigo)]
+
+    def limpiar(self):
+        """Vacía el historial sin liberar ni volver a reservar el array."""
+        self.total = 0
@@ -0,0 +1,174 @@
+import os
+import queue
+import threading
+import time
+
+from cliente_api import ClienteFisiotech, EnviadorLotes
+from clasificador_local import ClienteLocal
+from derivacion_features import N_CANALES
+from fuentes_muestras import abrir_puerto
+from historial_circular import HistorialCircular
+from trama_serial import DecodificadorTramas, leer_bloque
+
+# === CONFIGURACIÓN COMÚN DE LOS DASHBOARDS ===
+# "api": predicciones de la API en API_URL | "local": modelo v22 en este proceso, sin servidor
+INFERENCIA = os.environ.get("FISIOTECH_INFERENCIA", "api").lower()
+if INFERENCIA not in ("api", "local"):
+    raise ValueError(f"❌ FISIOTECH_INFERENCIA debe ser 'api' o 'local', no '{INFERENCIA}'.")
+API_URL = "http://127.0.0.1:5000"
+HZ_SENSOR = 100
+# Se lee al ritmo del sensor, sin pausas: el lote se dimensiona para que la ventana
+# de espera se llene con las muestras que llegan en ella (~10 peticiones/s a la API)
+ESPERA_LOTE_MS = 100  # latencia máxima añadida por juntar muestras
+MAX_LOTE = HZ_SENSOR * ESPERA_LOTE_MS // 1000  # muestras por /predict_batch
+MAX_LOTE_LOCAL = 64  # en local no hay ida y vuelta que amortizar: lotes al ritmo del sensor
+ESPERA_LOTE_LOCAL_MS = 20
+
+# Canales crudos + predicción + confianza de cada muestra en arrays preasignados:
+# minutos de historia a HZ_SENSOR sin reservar memoria por muestra ni copiar al dibujar
+HISTORIAL_S = 120
+PERIODO_UI_MS = 50  # cada cuánto recoge el hilo de Tk las predicciones pendientes
+ESPERA_ARDUINO_S = 2  # el Arduino se reinicia al abrir el puerto serie
+
+# Ventana de las gráficas y del diagnóstico de estabilidad. Se fija en segundos y no en
+# muestras: los umbrales de estabilidad se ajustaron con ~50 lecturas cada 0,3 s (~15 s)
+VENTANA_S = 15
+MUESTRAS_VENTANA = int(VENTANA_S * HZ_SENSOR)
+
+
+def crear_clasificador(al_recibir, inferencia=INFERENCIA, api_url=API_URL):
+    """Cliente (HTTP o local) y EnviadorLotes que llama a `al_recibir(contexto, resultado)`."""
+    # Las lecturas se clasifican en lotes desde un hilo aparte: por HTTP (conexiones keep-alive a
+    # la API) o, en modo local, con el modelo cargado en este proceso (puesto de cabecera sin servidor)
+    if inferencia == "local":
+        cliente = ClienteLocal()
+        cliente.precargar()
+        return cliente, EnviadorLotes(cliente, al_recibir, max_lote=MAX_LOTE_LOCAL, espera_ms=ESPERA_LOTE_LOCAL_MS)
+    cliente = ClienteFisiotech(api_url)
+    return cliente, EnviadorLotes(cliente, al_recibir, max_lote=MAX_LOTE, espera_ms=ESPERA_LOTE_MS)
+
+
+class LecturaDashboard:
+    """Lectura del sensor y clasificación en segundo plano para los dashboards Tk.
+
+    Un hilo lee el puerto (CSV o tramas binarias) y encola los 7 canales crudos
+    en el EnviadorLotes; las predicciones vuelven por una cola que el hilo de Tk
+    vacía cada PERIODO_UI_MS con root.after. Así ningún widget se toca fuera del
+    hilo de Tk y el historial tiene un único escritor. De cada tanda solo la
+    última predicción llega a `al_predecir(pred, conf)`; todas van al historial.
+    `al_estado(texto, color)` recibe avisos (tramas perdidas, errores), también
+    en el hilo de Tk.
+    """
+
+    def __init__(self, root, al_predecir, al_estado, puerto, baudios, formato="csv",
+                 inferencia=INFERENCIA, api_url=API_URL):
+        self.root = root
+        self.al_predecir = al_predecir
+        self.al_estado = al_estado
+        self.puerto = puerto
+        self.baudios = baudios
+        self.formato = formato
+        self.historial = HistorialCircular(HISTORIAL_S * HZ_SENSOR)
+        self.cliente, self.enviador = crear_clasificador(self._recibir, inferencia, api_url)
+        self.arduino = None
+        self.decodificador = None
+        self.activa = False
+        self._eventos = queue.SimpleQueue()
+        self._pendiente = self.root.after(PERIODO_UI_MS, self._atender)
+
+    # === HILO DE TK ===
+    def conectar(self):
+        """Abre el puerto y arranca la lectura. Los errores al abrir se propagan al dashboard.
+
+        La espera al reinicio del Arduino corre en el hilo de lectura: Tk no se congela.
+        """
+        self.arduino = abrir_puerto(self.puerto, self.baudios)
+        self.decodificador = DecodificadorTramas()
+        self.activa = True
+        threading.Thread(target=self._leer, args=(self.arduino,), name="lectura-sensor", daemon=True).start()
+
+    def desconectar(self):
+        """Detiene la lectura. Devuelve True si había un puerto abierto que cerrar."""
+        self.activa = False
+        if self.arduino and self.arduino.is_open:
+            self.arduino.close()
+            return True
+        return False
+
+    def cerrar(self):
+        self.desconectar()
+        if self._pendiente is not None:
+            self.root.after_cancel(self._pendiente)
+            self._pendiente = None
+        self.enviador.cerrar()
+        self.cliente.cerrar()
+
+    def _atender(self):
+        """Vacía la cola de eventos: historial completo, widgets solo con lo último."""
+        prediccion = estado = None
+        try:
+            while True:
+                evento = self._eventos.get_nowait()
+                if evento[0] == "estado":
+                    estado = evento[1:]
+                    continue
+                _, canales, resultado = evento
+                if "error" in resultado:
+                    estado = (f"⚠️ Error: {resultado['error']}", "red")
+                    continue
+                pred, conf = resultado["prediccion"].upper(), float(resultado["confianza"])
+                self.historial.agregar([*canales, self.historial.codificar(pred), conf])
+                prediccion = (pred, conf)
+        except queue.Empty:
+            pass
+        try:
+            if estado is not None:
+                self.al_estado(*estado)
+            if prediccion is not None:
+                self.al_predecir(*prediccion)
+        finally:
+            self._pendiente = self.root.after(PERIODO_UI_MS, self._atender)
+
+    # === HILOS DE LECTURA Y DEL ENVIADOR ===
+    def _recibir(self, canales, resultado):
+        self._eventos.put(("prediccion", canales, resultado))
+
+    def _avisar(self, texto, color):
+        self._eventos.put(("estado", texto, color))
+
+    def _leer(self, arduino):
+        time.sleep(ESPERA_ARDUINO_S)
+        # Un hilo por puerto abierto: si se reconecta durante la espera, este hilo termina
+        while self.activa and self.arduino is arduino:
+            try:
+                if self.formato == "binario":
+                    self._leer_tramas()
+                else:
+                    self._leer_linea()
+            except Exception as e:
+                if self.activa:  # al desconectar, el puerto cerrado a mitad de lectura no es un error
+                    self._avisar(f"⚠️ Error: {e}", "red")
+                time.sleep(0.5)
+
+    def _leer_linea(self):
+        line = self.arduino.readline().decode(errors="ignore").strip()
+        if not line or "," not in line:
+            return
+        try:
+            canales = [float(x) for x in line.split(",")[:N_CANALES]]
+        except ValueError:
+            return  # línea corrupta: se espera a la siguiente
+        if len(canales) < N_CANALES:
+            return
+
+        # 7 canales crudos: la API (o el modelo local) deriva y escala como en el entrenamiento
+        self.enviador.agregar(canales, canales)
+
+    def _leer_tramas(self):
+        """Todas las tramas disponibles en el puerto, como filas de 7 canales crudos."""
+        perdidas = self.decodificador.contadores["perdidas"]
+        _, canales = leer_bloque(self.arduino, self.decodificador)
+        if self.decodificador.contadores["perdidas"] > perdidas:
+            self._avisar(f"⚠️ Tramas perdidas: {self.decodificador.contadores['perdidas']}", "orange")
+        for muestra in canales.tolist():
+            self.enviador.agregar(muestra, muestra)
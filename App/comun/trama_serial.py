@@ -0,0 +1,129 @@
+import numpy as np
+
+# === FORMATO DE TRAMA (34 bytes, little-endian) ===
+#  0-1   sync      0xA5 0x5A
+#  2-3   seq       uint16, +1 por trama (da la vuelta en 65535)
+#  4-31  canales   7 × float32: ax, ay, az, gx, gy, gz, intensidad
+#  32-33 checksum  Fletcher-16 de los bytes 2-31 (seq + canales)
+SYNC = b"\xA5\x5A"
+N_CANALES = 7
+TRAMA = np.dtype([("sync", "<u2"), ("seq", "<u2"), ("canales", "<f4", (N_CANALES,)), ("checksum", "<u2")])
+TAMANO_TRAMA = TRAMA.itemsize
+_CUBIERTOS = slice(2, TAMANO_TRAMA - 2)  # bytes protegidos por el checksum
+_SYNC_U16 = int.from_bytes(SYNC, "little")
+
+
+def fletcher16(bytes_tramas):
+    """Fletcher-16 de cada fila de una matriz (N, k) de uint8, sin bucles por byte.
+
+    s1 = Σ b mod 255 y s2 = Σ s1_parcial mod 255; como el módulo es lineal, s2 es
+    la suma de las sumas acumuladas.
+    """
+    acumulado = np.cumsum(bytes_tramas, axis=1, dtype=np.int64)
+    s1 = acumulado[:, -1] % 255
+    s2 = acumulado.sum(axis=1) % 255
+    return ((s2 << 8) | s1).astype(np.uint16)
+
+
+def codificar_tramas(canales, seq_inicial=0):
+    """(N, 7) canales → bytes con N tramas consecutivas (lo que enviaría el firmware)."""
+    canales = np.atleast_2d(np.asarray(canales, dtype=np.float32))
+    tramas = np.zeros(len(canales), dtype=TRAMA)
+    tramas["sync"] = _SYNC_U16
+    tramas["seq"] = (seq_inicial + np.arange(len(canales))) % 65536
+    tramas["canales"] = canales
+    tramas["checksum"] = fletcher16(tramas.view(np.uint8).reshape(-1, TAMANO_TRAMA)[:, _CUBIERTOS])
+    return tramas.tobytes()
+
+
+class DecodificadorTramas:
+    """Decodifica el flujo binario del sensor por bloques grandes con numpy.frombuffer.
+
+    En el caso normal (tramas alineadas y sin errores) todo el bloque se valida
+    de una vez. Si hay bytes corruptos o perdidos, se buscan todas las palabras
+    de sincronía del bloque, se validan sus checksums en vectorizado y se
+    aceptan las tramas válidas que no se solapan: así se resincroniza en la
+    siguiente trama sana. Los huecos en `seq` cuentan como tramas perdidas.
+    """
+
+    def __init__(self):
+        self._pendiente = b""
+        self._ultimo_seq = None
+        self.contadores = {"tramas": 0, "perdidas": 0, "corruptas": 0, "bytes_descartados": 0,
+                           "resincronizaciones": 0}
+
+    def alimentar(self, datos):
+        """Añade bytes leídos del puerto → (seq (N,), canales (N, 7) float32) de las tramas completas."""
+        buffer = self._pendiente + bytes(datos)
+        n = len(buffer) // TAMANO_TRAMA
+
+        # Camino rápido: el bloque empieza en una trama y todas son válidas
+        if n and buffer[:2] == SYNC:
+            tramas = np.frombuffer(buffer, dtype=TRAMA, count=n)
+            if self._validas(tramas).all():
+                self._pendiente = buffer[n * TAMANO_TRAMA:]
+                return self._entregar(tramas)
+
+        return self._resincronizar(buffer)
+
+    @staticmethod
+    def _validas(tramas):
+        crudos = tramas.view(np.uint8).reshape(-1, TAMANO_TRAMA)
+        return (tramas["sync"] == _SYNC_U16) & (tramas["checksum"] == fletcher16(crudos[:, _CUBIERTOS]))
+
+    def _resincronizar(self, buffer):
+        datos = np.frombuffer(buffer, dtype=np.uint8)
+        candidatos = np.flatnonzero((datos[:-1] == SYNC[0]) & (datos[1:] == SYNC[1]))
+        completos = candidatos[candidatos + TAMANO_TRAMA <= len(datos)]
+
+        aceptadas = []
+        if len(completos):
+            ventanas = datos[completos[:, None] + np.arange(TAMANO_TRAMA)]
+            tramas = np.ascontiguousarray(ventanas).view(TRAMA).ravel()
+            posiciones = completos[self._validas(tramas)]
+            self.contadores["corruptas"] += len(completos) - len(posiciones)
+
+            # Tramas válidas que no se solapan, de la primera a la última (solape = sync falsa en los datos)
+            fin = 0
+            for p in posiciones:
+                if p >= fin:
+                    aceptadas.append(p)
+                    fin = p + TAMANO_TRAMA
+
+        fin = aceptadas[-1] + TAMANO_TRAMA if aceptadas else 0
+        # Se conserva desde la primera sync incompleta tras la última trama aceptada (o el último byte,
+        # que puede ser media palabra de sincronía); lo demás es basura
+        incompletos = candidatos[(candidatos >= fin) & (candidatos + TAMANO_TRAMA > len(datos))]
+        if len(incompletos):
+            corte = int(incompletos[0])
+        else:
+            corte = len(datos) - 1 if len(datos) and datos[-1] == SYNC[0] else len(datos)
+        corte = max(corte, fin)
+
+        sanos = len(aceptadas) * TAMANO_TRAMA + (len(datos) - corte)
+        descartados = len(datos) - sanos
+        if descartados:
+            self.contadores["bytes_descartados"] += int(descartados)
+            self.contadores["resincronizaciones"] += 1
+        self._pendiente = buffer[corte:]
+
+        if not aceptadas:
+            return np.empty(0, dtype=np.uint16), np.empty((0, N_CANALES), dtype=np.float32)
+        indices = np.asarray(aceptadas)[:, None] + np.arange(TAMANO_TRAMA)
+        return self._entregar(np.ascontiguousarray(datos[indices]).view(TRAMA).ravel())
+
+    def _entregar(self, tramas):
+        seq = tramas["seq"]
+        if len(seq):
+            previos = np.concatenate(([self._ultimo_seq], seq[:-1])) if self._ultimo_seq is not None else seq[:-1]
+            actuales = seq if self._ultimo_seq is not None else seq[1:]
+            saltos = (actuales.astype(np.int64) - previos.astype(np.int64)) % 65536
+            self.contadores["perdidas"] += int(np.maximum(saltos - 1, 0).sum())
+            self.contadores["tramas"] += len(seq)
+            self._ultimo_seq = int(seq[-1])
+        return seq.copy(), tramas["canales"].copy()
+
+
+def leer_bloque(puerto, decodificador):
+    """Lee todo lo disponible en el puerto serie (al menos una trama, hasta su timeout) y lo decodifica."""
+    return decodificador.alimentar(puerto.read(max(puerto.in_waiting, TAMANO_TRAMA)))
@@ -0,0 +1,190 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Cada punto de entrada se arranca de verdad en un proceso limpio, con `python -X importtime`:
+#  - la API, con `import api_fisiotech_v22` (carga el modelo configurado en FISIOTECH_*)
+#  - los scripts, ejecutando su propio código hasta la sección en la que empieza su trabajo
+#    (el bucle de Tk en los dashboards, el preprocesamiento en el reentrenamiento...)
+# import: módulos importados durante el arranque, incluidos los perezosos | carga: el resto
+# Se ejecuta desde la raíz del repositorio (models/ y data/ como en los scripts)
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+RUTA_API = os.path.join(RAIZ, "App", "api")
+RUTA_COMUN = os.path.join(RAIZ, "App", "comun")
+
+# Si faltan en el entorno, el punto de entrada se omite en vez de contar como fallo
+DEPENDENCIAS_OPCIONALES = {"tensorflow", "matplotlib", "seaborn", "PIL", "onnxruntime"}
+
+# === PRESUPUESTOS DE ARRANQUE (ms): (import, carga) ===
+ENTRADAS = {
+    "API v22 (paquete)": {
+        "modulo": "api_fisiotech_v22",
+        "entorno": {"FISIOTECH_FUENTE": "paquete", "FISIOTECH_EXTRACTOR": "numpy", "FISIOTECH_BOSQUE": "compilado"},
+        "requiere": ["models/modelo_v22.fisio"],
+        "presupuesto": (500, 50),
+    },
+    "API v22 (artefactos)": {
+        "modulo": "api_fisiotech_v22",
+        "entorno": {"FISIOTECH_FUENTE": "artefactos", "FISIOTECH_EXTRACTOR": "keras", "FISIOTECH_BOSQUE": "sklearn"},
+        "requiere": ["models/modelo_nn_v22.h5", "models/modelo_rf_v22.pkl"],
+        "presupuesto": (15000, 10000),
+    },
+    "API v22 (onnx)": {
+        "modulo": "api_fisiotech_v22",
+        "entorno": {"FISIOTECH_FUENTE": "artefactos", "FISIOTECH_EXTRACTOR": "onnx", "FISIOTECH_BOSQUE": "onnx"},
+        "requiere": ["models/extractor_v22.onnx", "models/modelo_rf_v22.onnx"],
+        "presupuesto": (3000, 3000),
+    },
+    "Dashboard PRO": {
+        "script": "App/Interfaz/fisiotech_dashboard_pro.py",
+        "hasta": "root.mainloop()",
+        "entorno": {"FISIOTECH_INFERENCIA": "api"},
+        "requiere": [],
+        "presupuesto": (2000, 3000),
+    },
+    "FisioTech PRO v2.8": {
+        "script": "App/Fisotech/fisiotech_pro_v2.8.py",
+        "hasta": "root.mainloop()",
+        "entorno": {"FISIOTECH_INFERENCIA": "api"},
+        "requiere": [],
+        "presupuesto": (2000, 3000),
+    },
+    "Reentrenamiento v22 (CLI)": {
+        "script": "App/Models/reentrenar_modelo_v22.py",
+        "hasta": "# === PREPROCESAMIENTO ===",
+        "entorno": {},
+        "requiere": ["data/datos_sinteticos_v3.csv"],
+        "presupuesto": (15000, 2000),
+    },
+    "Evaluación (cache/probar_modelo.py)": {
+        "script": "cache/probar_modelo.py",
+        "hasta": "# === CARGAR DATOS REALES Y AUMENTADOS ===",
+        "entorno": {},
+        "requiere": ["models/modelo_combinado.keras"],
+        "presupuesto": (15000, 10000),
+    },
+}
+
+MARCA = "--- arranque ---"
+PLANTILLA = """
+import sys, time, json
+sys.path[:0] = {rutas!r}
+sys.argv = [{script!r}]
+print({marca!r}, file=sys.stderr, flush=True)
+t0 = time.perf_counter()
+{codigo}
+print(json.dumps({{"total_ms": (time.perf_counter() - t0) * 1000}}))
+"""
+
+
+class Omitido(Exception):
+    """El punto de entrada no puede arrancar en este entorno (dependencia opcional o pantalla)."""
+
+
+def codigo_de_script(script, hasta):
+    """Código del script hasta la línea `hasta` (excluida), ejecutado como __main__."""
+    with open(script, encoding="utf-8") as f:
+        lineas = f.readlines()
+    for i, linea in enumerate(lineas):
+        if linea.strip().startswith(hasta):
+            fuente = "".join(lineas[:i])
+            return (f"exec(compile({fuente!r}, {script!r}, 'exec'), "
+                    f"{{'__name__': '__main__', '__file__': {script!r}}})")
+    raise RuntimeError(f"'{hasta}' no aparece en {script}")
+
+
+def tiempo_imports(stderr, modulo=None):
+    """Suma de `-X importtime` (ms) de los imports del arranque: los de primer nivel o los de `modulo`."""
+    filas = []
+    for linea in stderr.split(MARCA, 1)[-1].splitlines():
+        if not linea.startswith("import time:") or "[us]" in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        filas.append((len(nombre) - len(nombre.lstrip()), int(acumulado), nombre.strip()))
+    if not filas:
+        return 0.0
+    nivel = min(f[0] for f in filas)
+    if modulo is None:
+        return sum(us for n, us, nombre in filas if n == nivel) / 1000
+    # -X importtime lista cada módulo después de sus hijos: los del nivel siguiente previos a `modulo`
+    total = 0
+    for n, us, nombre in filas:
+        if n == nivel and nombre == modulo:
+            break
+        if n == nivel + 2:
+            total += us
+    return total / 1000
+
+
+def motivo_omision(stderr):
+    ultima = stderr.strip().splitlines()[-1] if stderr.strip() else ""
+    if ultima.startswith("ModuleNotFoundError"):
+        falta = ultima.split("'")[1].split(".")[0] if "'" in ultima else ""
+        if falta in DEPENDENCIAS_OPCIONALES:
+            return f"falta {falta}"
+    if "no display name" in ultima or "couldn't connect to display" in ultima:
+        return "sin pantalla para Tk"
+    return None
+
+
+def medir(entrada):
+    if "modulo" in entrada:
+        script, codigo = os.path.join(RUTA_API, entrada["modulo"] + ".py"), f"import {entrada['modulo']}"
+    else:
+        script = os.path.join(RAIZ, entrada["script"])
+        codigo = codigo_de_script(script, entrada["hasta"])
+    programa = PLANTILLA.format(rutas=[os.path.dirname(script), RUTA_API, RUTA_COMUN], script=script,
+                                marca=MARCA, codigo=codigo)
+    entorno = {**os.environ, "FISIOTECH_RECARGA_S": "0", **entrada["entorno"]}
+
+    t0 = time.perf_counter()
+    salida = subprocess.run([sys.executable, "-X", "importtime", "-c", programa],
+                            capture_output=True, text=True, env=entorno)
+    proceso_ms = (time.perf_counter() - t0) * 1000
+    if salida.returncode != 0:
+        motivo = motivo_omision(salida.stderr)
+        if motivo:
+            raise Omitido(motivo)
+        raise RuntimeError(salida.stderr.strip().splitlines()[-1])
+
+    total_ms = json.loads(salida.stdout.strip().splitlines()[-1])["total_ms"]
+    import_ms = tiempo_imports(salida.stderr, entrada.get("modulo"))
+    return {"import_ms": import_ms, "carga_ms": max(total_ms - import_ms, 0.0), "proceso_ms": proceso_ms}
+
+
+print("⏱️ Tiempo de arranque por punto de entrada\n")
+print(f"{'Punto de entrada':38} {'import (ms)':>14} {'carga (ms)':>14} {'proceso (ms)':>13}")
+print("-" * 82)
+
+excedidos = fallidos = omitidos = 0
+for nombre, entrada in ENTRADAS.items():
+    faltan = [r for r in entrada["requiere"] if not os.path.exists(r)]
+    if faltan:
+        print(f"{nombre:38} ⏭️ omitido (falta {', '.join(faltan)})")
+        omitidos += 1
+        continue
+    try:
+        tiempos = medir(entrada)
+    except Omitido as e:
+        print(f"{nombre:38} ⏭️ omitido ({e})")
+        omitidos += 1
+        continue
+    except RuntimeError as e:
+        print(f"{nombre:38} ❌ {e}")
+        fallidos += 1
+        continue
+
+    presupuesto_import, presupuesto_carga = entrada["presupuesto"]
+    ok_import = tiempos["import_ms"] <= presupuesto_import
+    ok_carga = tiempos["carga_ms"] <= presupuesto_carga
+    excedidos += (not ok_import) + (not ok_carga)
+    print(f"{nombre:38} {tiempos['import_ms']:8.1f} {'✅' if ok_import else '❌'}   "
+          f"{tiempos['carga_ms']:8.1f} {'✅' if ok_carga else '❌'}   {tiempos['proceso_ms']:10.1f}")
+
+if excedidos or fallidos:
+    print(f"\n❌ {excedidos} presupuestos excedidos, {fallidos} puntos de entrada sin medir.")
+else:
+    print(f"\n✅ Puntos de entrada medidos dentro de presupuesto ({omitidos} omitidos).")
+sys.exit(1 if excedidos or fallidos else 0)
@@ -0,0 +1,83 @@
+import pandas as pd
+import numpy as np
+import joblib
+import time
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+from bosque_compilado import BosqueCompilado
+from extractor_numpy import cargar_o_exportar
+
+MODEL_NN_PATH = "models/modelo_nn_v22.h5"
+MODEL_RF_PATH = "models/modelo_rf_v22.pkl"
+SCALER_PATH = "models/scaler_v22.pkl"
+EXTRACTOR_NPZ_PATH = "models/extractor_v22.npz"
+DATA_PATH = "data/datos_reales.csv"
+N_FILAS_INDIVIDUALES = 200  # filas puntuadas una a una (como en /predict)
+
+print("🌲 Bosque compilado vs RandomForest de sklearn\n")
+
+for ruta in (MODEL_RF_PATH, SCALER_PATH, DATA_PATH):
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"❌ No se encontró el archivo {ruta}")
+
+# === DEEP FEATURES DE LOS DATOS REALES ===
+df = pd.read_csv(DATA_PATH)
+df["magnitud_acc"] = np.sqrt(df["ax"]**2 + df["ay"]**2 + df["az"]**2)
+df["velocidad_ang"] = np.sqrt(df["gx"]**2 + df["gy"]**2 + df["gz"]**2)
+df["energia_mov"] = df["magnitud_acc"] * df["velocidad_ang"]
+
+features = ["ax","ay","az","gx","gy","gz","intensidad","magnitud_acc","velocidad_ang","energia_mov"]
+scaler = joblib.load(SCALER_PATH)
+extractor = cargar_o_exportar(MODEL_NN_PATH, EXTRACTOR_NPZ_PATH)
+deep = extractor.predict(scaler.transform(df[features].values))
+
+rf = joblib.load(MODEL_RF_PATH)
+t0 = time.perf_counter()
+bosque = BosqueCompilado.desde_sklearn(rf)
+print(f"🔧 Aplanado en {(time.perf_counter() - t0) * 1000:.1f} ms: "
+      f"{len(bosque.raices)} árboles, {len(bosque.feature)} nodos, profundidad {bosque.profundidad}")
+
+# === IDENTIDAD DE RESULTADOS ===
+clases, proba = bosque.predecir(deep)
+assert np.array_equal(proba, rf.predict_proba(deep)), "❌ Probabilidades distintas a sklearn"
+assert np.array_equal(clases, rf.predict(deep)), "❌ Clases distintas a sklearn"
+print(f"✅ Resultados idénticos a sklearn en {len(deep)} filas.\n")
+
+# === FILA A FILA: predict + predict_proba (camino original) vs un solo recorrido ===
+filas = deep[:N_FILAS_INDIVIDUALES]
+
+t0 = time.perf_counter()
+for fila in filas:
+    x = fila.reshape(1, -1)
+    rf.predict(x)
+    rf.predict_proba(x)
+t_sklearn = (time.perf_counter() - t0) / len(filas)
+
+t0 = time.perf_counter()
+for fila in filas:
+    bosque.predecir(fila.reshape(1, -1))
+t_compilado = (time.perf_counter() - t0) / len(filas)
+
+print(f"🐢 sklearn   (1 fila): {t_sklearn * 1000:8.3f} ms/fila")
+print(f"🚀 compilado (1 fila): {t_compilado * 1000:8.3f} ms/fila  → {t_sklearn / t_compilado:.1f}×")
+
+# === LOTES: todos los árboles juntos (pocas filas) o por grupos de árboles (lotes grandes) ===
+for n in (64, 512, len(deep)):
+    lote = deep[:n]
+    repeticiones = max(1, 2000 // n)
+    t0 = time.perf_counter()
+    for _ in range(repeticiones):
+        rf.predict_proba(lote)
+    t_sklearn_lote = (time.perf_counter() - t0) / (repeticiones * n)
+
+    t0 = time.perf_counter()
+    for _ in range(repeticiones):
+        bosque.predecir(lote)
+    t_compilado_lote = (time.perf_counter() - t0) / (repeticiones * n)
+
+    recorrido = "por grupos" if n >= BosqueCompilado.FILAS_POR_GRUPOS else "todos juntos"
+    print(f"🐢 sklearn   (lote {n:>4}): {t_sklearn_lote * 1e6:8.2f} µs/fila")
+    print(f"🚀 compilado (lote {n:>4}): {t_compilado_lote * 1e6:8.2f} µs/fila  → "
+          f"{t_sklearn_lote / t_compilado_lote:.1f}×  [{recorrido}]")
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import resource
+import time
+import numpy as np
+
+# Conexiones keep-alive inactivas contra la variante ASGI (api_fisiotech_v22_asgi.py):
+# la memoria del servidor debe mantenerse plana y /predict seguir respondiendo.
+# Lee la memoria de /proc/<pid>/status (solo Linux, servidor en la misma máquina).
+HOST = "127.0.0.1"
+PORT = 5000
+ESCALONES = [0, 500, 1000, 2000, 4000]  # conexiones inactivas abiertas en cada medición
+N_PREDICCIONES = 200
+RAFAGA = 1024  # /predict simultáneos para provocar la contrapresión (429/503)
+
+# Cada conexión es un descriptor de archivo en el cliente
+blando, duro = resource.getrlimit(resource.RLIMIT_NOFILE)
+resource.setrlimit(resource.RLIMIT_NOFILE, (min(duro, max(blando, ESCALONES[-1] + RAFAGA + 256)), duro))
+
+
+async def peticion(lector, escritor, metodo, ruta, cuerpo=None):
+    datos = json.dumps(cuerpo).encode() if cuerpo is not None else b""
+    escritor.write((f"{metodo} {ruta} HTTP/1.1\r\nHost: {HOST}\r\nConnection: keep-alive\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(datos)}\r\n\r\n").encode() + datos)
+    await escritor.drain()
+    estado = int((await lector.readline()).split()[1])
+    longitud = 0
+    while (linea := await lector.readline()) not in (b"\r\n", b""):
+        if linea.lower().startswith(b"content-length:"):
+            longitud = int(linea.split(b":")[1])
+    return estado, json.loads(await lector.readexactly(longitud))
+
+
+def rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for linea in f:
+            if linea.startswith("VmRSS:"):
+                return int(linea.split()[1]) / 1024
+
+
+async def latencia_predict(n):
+    lector, escritor = await asyncio.open_connection(HOST, PORT)
+    rng = np.random.default_rng(0)
+    tiempos = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        await peticion(lector, escritor, "POST", "/predict", {"features": rng.normal(0, 1, 10).tolist()})
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    escritor.close()
+    return np.percentile(tiempos, [50, 99])
+
+
+async def abrir_inactiva():
+    lector, escritor = await asyncio.open_connection(HOST, PORT)
+    await peticion(lector, escritor, "GET", "/")  # una petición y luego silencio
+    return escritor
+
+
+async def predict_suelto(features):
+    lector, escritor = await asyncio.open_connection(HOST, PORT)
+    try:
+        estado, _ = await peticion(lector, escritor, "POST", "/predict", {"features": features})
+        return estado
+    finally:
+        escritor.close()
+
+
+async def main():
+    lector, escritor = await asyncio.open_connection(HOST, PORT)
+    _, info = await peticion(lector, escritor, "GET", "/")
+    escritor.close()
+    pid = info["pid"]
+    print(f"📡 Servidor {info.get('servidor', '?')} (pid {pid}) | inferencia: {info.get('inferencia')}\n")
+
+    inactivas = []
+    base = rss_mb(pid)
+    for objetivo in ESCALONES:
+        while len(inactivas) < objetivo:
+            lote = min(200, objetivo - len(inactivas))
+            inactivas += await asyncio.gather(*(abrir_inactiva() for _ in range(lote)))
+        p50, p99 = await latencia_predict(N_PREDICCIONES)
+        rss = rss_mb(pid)
+        extra_kb = (rss - base) * 1024 / objetivo if objetivo else 0.0
+        print(f"🔌 {objetivo:5d} inactivas | RSS {rss:7.1f} MB (+{extra_kb:5.1f} KB/conexión) | "
+              f"/predict p50 {p50:6.2f} ms, p99 {p99:6.2f} ms")
+
+    # Ráfaga por encima de FISIOTECH_MAX_PENDIENTES: el exceso debe rechazarse, no acumularse
+    rng = np.random.default_rng(1)
+    estados = await asyncio.gather(*(predict_suelto(rng.normal(0, 1, 10).tolist()) for _ in range(RAFAGA)),
+                                   return_exceptions=True)
+    conteo = {}
+    for estado in estados:
+        clave = estado if isinstance(estado, int) else type(estado).__name__
+        conteo[clave] = conteo.get(clave, 0) + 1
+    print(f"\n🚦 Ráfaga de {RAFAGA} /predict simultáneos → {conteo}")
+
+    for escritor in inactivas:
+        escritor.close()
+
+
+asyncio.run(main())
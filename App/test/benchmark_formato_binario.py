@@ -0,0 +1,50 @@
+import json
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+from formato_binario import codificar_filas, decodificar_filas, codificar_respuesta, decodificar_respuesta
+
+# Solo se mide el coste de (de)serialización en el servidor: parsear la petición
+# hasta la matriz NumPy y serializar la respuesta. El modelo no interviene.
+TAMANOS_LOTE = [1, 64, 4096]
+REPETICIONES = 200
+CLASES = ["brazo", "flexion", "pierna", "reposo", "torsion"]
+FEATURE_COUNT = 10
+
+print("📦 Coste de parseo + serialización por fila: JSON vs binario float32\n")
+print(f"{'Lote':>6} {'JSON (µs/fila)':>16} {'Binario (µs/fila)':>19} {'Aceleración':>12} {'Bytes JSON':>11} {'Bytes bin':>10}")
+print("-" * 80)
+
+rng = np.random.default_rng(42)
+
+for n in TAMANOS_LOTE:
+    X = rng.normal(0, 1, (n, FEATURE_COUNT))
+    indices = rng.integers(0, len(CLASES), n)
+    confianzas = rng.uniform(0, 1, n)
+
+    cuerpo_json = json.dumps({"features": X.tolist()}).encode()
+    cuerpo_bin = codificar_filas(X)
+
+    t0 = time.perf_counter()
+    for _ in range(REPETICIONES):
+        filas = np.asarray(json.loads(cuerpo_json)["features"], dtype=float)
+        respuesta_json = json.dumps({"resultados": [
+            {"prediccion": CLASES[i], "confianza": round(float(c), 3)} for i, c in zip(indices, confianzas)
+        ]}).encode()
+    t_json = (time.perf_counter() - t0) / REPETICIONES / n
+
+    t0 = time.perf_counter()
+    for _ in range(REPETICIONES):
+        filas_bin = decodificar_filas(cuerpo_bin, FEATURE_COUNT)
+        respuesta_bin = codificar_respuesta(indices, confianzas, len(CLASES))
+    t_bin = (time.perf_counter() - t0) / REPETICIONES / n
+
+    # El binario viaja en float32: se compara con esa precisión
+    assert np.allclose(filas, filas_bin, rtol=1e-6, atol=1e-6)
+    assert np.array_equal(decodificar_respuesta(respuesta_bin)["clase"], indices)
+
+    print(f"{n:>6} {t_json * 1e6:>16.2f} {t_bin * 1e6:>19.3f} {t_json / t_bin:>11.1f}× "
+          f"{len(cuerpo_json) + len(respuesta_json):>11} {len(cuerpo_bin) + len(respuesta_bin):>10}")
@@ -0,0 +1,87 @@
+import requests
+import signal
+import subprocess
+import time
+import os
+import sys
+
+RUTA_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(RUTA_APP, "comun"))
+from fuentes_muestras import DispositivoSimulado, cargar_sesion
+from trama_serial import DecodificadorTramas, leer_bloque
+
+DATA_PATH = "data/datos_reales.csv"
+API_URL = "http://127.0.0.1:5000"
+FRECUENCIAS_HZ = [100, 1000, 5000, 0]  # 0 = tan rápido como lea el consumidor
+DURACION_S = 2.0
+DURACION_EXTREMO_S = 5.0
+SCRIPT_LECTOR = os.path.join(RUTA_APP, "Fisotech", "lectura_sensor_fisiotech.py")
+
+print("📡 Ingesta desde el dispositivo simulado (sin Arduino)...\n")
+
+if not os.path.exists(DATA_PATH):
+    raise FileNotFoundError(f"❌ No se encontró el archivo {DATA_PATH}")
+muestras = cargar_sesion(DATA_PATH)
+
+
+# === BUCLES DE LECTURA (mismo parseo que lectura_sensor_fisiotech.py) ===
+def leer_csv(dispositivo):
+    linea = dispositivo.readline().decode("utf-8", errors="ignore").strip()
+    if not linea or "," not in linea:
+        return 0
+    try:
+        valores = [float(x) for x in linea.split(",")]
+    except ValueError:
+        return 0
+    return 1 if len(valores) == 7 else 0
+
+
+def leer_binario(dispositivo, decodificador):
+    return len(leer_bloque(dispositivo, decodificador)[1])
+
+
+def solo_transporte(dispositivo):
+    """Vacía el puerto sin parsear: coste del propio simulador, que se resta al del lector."""
+    return len(dispositivo.read(max(dispositivo.in_waiting, 1)))
+
+
+def medir(formato, hz, lector):
+    dispositivo = DispositivoSimulado(muestras, hz=hz, formato=formato, timeout=0.1, semilla=0)
+    decodificador = DecodificadorTramas()
+    leidas, t0, cpu0 = 0, time.perf_counter(), time.process_time()
+    while time.perf_counter() - t0 < DURACION_S:
+        leidas += lector(dispositivo) if lector is solo_transporte or formato == "csv" \
+            else lector(dispositivo, decodificador)
+    transcurrido = time.perf_counter() - t0
+    return leidas, transcurrido, time.process_time() - cpu0, dispositivo.contadores["generadas"]
+
+
+print(f"{'formato':<9}{'hz':>7}{'muestras/s':>12}{'CPU lector %':>14}{'µs CPU/muestra':>16}")
+for formato, lector in (("csv", leer_csv), ("binario", leer_binario)):
+    for hz in FRECUENCIAS_HZ:
+        leidas, transcurrido, cpu, generadas = medir(formato, hz, lector)
+        _, t_base, cpu_base, generadas_base = medir(formato, hz, solo_transporte)
+        # CPU del simulador por muestra generada, descontada del total
+        cpu_lector = max(cpu - cpu_base / max(generadas_base, 1) * generadas, 0.0)
+        print(f"{formato:<9}{hz if hz else 'máx':>7}{leidas / transcurrido:12.0f}"
+              f"{cpu_lector / transcurrido * 100:13.1f}%{cpu_lector / max(leidas, 1) * 1e6:16.2f}")
+
+# === EXTREMO A EXTREMO: lectura_sensor_fisiotech.py real contra la API ===
+try:
+    requests.get(API_URL, timeout=2)
+except requests.RequestException:
+    print(f"\n⚠️ API no disponible en {API_URL}; se omite la prueba extremo a extremo.")
+    sys.exit(0)
+
+print(f"\n🔁 lectura_sensor_fisiotech.py → API durante {DURACION_EXTREMO_S:.0f} s por configuración")
+for formato in ("csv", "binario"):
+    for hz in (100, 1000):
+        entorno = {**os.environ, "FISIOTECH_PUERTO": f"sim:{DATA_PATH}?hz={hz}&formato={formato}&semilla=0",
+                   "FISIOTECH_FORMATO_SERIAL": formato, "PYTHONIOENCODING": "utf-8"}
+        proceso = subprocess.Popen([sys.executable, SCRIPT_LECTOR], env=entorno, stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT, text=True)
+        time.sleep(DURACION_EXTREMO_S)
+        proceso.send_signal(signal.SIGINT)
+        salida = proceso.communicate(timeout=30)[0]
+        resumen = [l for l in salida.splitlines() if l.startswith("📊")]
+        print(f"  {formato:<8}{hz:>6} Hz  {resumen[-1] if resumen else '⚠️ sin resumen: ' + salida[-200:]}")
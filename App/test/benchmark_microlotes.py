@@ -0,0 +1,42 @@
+import requests
+import numpy as np
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+API_URL = "http://127.0.0.1:5000"
+N_CLIENTES = 32          # dashboards simultáneos
+PETICIONES_POR_CLIENTE = 100
+
+# Lanzar la API con FISIOTECH_MICROLOTES=1 para medir el planificador
+print(f"📡 Carga concurrente: {N_CLIENTES} clientes × {PETICIONES_POR_CLIENTE} peticiones a /predict\n")
+
+def cliente(semilla):
+    rng = np.random.default_rng(semilla)
+    session = requests.Session()
+    latencias = []
+    for _ in range(PETICIONES_POR_CLIENTE):
+        features = rng.normal(0, 1, 10).tolist()
+        t0 = time.perf_counter()
+        r = session.post(f"{API_URL}/predict", json={"features": features}, timeout=10)
+        latencias.append((time.perf_counter() - t0) * 1000)
+        if r.status_code != 200:
+            print(f"⚠️ {r.status_code}: {r.text.strip()}")
+    return latencias
+
+
+t0 = time.perf_counter()
+with ThreadPoolExecutor(max_workers=N_CLIENTES) as pool:
+    latencias = np.concatenate(list(pool.map(cliente, range(N_CLIENTES))))
+duracion = time.perf_counter() - t0
+
+print(f"🚀 Throughput cliente: {len(latencias) / duracion:.1f} peticiones/s")
+print(f"⏱️ Latencia extremo a extremo: p50 {np.percentile(latencias, 50):.1f} ms | "
+      f"p95 {np.percentile(latencias, 95):.1f} ms | p99 {np.percentile(latencias, 99):.1f} ms")
+
+estado = requests.get(f"{API_URL}/planificador", timeout=5).json()
+if estado.get("activo"):
+    print("\n📊 Estadísticas del planificador:")
+    for clave, valor in estado.items():
+        print(f" - {clave}: {valor}")
+else:
+    print("\nℹ️ Planificador inactivo (FISIOTECH_MICROLOTES=0): medición sin micro-lotes.")
@@ -0,0 +1,100 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+import requests
+
+# Escalado del servidor multiproceso (gunicorn + paquete mapeado en memoria).
+# Ejecutar desde la raíz del repositorio, igual que la API. Solo Linux: la memoria
+# por worker se lee de /proc/<pid>/smaps_rollup.
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+CONFIG = os.path.join(RAIZ, "App", "api", "gunicorn_fisiotech.py")
+PUERTO = 5055
+URL = f"http://127.0.0.1:{PUERTO}"
+
+WORKERS = [1, 2, 4, 8]
+CLIENTES_POR_WORKER = 4  # procesos cliente concurrentes por worker
+DURACION_S = 10
+FILAS_POR_PETICION = 1   # 1 = /predict; >1 = /predict_batch
+
+
+def cliente(semilla, fin, contador):
+    rng = np.random.default_rng(semilla)
+    sesion = requests.Session()
+    n = 0
+    while time.time() < fin:
+        if FILAS_POR_PETICION == 1:
+            r = sesion.post(f"{URL}/predict", json={"features": rng.normal(0, 1, 10).tolist()})
+        else:
+            r = sesion.post(f"{URL}/predict_batch",
+                            json={"features": rng.normal(0, 1, (FILAS_POR_PETICION, 10)).tolist()})
+        if r.ok:
+            n += FILAS_POR_PETICION
+    with contador.get_lock():
+        contador.value += n
+
+
+def memoria_kb(pid):
+    """Rss y Pss (la memoria compartida se reparte entre los procesos que la mapean)."""
+    valores = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for linea in f:
+            campo, _, resto = linea.partition(":")
+            if campo in ("Rss", "Pss", "Shared_Clean", "Private_Dirty"):
+                valores[campo] = int(resto.split()[0])
+    return valores
+
+
+def pids_workers(pid_maestro):
+    with open(f"/proc/{pid_maestro}/task/{pid_maestro}/children") as f:
+        return [int(p) for p in f.read().split()]
+
+
+def esperar_servidor(n_workers, limite_s=60):
+    t0 = time.time()
+    while time.time() - t0 < limite_s:
+        try:
+            if requests.get(URL, timeout=1).ok:
+                return
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"El servidor con {n_workers} workers no arrancó en {limite_s} s.")
+
+
+print(f"🖥️ Núcleos disponibles: {os.cpu_count()} | {DURACION_S} s por configuración\n")
+entorno = {**os.environ, "FISIOTECH_FUENTE": "paquete", "FISIOTECH_BIND": f"127.0.0.1:{PUERTO}"}
+base = None
+
+for n_workers in WORKERS:
+    servidor = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", CONFIG, "api_fisiotech_v22:app"],
+                                env={**entorno, "FISIOTECH_WORKERS": str(n_workers)},
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        esperar_servidor(n_workers)
+        contador = multiprocessing.Value("q", 0)
+        fin = time.time() + DURACION_S
+        clientes = [multiprocessing.Process(target=cliente, args=(i, fin, contador))
+                    for i in range(n_workers * CLIENTES_POR_WORKER)]
+        for c in clientes:
+            c.start()
+        for c in clientes:
+            c.join()
+
+        filas_s = contador.value / DURACION_S
+        base = base or filas_s
+        memorias = [memoria_kb(pid) for pid in pids_workers(servidor.pid)]
+        maestro = memoria_kb(servidor.pid)
+        rss = np.mean([m["Rss"] for m in memorias]) / 1024
+        pss = np.mean([m["Pss"] for m in memorias]) / 1024
+        privada = np.mean([m["Private_Dirty"] for m in memorias]) / 1024
+        print(f"⚙️ {n_workers} workers: {filas_s:9.1f} filas/s (×{filas_s / base:4.2f}) | "
+              f"por worker RSS {rss:6.1f} MB, PSS {pss:6.1f} MB, privada {privada:5.1f} MB | "
+              f"maestro RSS {maestro['Rss'] / 1024:.1f} MB")
+    finally:
+        servidor.terminate()
+        servidor.wait()
+
+print("\n📌 PSS < RSS: la diferencia son páginas compartidas (paquete mapeado + memoria heredada del maestro).")
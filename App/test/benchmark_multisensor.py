@@ -0,0 +1,90 @@
+import asyncio
+import numpy as np
+import time
+import os
+import sys
+
+RUTA_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(RUTA_APP, "api"))
+sys.path.insert(0, os.path.join(RUTA_APP, "comun"))
+from fuentes_muestras import DispositivoSimulado, cargar_sesion
+from ingesta_multisensor import Flujo, IngestaMultisensor
+
+# Modelos y backend según FISIOTECH_* (p. ej. FISIOTECH_EXTRACTOR=numpy), como la API
+import api_fisiotech_v22 as servicio
+
+DATA_PATH = "data/datos_reales.csv"
+N_FLUJOS = [1, 4, 16, 64, 128]
+HZ_POR_FLUJO = 100
+DURACION_S = 5.0
+FORMATOS = ["csv", "binario"]
+SONDEO_MS = float(os.environ.get("FISIOTECH_FANIN_SONDEO_MS", "20"))
+
+print("📡 Ingesta multisensor: un proceso, N sensores simulados, inferencia por lotes compartida\n")
+
+if not os.path.exists(DATA_PATH):
+    raise FileNotFoundError(f"❌ No se encontró el archivo {DATA_PATH}")
+muestras = cargar_sesion(DATA_PATH)
+
+
+def dispositivos(n, formato):
+    return [DispositivoSimulado(muestras, hz=HZ_POR_FLUJO, formato=formato, semilla=i) for i in range(n)]
+
+
+async def solo_transporte(n, formato):
+    """Mismo sondeo sin parsear ni inferir: CPU del simulador y del bucle, que se resta."""
+    fuentes = dispositivos(n, formato)
+
+    async def vaciar():
+        while True:
+            for fuente in fuentes:
+                fuente.read(fuente.in_waiting)
+            await asyncio.sleep(SONDEO_MS / 1000)
+
+    tarea = asyncio.create_task(vaciar())
+    cpu0 = time.process_time()
+    await asyncio.sleep(DURACION_S)
+    cpu = time.process_time() - cpu0
+    tarea.cancel()
+    return cpu
+
+
+async def medir(n, formato):
+    ingesta = IngestaMultisensor(servicio.predecir_lote, sondeo_ms=SONDEO_MS)
+    for i, fuente in enumerate(dispositivos(n, formato)):
+        ingesta.agregar(Flujo(f"p{i}", fuente, formato=formato))
+    eventos = ingesta.suscribir(capacidad=100_000)
+
+    await asyncio.sleep(0.5)  # calentamiento
+    for flujo in ingesta.flujos.values():
+        flujo.latencias_ms.clear()
+    filas0, cpu0, t0 = ingesta.contadores["filas"], time.process_time(), time.perf_counter()
+    await asyncio.sleep(DURACION_S)
+    cpu, transcurrido = time.process_time() - cpu0, time.perf_counter() - t0
+    filas = ingesta.contadores["filas"] - filas0
+
+    latencias = np.concatenate([list(f.latencias_ms) for f in ingesta.flujos.values()])
+    descartadas = sum(f.contadores["descartadas"] for f in ingesta.flujos.values())
+    estadisticas = ingesta.estadisticas()
+    await ingesta.detener()
+    return {"filas_s": filas / transcurrido, "cpu": cpu / transcurrido, "eventos": eventos.qsize(),
+            "p50": np.percentile(latencias, 50), "p99": np.percentile(latencias, 99),
+            "lote": estadisticas["tamano_lote_medio"], "descartadas": descartadas}
+
+
+async def main():
+    for formato in FORMATOS:
+        print(f"🔌 Formato {formato}, {HZ_POR_FLUJO} Hz por sensor, sondeo cada {SONDEO_MS:.0f} ms")
+        print(f"{'flujos':>7}{'filas/s':>10}{'CPU %':>8}{'CPU neta %':>12}{'CPU %/flujo':>13}"
+              f"{'lote medio':>12}{'p50 ms':>9}{'p99 ms':>9}{'descartadas':>13}")
+        for n in N_FLUJOS:
+            r = await medir(n, formato)
+            base = await solo_transporte(n, formato) / DURACION_S
+            neta = max(r["cpu"] - base, 0.0)
+            print(f"{n:>7}{r['filas_s']:10.0f}{r['cpu'] * 100:7.1f}%{neta * 100:11.1f}%{neta * 100 / n:12.2f}%"
+                  f"{r['lote']:12.1f}{r['p50']:9.1f}{r['p99']:9.1f}{r['descartadas']:13d}")
+        print()
+    print("ℹ️ CPU neta = proceso completo menos el coste del simulador (mismo sondeo, sin parseo ni inferencia).")
+
+
+asyncio.run(main())
@@ -0,0 +1,51 @@
+import requests
+import pandas as pd
+import numpy as np
+import time
+import os
+
+API_URL = "http://127.0.0.1:5000"
+N_FILAS = 512  # filas a puntuar en cada modo
+
+print("⏱️ Comparando /predict (fila a fila) contra /predict_batch...\n")
+
+# === CARGAR DATOS REALES Y DERIVAR FEATURES ===
+DATA_PATH = "data/datos_reales.csv"
+
+if not os.path.exists(DATA_PATH):
+    raise FileNotFoundError(f"❌ No se encontró el archivo {DATA_PATH}")
+
+df = pd.read_csv(DATA_PATH).head(N_FILAS)
+df["magnitud_acc"] = np.sqrt(df["ax"]**2 + df["ay"]**2 + df["az"]**2)
+df["velocidad_ang"] = np.sqrt(df["gx"]**2 + df["gy"]**2 + df["gz"]**2)
+df["energia_mov"] = df["magnitud_acc"] * df["velocidad_ang"]
+
+features = ["ax","ay","az","gx","gy","gz","intensidad","magnitud_acc","velocidad_ang","energia_mov"]
+filas = df[features].values.tolist()
+
+session = requests.Session()
+
+# === MODO FILA A FILA ===
+t0 = time.perf_counter()
+preds_individuales = []
+for fila in filas:
+    r = session.post(f"{API_URL}/predict", json={"features": fila}, timeout=10)
+    preds_individuales.append(r.json().get("prediccion"))
+t_individual = time.perf_counter() - t0
+
+# === MODO LOTE ===
+t0 = time.perf_counter()
+r = session.post(f"{API_URL}/predict_batch", json={"features": filas}, timeout=60)
+t_lote = time.perf_counter() - t0
+preds_lote = [res.get("prediccion") for res in r.json()["resultados"]]
+
+# === RESULTADOS ===
+filas_s_individual = len(filas) / t_individual
+filas_s_lote = len(filas) / t_lote
+coincidencias = sum(a == b for a, b in zip(preds_individuales, preds_lote))
+
+print(f"📦 Filas evaluadas: {len(filas)}")
+print(f"🐢 /predict        : {filas_s_individual:10.1f} filas/s")
+print(f"🚀 /predict_batch  : {filas_s_lote:10.1f} filas/s")
+print(f"⚡ Aceleración     : {filas_s_lote / filas_s_individual:.1f}×")
+print(f"✅ Predicciones idénticas: {coincidencias}/{len(filas)}")
@@ -0,0 +1,82 @@
+import socket
+import threading
+import json
+import time
+import numpy as np
+
+HOST = "127.0.0.1"
+PORT = 5000
+N_MUESTRAS = 5000       # muestras por conexión
+MUESTRAS_POR_LINEA = 1  # >1 agrupa varias muestras en cada línea NDJSON
+N_CONEXIONES = 4        # pacientes simultáneos
+
+print(f"📡 Streaming NDJSON: {N_CONEXIONES} conexiones × {N_MUESTRAS} muestras\n")
+
+
+def leer_respuesta(archivo):
+    """Cabeceras HTTP y luego el cuerpo chunked, línea a línea."""
+    estado = archivo.readline().decode().strip()
+    while archivo.readline() not in (b"\r\n", b""):
+        pass
+    if " 200 " not in estado:
+        raise RuntimeError(estado)
+
+    pendiente = b""
+    while True:
+        tamano = int(archivo.readline().strip(), 16)
+        if tamano == 0:
+            return
+        pendiente += archivo.read(tamano)
+        archivo.readline()
+        *lineas, pendiente = pendiente.split(b"\n")
+        for linea in lineas:
+            yield json.loads(linea)
+
+
+def sesion(paciente, resultados):
+    rng = np.random.default_rng(paciente)
+    muestras = rng.normal(0, 1, (N_MUESTRAS, 10))
+    conexion = socket.create_connection((HOST, PORT))
+    conexion.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # sin Nagle: cada muestra sale al instante
+    conexion.sendall((f"POST /stream?paciente={paciente} HTTP/1.1\r\nHost: {HOST}\r\n"
+                      "Content-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n\r\n").encode())
+
+    def enviar():
+        # Un chunk por línea, como un lector serial que reenvía cada muestra al llegar
+        for i in range(0, N_MUESTRAS, MUESTRAS_POR_LINEA):
+            bloque = muestras[i:i + MUESTRAS_POR_LINEA].tolist()
+            linea = (json.dumps({"features": bloque}) + "\n").encode()
+            conexion.sendall(f"{len(linea):x}\r\n".encode() + linea + b"\r\n")
+        conexion.sendall(b"0\r\n\r\n")
+
+    t0 = time.perf_counter()
+    emisor = threading.Thread(target=enviar)
+    emisor.start()
+
+    recibidas, en_orden, fin = 0, True, None
+    for mensaje in leer_respuesta(conexion.makefile("rb")):
+        if "seq" in mensaje:
+            en_orden &= mensaje["seq"] == recibidas
+            recibidas += 1
+        elif mensaje.get("fin"):
+            fin = mensaje
+    duracion = time.perf_counter() - t0
+    emisor.join()
+    conexion.close()
+    resultados[paciente] = (recibidas, duracion, en_orden, fin)
+
+
+resultados = {}
+hilos = [threading.Thread(target=sesion, args=(p, resultados)) for p in range(N_CONEXIONES)]
+for h in hilos:
+    h.start()
+for h in hilos:
+    h.join()
+
+for paciente, (recibidas, duracion, en_orden, fin) in sorted(resultados.items()):
+    print(f"🧍 Paciente {paciente}: {recibidas} predicciones en {duracion:.2f} s → "
+          f"{recibidas / duracion:8.1f} muestras/s | orden {'✅' if en_orden else '❌'} | "
+          f"errores servidor: {fin['errores'] if fin else '?'}")
+
+total = sum(r[0] for r in resultados.values())
+print(f"\n🚀 Total: {total / max(r[1] for r in resultados.values()):.1f} muestras/s")
@@ -0,0 +1,58 @@
+import requests
+import pandas as pd
+import numpy as np
+import time
+import os
+
+API_URL = "http://127.0.0.1:5000"
+TAMANO_LOTE = 256   # filas por petición a /predict_batch
+N_INDIVIDUALES = 100  # peticiones /predict por modelo para la latencia fila a fila
+
+print("⚖️ Comparando los modelos del registro sobre datos reales...\n")
+
+# === CARGAR DATOS REALES Y DERIVAR FEATURES ===
+DATA_PATH = "data/datos_reales.csv"
+
+if not os.path.exists(DATA_PATH):
+    raise FileNotFoundError(f"❌ No se encontró el archivo {DATA_PATH}")
+
+df = pd.read_csv(DATA_PATH)
+df["magnitud_acc"] = np.sqrt(df["ax"]**2 + df["ay"]**2 + df["az"]**2)
+df["velocidad_ang"] = np.sqrt(df["gx"]**2 + df["gy"]**2 + df["gz"]**2)
+df["energia_mov"] = df["magnitud_acc"] * df["velocidad_ang"]
+
+features = ["ax","ay","az","gx","gy","gz","intensidad","magnitud_acc","velocidad_ang","energia_mov"]
+filas = df[features].values.tolist()
+etiquetas = df["etiqueta"].values
+
+session = requests.Session()
+modelos = session.get(f"{API_URL}/modelos", timeout=10).json()["modelos"]
+
+resumen = []
+for nombre in modelos:
+    predicciones = []
+    t0 = time.perf_counter()
+    for i in range(0, len(filas), TAMANO_LOTE):
+        r = session.post(f"{API_URL}/predict_batch", json={"features": filas[i:i + TAMANO_LOTE], "model": nombre},
+                         timeout=120)
+        if r.status_code != 200:
+            print(f"⚠️ {nombre}: {r.json().get('error')}")
+            break
+        predicciones += [res.get("prediccion") for res in r.json()["resultados"]]
+    else:
+        t_lote = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for fila in filas[:N_INDIVIDUALES]:
+            session.post(f"{API_URL}/predict", json={"features": fila, "model": nombre}, timeout=10)
+        t_fila = (time.perf_counter() - t0) / N_INDIVIDUALES
+
+        precision = np.mean(np.array(predicciones) == etiquetas)
+        resumen.append((nombre, precision, len(filas) / t_lote, t_fila * 1000))
+
+# === RESUMEN (latencia de servidor según /modelos) ===
+estadisticas = session.get(f"{API_URL}/modelos", timeout=10).json()["modelos"]
+print(f"\n{'modelo':<18}{'precisión':>10}{'filas/s lote':>14}{'ms /predict':>13}{'memoria MB':>12}")
+for nombre, precision, filas_s, ms in sorted(resumen, key=lambda r: r[3]):
+    print(f"{nombre:<18}{precision * 100:9.2f}%{filas_s:14.0f}{ms:13.2f}{estadisticas[nombre]['memoria_mb']:12.1f}")
+print("\n📌 Elige el modelo más barato (menor ms /predict) que alcance la precisión exigida.")
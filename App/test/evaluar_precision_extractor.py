@@ -0,0 +1,106 @@
+import pandas as pd
+import numpy as np
+import joblib
+import time
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "comun"))
+from extractor_numpy import ExtractorNumpy
+from extractor_cuantizado import ExtractorCuantizado, PRECISIONES
+from bosque_compilado import BosqueCompilado
+from derivacion_features import derivar_dataframe, FEATURES
+
+EXTRACTOR_NPZ_PATH = "models/extractor_v22.npz"
+MODEL_RF_PATH = "models/modelo_rf_v22.pkl"
+SCALER_PATH = "models/scaler_v22.pkl"
+ENCODER_PATH = "models/encoder_v22.pkl"
+DATA_PATH = "data/datos_reales.csv"
+REPORTE_PATH = "reportes/precision_extractor_v22.txt"
+REPETICIONES = 5        # pasadas completas del lote para medir filas/s
+N_FILAS_LATENCIA = 500  # filas sueltas, como /predict
+
+print("🧮 Extractor en precisión reducida frente a float32...\n")
+
+for ruta in (DATA_PATH, EXTRACTOR_NPZ_PATH, MODEL_RF_PATH, SCALER_PATH, ENCODER_PATH):
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"❌ No se encontró el archivo {ruta}")
+
+# === DATOS Y MODELOS ===
+df = derivar_dataframe(pd.read_csv(DATA_PATH))
+X = df[FEATURES].values
+etiquetas = df["etiqueta"].astype(str).values
+
+scaler = joblib.load(SCALER_PATH)
+encoder = joblib.load(ENCODER_PATH)
+bosque = BosqueCompilado.desde_sklearn(joblib.load(MODEL_RF_PATH))
+base = ExtractorNumpy.cargar(EXTRACTOR_NPZ_PATH)
+
+# Ambas variantes del extractor: con el scaler aparte y con el scaler plegado en la primera capa
+variantes = {
+    "separado": (base, scaler.transform(X)),
+    "fusionado": (base.fusionar_escalador(scaler.mean_, scaler.scale_), X),
+}
+
+
+def etiquetar(deep):
+    return encoder.inverse_transform(bosque.predict(deep)).astype(str)
+
+
+lineas = [f"{'variante':<11}{'precisión':<10}{'acuerdo':>9}{'acierto':>9}{'Δ deep máx':>12}"
+          f"{'KB disco':>10}{'KB RAM':>8}{'filas/s':>10}{'µs/fila':>9}{'vs f32':>8}"]
+conclusiones = []
+for nombre, (extractor32, entrada) in variantes.items():
+    deep32 = extractor32.predict(entrada)
+    labels32 = etiquetar(deep32)
+    for precision in PRECISIONES:
+        if precision == "float32":
+            extractor = extractor32
+            memoria = residente = sum(a.nbytes for a in extractor32.pesos + extractor32.sesgos)
+        else:
+            extractor = ExtractorCuantizado.desde_extractor(extractor32, precision)
+            memoria, residente = extractor.memoria_bytes(), extractor.memoria_residente_bytes()
+
+        deep = extractor.predict(entrada)
+        labels = etiquetar(deep)
+
+        t0 = time.perf_counter()
+        for _ in range(REPETICIONES):
+            extractor.predict(entrada)
+        filas_s = REPETICIONES * len(entrada) / (time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        for fila in entrada[:N_FILAS_LATENCIA]:
+            extractor.predict(fila.reshape(1, -1))
+        us_fila = (time.perf_counter() - t0) / N_FILAS_LATENCIA * 1e6
+        if precision == "float32":
+            us_fila32, memoria32 = us_fila, memoria
+        else:
+            conclusiones.append(f"{nombre} {precision}: {memoria32 / memoria:.1f}× menos si se guardara compacto, "
+                                f"{residente / memoria32:.1f}× la RAM de float32 y {us_fila / us_fila32:.2f}× "
+                                f"su tiempo por fila")
+
+        lineas.append(f"{nombre:<11}{precision:<10}{np.mean(labels == labels32) * 100:8.2f}%"
+                      f"{np.mean(labels == etiquetas) * 100:8.2f}%{np.max(np.abs(deep - deep32)):12.2e}"
+                      f"{memoria / 1024:10.1f}{residente / 1024:8.1f}{filas_s:10.0f}{us_fila:9.1f}"
+                      f"{us_fila / us_fila32:7.2f}×")
+
+informe = "\n".join([
+    f"Extractor v22 en precisión reducida — {len(X)} filas de {DATA_PATH}",
+    "acuerdo: etiquetas iguales a las del mismo extractor en float32 | acierto: frente a la etiqueta real",
+    "KB disco: forma compacta (no se guarda en ningún artefacto) | KB RAM: residente al predecir (pesos descuantizados)",
+    "",
+    *lineas,
+    "",
+    "Los pesos se descuantizan una vez al cargar y se calcula en float32: FISIOTECH_PRECISION solo",
+    "mide la pérdida de exactitud; no acelera la inferencia, no ahorra RAM y no cambia lo que se guarda.",
+    *conclusiones,
+])
+print(informe)
+
+os.makedirs("reportes", exist_ok=True)
+with open(REPORTE_PATH, "w", encoding="utf-8") as f:
+    f.write(informe + "\n")
+print(f"\n💾 Informe guardado en {REPORTE_PATH}")
+print("📌 FISIOTECH_PRECISION (float32 | float16 | int8) reproduce esta pérdida de exactitud en la API.")
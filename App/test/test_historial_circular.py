@@ -0,0 +1,80 @@
+import numpy as np
+import time
+import os
+import sys
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "comun"))
+from historial_circular import HistorialCircular, CANALES_HISTORIAL
+
+CAPACIDAD = 12_000  # 2 minutos a 100 Hz
+N_MUESTRAS = 50_000
+VENTANA = 50
+VENTANAS = [50, 6_000]  # la de los dashboards y 1 minuto a 100 Hz
+N_TICKS = 2_000
+
+print("🧪 Historial circular: orden, vistas sin copia y coste frente a deque...\n")
+
+rng = np.random.default_rng(25)
+muestras = rng.normal(size=(N_MUESTRAS, len(CANALES_HISTORIAL)))
+
+# === ORDEN: muestra a muestra y por bloques, dando varias vueltas ===
+historial = HistorialCircular(CAPACIDAD)
+referencia = deque(maxlen=CAPACIDAD)
+for i, fila in enumerate(muestras[:30_000]):
+    historial.agregar(fila)
+    referencia.append(fila)
+    if i in (0, 99, CAPACIDAD - 1, CAPACIDAD, 29_999):
+        assert np.array_equal(historial.ultimas(), np.array(referencia)), f"❌ Orden incorrecto tras {i + 1}"
+
+i = 30_000
+while i < N_MUESTRAS:
+    k = int(rng.integers(1, 3 * CAPACIDAD // 2))  # a veces más que la capacidad entera
+    bloque = muestras[i:i + k]
+    historial.extender(bloque)
+    referencia.extend(bloque)
+    i += len(bloque)
+    assert np.array_equal(historial.ultimas(), np.array(referencia)), f"❌ Orden incorrecto tras bloque de {k}"
+assert historial.total == N_MUESTRAS and len(historial) == CAPACIDAD
+
+# === VISTAS ===
+ultimas = historial.ultimas(VENTANA)
+confianza = historial.ultimas(VENTANA, "confianza")
+assert np.shares_memory(ultimas, historial._datos) and np.shares_memory(confianza, historial._datos)
+assert np.array_equal(confianza, muestras[-VENTANA:, CANALES_HISTORIAL.index("confianza")])
+assert not confianza.flags.writeable, "❌ La vista debería ser de solo lectura"
+assert len(HistorialCircular(10).ultimas(VENTANA)) == 0
+
+historial.limpiar()
+historial.agregar(muestras[0])
+assert np.array_equal(historial.ultimas(), muestras[:1]) and len(historial) == 1
+
+codigos = [historial.codificar(e) for e in ("BRAZO", "PIERNA", "BRAZO")]
+assert codigos == [0, 1, 0] and historial.etiqueta(1.0) == "PIERNA"
+
+# === COSTE POR TICK: 1 muestra nueva + media/desviación de la ventana (como evaluar_estabilidad) ===
+historial = HistorialCircular(CAPACIDAD)
+historial.extender(muestras[:CAPACIDAD])
+for ventana in VENTANAS:
+    intensity_history = deque(muestras[:ventana, 6], maxlen=ventana)
+    confidence_history = deque(muestras[:ventana, 8], maxlen=ventana)
+
+    t0 = time.perf_counter()
+    for fila in muestras[:N_TICKS]:
+        intensity_history.append(fila[6])
+        confidence_history.append(fila[8])
+        np.std(np.array(list(intensity_history)))
+        np.mean(np.array(list(confidence_history)))
+    t_deque = (time.perf_counter() - t0) / N_TICKS
+
+    t0 = time.perf_counter()
+    for fila in muestras[:N_TICKS]:
+        historial.agregar(fila)
+        np.std(historial.ultimas(ventana, "intensidad"))
+        np.mean(historial.ultimas(ventana, "confianza"))
+    t_anillo = (time.perf_counter() - t0) / N_TICKS
+
+    print(f"⏱️ Por tick, ventana de {ventana:>5}: deque {t_deque * 1e6:8.1f} µs | "
+          f"historial circular {t_anillo * 1e6:6.1f} µs")
+print(f"📏 {CAPACIDAD} muestras × {len(CANALES_HISTORIAL)} canales: {historial._datos.nbytes / 1e6:.1f} MB preasignados")
+print("✅ Historial circular correcto.")
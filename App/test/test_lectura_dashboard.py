@@ -0,0 +1,82 @@
+import time
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "comun"))
+from lectura_dashboard import LecturaDashboard
+
+# Se ejecuta desde la raíz del repositorio (models/ y data/ como en los dashboards)
+PUERTO = "sim:data/datos_reales.csv?hz=100&formato={formato}&perdidas=0.01&semilla=0"
+INFERENCIA = os.environ.get("FISIOTECH_INFERENCIA", "local")
+DURACION_S = 4.0
+
+print(f"🧪 Lectura de los dashboards: predicciones y avisos solo en el hilo de Tk (inferencia: {INFERENCIA})...\n")
+
+
+class RaizSimulada:
+    """Lo mínimo de tk.Tk que usa LecturaDashboard: after/after_cancel ejecutados en el hilo principal."""
+
+    def __init__(self):
+        self.pendientes = {}
+        self.siguiente = 0
+
+    def after(self, ms, funcion):
+        self.siguiente += 1
+        self.pendientes[self.siguiente] = (time.perf_counter() + ms / 1000, funcion)
+        return self.siguiente
+
+    def after_cancel(self, id_after):
+        self.pendientes.pop(id_after, None)
+
+    def bucle(self, segundos):
+        fin = time.perf_counter() + segundos
+        while time.perf_counter() < fin:
+            for id_after, (cuando, funcion) in sorted(self.pendientes.items()):
+                if cuando <= time.perf_counter():
+                    del self.pendientes[id_after]
+                    funcion()
+            time.sleep(0.005)
+
+
+hilo_tk = threading.current_thread()
+llamadas, avisos, fuera_de_tk = [], [], []
+
+
+def al_predecir(pred, conf):
+    if threading.current_thread() is not hilo_tk:
+        fuera_de_tk.append("al_predecir")
+    llamadas.append((pred, conf))
+
+
+def al_estado(texto, color):
+    if threading.current_thread() is not hilo_tk:
+        fuera_de_tk.append("al_estado")
+    avisos.append(texto)
+
+
+for formato in ("csv", "binario"):
+    llamadas.clear()
+    avisos.clear()
+    raiz = RaizSimulada()
+    lectura = LecturaDashboard(raiz, al_predecir, al_estado, PUERTO.format(formato=formato), 9600, formato,
+                               inferencia=INFERENCIA)
+    t_conexion = time.perf_counter()
+    lectura.conectar()
+    t0 = time.perf_counter()
+    assert t0 - t_conexion < 0.5, "❌ conectar() no debería bloquear el hilo de Tk durante el reinicio del Arduino"
+    raiz.bucle(DURACION_S)
+    lectura.cerrar()
+
+    # Sin pausas en la lectura, el historial sigue el ritmo del sensor (100 Hz, 1 % de muestras perdidas)
+    clasificadas = lectura.historial.total
+    esperadas = 100 * (time.perf_counter() - t0)
+    print(f"📊 {formato:>7}: {clasificadas} muestras al historial (~{esperadas:.0f} emitidas), "
+          f"{len(llamadas)} actualizaciones de la interfaz, {len(avisos)} avisos")
+    assert not fuera_de_tk, f"❌ Callbacks fuera del hilo de Tk: {set(fuera_de_tk)}"
+    assert clasificadas > 0 and llamadas, "❌ No llegó ninguna predicción"
+    assert clasificadas >= 0.8 * esperadas, "❌ La lectura no sigue el ritmo del sensor"
+    assert len(llamadas) < clasificadas, "❌ La interfaz debería recibir solo la última predicción de cada tanda"
+    assert not raiz.pendientes, "❌ cerrar() debería cancelar el sondeo de la cola"
+    assert lectura.enviador.errores_callback == 0
+print("✅ Lectura de los dashboards correcta.")
@@ -0,0 +1,80 @@
+import pandas as pd
+import numpy as np
+import joblib
+import time
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "comun"))
+from extractor_numpy import ExtractorNumpy
+from bosque_compilado import BosqueCompilado
+from cascada import PrimeraEtapa, CASCADA_PATH
+from derivacion_features import derivar_dataframe, FEATURES
+
+EXTRACTOR_NPZ_PATH = "models/extractor_v22.npz"
+MODEL_RF_PATH = "models/modelo_rf_v22.pkl"
+SCALER_PATH = "models/scaler_v22.pkl"
+DATA_PATH = "data/datos_reales.csv"
+TOLERANCIA = 1e-4
+N_FILAS_LATENCIA = 500
+
+print("🧪 Paridad del escalador plegado en la primera capa Dense...\n")
+
+for ruta in (DATA_PATH, EXTRACTOR_NPZ_PATH, MODEL_RF_PATH, SCALER_PATH):
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"❌ No se encontró el archivo {ruta}")
+
+# === DATOS CRUDOS Y MODELOS ===
+df = derivar_dataframe(pd.read_csv(DATA_PATH))
+X = df[FEATURES].values
+
+scaler = joblib.load(SCALER_PATH)
+extractor = ExtractorNumpy.cargar(EXTRACTOR_NPZ_PATH)
+fusionado = extractor.fusionar_escalador(scaler.mean_, scaler.scale_)
+bosque = BosqueCompilado.desde_sklearn(joblib.load(MODEL_RF_PATH))
+
+# === DEEP FEATURES: scaler → Dense  vs  Dense fusionada ===
+deep_separado = extractor.predict(scaler.transform(X))
+deep_fusionado = fusionado.predict(X)
+diff_max = float(np.max(np.abs(deep_separado - deep_fusionado)))
+escala_deep = float(np.max(np.abs(deep_separado)))
+print(f"📏 Diferencia absoluta máxima en deep features: {diff_max:.2e} (máx |deep| = {escala_deep:.2f})")
+assert np.allclose(deep_separado, deep_fusionado, rtol=TOLERANCIA, atol=TOLERANCIA * max(escala_deep, 1.0)), \
+    "❌ Las deep features fusionadas no son equivalentes"
+
+# === MISMAS ETIQUETAS EN EL BOSQUE ===
+etiquetas_separado = bosque.predict(deep_separado)
+etiquetas_fusionado = bosque.predict(deep_fusionado)
+iguales = np.mean(etiquetas_separado == etiquetas_fusionado)
+print(f"🌲 Etiquetas RF coincidentes: {iguales:.2%} ({len(X)} filas)")
+assert iguales == 1.0, "❌ El bosque predice etiquetas distintas con el extractor fusionado"
+
+# === CASCADA (si está entrenada) ===
+if os.path.exists(CASCADA_PATH):
+    cascada = PrimeraEtapa.cargar(CASCADA_PATH)
+    cascada_fusionada = cascada.fusionar_escalador(scaler.mean_, scaler.scale_)
+    p_separada = cascada.predict_proba(scaler.transform(X))
+    p_fusionada = cascada_fusionada.predict_proba(X)
+    print(f"🪜 Cascada: diferencia máxima de probabilidad {np.max(np.abs(p_separada - p_fusionada)):.2e}")
+    assert np.array_equal(p_separada.argmax(axis=1), p_fusionada.argmax(axis=1)), "❌ La cascada cambia de clase"
+    assert np.array_equal(p_separada.max(axis=1) >= cascada.umbral, p_fusionada.max(axis=1) >= cascada.umbral), \
+        "❌ La cascada cambia qué filas salen antes"
+else:
+    print(f"⚠️ No se encontró {CASCADA_PATH}; se omite la cascada.")
+
+# === LATENCIA FILA A FILA (camino de /predict) ===
+filas = X[:N_FILAS_LATENCIA]
+
+t0 = time.perf_counter()
+for fila in filas:
+    extractor.predict(scaler.transform(fila.reshape(1, -1)))
+t_separado = (time.perf_counter() - t0) / len(filas)
+
+t0 = time.perf_counter()
+for fila in filas:
+    fusionado.predict(fila.reshape(1, -1))
+t_fusionado = (time.perf_counter() - t0) / len(filas)
+
+print(f"\n⏱️ scaler + extractor: {t_separado * 1e6:.1f} µs/fila | extractor fusionado: {t_fusionado * 1e6:.1f} µs/fila")
+print("✅ Extractor con escalador fusionado equivalente al pipeline sin fusionar.")
@@ -0,0 +1,70 @@
+import pandas as pd
+import numpy as np
+import joblib
+import time
+import os
+import sys
+from tensorflow.keras.models import load_model, Model
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+from extractor_numpy import ExtractorNumpy
+
+MODEL_NN_PATH = "models/modelo_nn_v22.h5"
+MODEL_RF_PATH = "models/modelo_rf_v22.pkl"
+SCALER_PATH = "models/scaler_v22.pkl"
+DATA_PATH = "data/datos_reales.csv"
+TOLERANCIA = 1e-5
+
+print("🧪 Paridad del extractor NumPy contra Keras...\n")
+
+if not os.path.exists(DATA_PATH):
+    raise FileNotFoundError(f"❌ No se encontró el archivo {DATA_PATH}")
+
+# === DATOS ESCALADOS ===
+df = pd.read_csv(DATA_PATH)
+df["magnitud_acc"] = np.sqrt(df["ax"]**2 + df["ay"]**2 + df["az"]**2)
+df["velocidad_ang"] = np.sqrt(df["gx"]**2 + df["gy"]**2 + df["gz"]**2)
+df["energia_mov"] = df["magnitud_acc"] * df["velocidad_ang"]
+
+features = ["ax","ay","az","gx","gy","gz","intensidad","magnitud_acc","velocidad_ang","energia_mov"]
+scaler = joblib.load(SCALER_PATH)
+X_scaled = scaler.transform(df[features].values)
+
+# === AMBOS EXTRACTORES ===
+nn = load_model(MODEL_NN_PATH)
+extractor_keras = Model(inputs=nn.inputs, outputs=nn.layers[-2].output)
+extractor_numpy = ExtractorNumpy.desde_keras(nn)
+
+t0 = time.perf_counter()
+deep_keras = extractor_keras.predict(X_scaled, verbose=0)
+t_keras = time.perf_counter() - t0
+
+t0 = time.perf_counter()
+deep_numpy = extractor_numpy.predict(X_scaled)
+t_numpy = time.perf_counter() - t0
+
+# === COMPARACIÓN ===
+diff_max = float(np.max(np.abs(deep_keras - deep_numpy)))
+print(f"📐 Forma de salida: keras {deep_keras.shape} | numpy {deep_numpy.shape}")
+print(f"📏 Diferencia absoluta máxima: {diff_max:.2e}")
+assert deep_keras.shape == deep_numpy.shape, "❌ Formas distintas"
+assert np.allclose(deep_keras, deep_numpy, rtol=TOLERANCIA, atol=TOLERANCIA), "❌ Salidas no equivalentes"
+
+# === IDA Y VUELTA POR EL ARCHIVO .npz ===
+ruta_tmp = "models/_paridad_extractor.npz"
+extractor_numpy.guardar(ruta_tmp)
+recargado = ExtractorNumpy.cargar(ruta_tmp)
+os.remove(ruta_tmp)
+assert np.array_equal(recargado.predict(X_scaled), deep_numpy), "❌ El .npz no reproduce los pesos"
+
+# === MISMAS ETIQUETAS EN EL RANDOM FOREST ===
+if os.path.exists(MODEL_RF_PATH):
+    rf = joblib.load(MODEL_RF_PATH)
+    iguales = np.mean(rf.predict(deep_keras) == rf.predict(deep_numpy))
+    print(f"🌲 Etiquetas RF coincidentes: {iguales:.2%}")
+    assert iguales == 1.0, "❌ El RF predice etiquetas distintas"
+else:
+    print(f"⚠️ No se encontró {MODEL_RF_PATH}; se omite la comparación de etiquetas.")
+
+print(f"\n⏱️ Keras: {t_keras * 1000:.1f} ms | NumPy: {t_numpy * 1000:.1f} ms ({len(X_scaled)} filas)")
+print("✅ Extractor NumPy numéricamente equivalente al de Keras.")
@@ -0,0 +1,105 @@
+import pandas as pd
+import numpy as np
+import joblib
+import subprocess
+import time
+import os
+import sys
+
+RUTA_API = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api")
+sys.path.insert(0, RUTA_API)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "comun"))
+from extractor_numpy import cargar_o_exportar
+from bosque_compilado import BosqueCompilado
+from modelo_onnx import cargar_o_exportar_extractor, cargar_o_exportar_bosque
+from derivacion_features import derivar_dataframe, FEATURES
+
+MODEL_NN_PATH = "models/modelo_nn_v22.h5"
+MODEL_RF_PATH = "models/modelo_rf_v22.pkl"
+SCALER_PATH = "models/scaler_v22.pkl"
+EXTRACTOR_NPZ_PATH = "models/extractor_v22.npz"
+EXTRACTOR_ONNX_PATH = "models/extractor_v22.onnx"
+BOSQUE_ONNX_PATH = "models/modelo_rf_v22.onnx"
+DATA_PATH = "data/datos_reales.csv"
+TOLERANCIA = 1e-5
+N_FILAS_LATENCIA = 300
+
+# Arranque en un proceso limpio: import del runtime + carga de los artefactos de cada backend
+ARRANQUE = {
+    "keras": ("from tensorflow.keras.models import load_model, Model\n"
+              f"nn = load_model({MODEL_NN_PATH!r}); Model(inputs=nn.inputs, outputs=nn.layers[-2].output)"),
+    "onnx": ("from modelo_onnx import ExtractorOnnx, BosqueOnnx\n"
+             f"ExtractorOnnx({EXTRACTOR_ONNX_PATH!r}); BosqueOnnx({BOSQUE_ONNX_PATH!r})"),
+}
+
+print("🧪 Paridad y latencia del backend ONNX...\n")
+
+for ruta in (DATA_PATH, MODEL_NN_PATH, MODEL_RF_PATH, SCALER_PATH):
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"❌ No se encontró el archivo {ruta}")
+
+# === DATOS ESCALADOS ===
+df = derivar_dataframe(pd.read_csv(DATA_PATH))
+X_scaled = joblib.load(SCALER_PATH).transform(df[FEATURES].values)
+
+# === BACKENDS ===
+rf = joblib.load(MODEL_RF_PATH)
+extractores = {"numpy": cargar_o_exportar(MODEL_NN_PATH, EXTRACTOR_NPZ_PATH),
+               "onnx": cargar_o_exportar_extractor(MODEL_NN_PATH, EXTRACTOR_NPZ_PATH, EXTRACTOR_ONNX_PATH)}
+bosques = {"sklearn": rf, "compilado": BosqueCompilado.desde_sklearn(rf),
+           "onnx": cargar_o_exportar_bosque(MODEL_RF_PATH, BOSQUE_ONNX_PATH)}
+try:
+    from tensorflow.keras.models import load_model, Model
+
+    nn = load_model(MODEL_NN_PATH)
+    extractores["keras"] = Model(inputs=nn.inputs, outputs=nn.layers[-2].output)
+    referencia = "keras"
+except ImportError:
+    print("⚠️ TensorFlow no está instalado; la referencia del extractor es NumPy "
+          "(test_paridad_extractor_numpy.py la valida contra Keras).")
+    referencia = "numpy"
+
+# === PARIDAD DEL EXTRACTOR ===
+deep_ref = extractores[referencia].predict(X_scaled, verbose=0)
+deep_onnx = extractores["onnx"].predict(X_scaled)
+diff_max = float(np.max(np.abs(deep_ref - deep_onnx)))
+print(f"📏 Deep features ONNX vs {referencia}: diferencia máxima {diff_max:.2e}")
+assert np.allclose(deep_ref, deep_onnx, rtol=TOLERANCIA, atol=TOLERANCIA), "❌ Extractor ONNX no equivalente"
+
+# === PARIDAD DEL RANDOM FOREST (mismas deep features de entrada) ===
+probs_ref = rf.predict_proba(deep_ref)
+probs_onnx = bosques["onnx"].predict_proba(deep_ref)
+iguales = np.mean(rf.predict(deep_ref) == bosques["onnx"].predict(deep_ref))
+print(f"🌲 RF ONNX vs sklearn: diferencia máxima de probabilidad {np.max(np.abs(probs_ref - probs_onnx)):.2e}, "
+      f"etiquetas coincidentes {iguales:.2%}")
+assert np.allclose(probs_ref, probs_onnx, atol=TOLERANCIA), "❌ Probabilidades del RF ONNX no equivalentes"
+assert iguales == 1.0, "❌ El RF ONNX predice etiquetas distintas"
+
+# === LATENCIA: LOTE COMPLETO Y FILA A FILA ===
+print(f"\n{'etapa':<22}{'lote (ms)':>11}{'fila (µs)':>11}")
+for etapa, motores in (("extractor", extractores), ("bosque", bosques)):
+    entrada = X_scaled if etapa == "extractor" else deep_ref
+    for nombre, motor in motores.items():
+        ejecutar = (lambda X, m=motor: m.predict(X, verbose=0)) if etapa == "extractor" else motor.predict_proba
+        t0 = time.perf_counter()
+        ejecutar(entrada)
+        t_lote = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for fila in entrada[:N_FILAS_LATENCIA]:
+            ejecutar(fila.reshape(1, -1))
+        t_fila = (time.perf_counter() - t0) / N_FILAS_LATENCIA
+        print(f"{etapa + ' ' + nombre:<22}{t_lote * 1000:11.1f}{t_fila * 1e6:11.1f}")
+
+# === ARRANQUE EN FRÍO ===
+print(f"\n{'backend':<10}{'arranque (ms)':>15}")
+for nombre, codigo in ARRANQUE.items():
+    codigo = (f"import sys, time\nsys.path.insert(0, {RUTA_API!r})\n"
+              f"t0 = time.perf_counter()\n{codigo}\nprint((time.perf_counter() - t0) * 1000)")
+    salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True)
+    if salida.returncode != 0:
+        print(f"{nombre:<10}{'⚠️ ' + salida.stderr.strip().splitlines()[-1]}")
+    else:
+        print(f"{nombre:<10}{float(salida.stdout.strip().splitlines()[-1]):15.0f}")
+
+print("\n✅ Backend ONNX equivalente al pipeline original.")
@@ -0,0 +1,46 @@
+import pandas as pd
+import numpy as np
+import os
+import sys
+
+# Configuración del caso: paquete fusionado como v22 y v22_export cargado con otro motor de extractor
+os.environ.setdefault("FISIOTECH_FUENTE", "paquete")
+os.environ.setdefault("FISIOTECH_FUSIONADO", "1")
+os.environ.setdefault("FISIOTECH_EXTRACTOR", "onnx")
+os.environ["FISIOTECH_RECARGA_S"] = "0"
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "comun"))
+import api_fisiotech_v22 as api
+from derivacion_features import derivar_dataframe, FEATURES
+
+DATA_PATH = "data/datos_reales.csv"
+ACUERDO_MIN = 0.995  # el plegado cambia el redondeo en float32: alguna fila en la frontera puede cambiar
+
+print(f"🧪 v22 frente a v22_export con FISIOTECH_FUSIONADO=1 (fuente: {api.FUENTE_MODELOS}, "
+      f"extractor de v22_export: {api.MOTOR_EXTRACTOR})...\n")
+
+for ruta in [DATA_PATH] + api.RUTAS_V22_EXPORT:
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"❌ No se encontró el archivo {ruta}")
+
+X = derivar_dataframe(pd.read_csv(DATA_PATH))[FEATURES].values
+
+labels_v22, conf_v22 = api.predecir_con("v22", X)
+labels_export, conf_export = api.predecir_con("v22_export", X)
+acuerdo = np.mean(np.asarray(labels_v22) == np.asarray(labels_export))
+print(f"🔀 Etiquetas coincidentes: {acuerdo:.2%} ({len(X)} filas) | "
+      f"diferencia máxima de confianza {np.max(np.abs(conf_v22 - conf_export)):.3f}")
+
+modelos = api.registro.estadisticas()["modelos"]
+for nombre in ("v22", "v22_export"):
+    print(f"📋 {nombre}: extractor {modelos[nombre]['extractor']}, escalador {modelos[nombre]['escalador']}")
+
+# Solo un extractor NumPy lleva el scaler plegado; cualquier otro debe recibir las filas escaladas
+for nombre, version in (("v22", api.modelo), ("v22_export", api.registro._entradas["v22_export"].objeto)):
+    plegado = version.motor_extractor.startswith("numpy")
+    assert (version.scaler is None) == plegado, f"❌ {nombre}: scaler quitado sin extractor fusionado"
+    assert modelos[nombre]["escalador"] == ("fusionado" if plegado else "separado"), \
+        f"❌ {nombre}: /modelos no refleja el escalador cargado"
+assert acuerdo >= ACUERDO_MIN, f"❌ v22 y v22_export discrepan en el {1 - acuerdo:.1%} de las filas"
+print("✅ v22 y v22_export equivalentes con el escalador fusionado.")
@@ -0,0 +1,81 @@
+import numpy as np
+import time
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "comun"))
+from trama_serial import DecodificadorTramas, codificar_tramas, TAMANO_TRAMA
+
+N_TRAMAS = 100_000  # más de 65536: el número de secuencia da la vuelta
+N_DANADAS = 300
+N_LINEAS_CSV = 20_000
+
+print("🧪 Protocolo serie binario: decodificación, resincronización y rendimiento...\n")
+
+rng = np.random.default_rng(22)
+canales = rng.normal(size=(N_TRAMAS, 7)).astype(np.float32)
+flujo = codificar_tramas(canales)
+
+
+def decodificar_en_trozos(datos, decodificador, max_trozo=5000):
+    """Simula lecturas del puerto de tamaño arbitrario (las tramas llegan partidas)."""
+    seqs, filas, i = [], [], 0
+    while i < len(datos):
+        n = int(rng.integers(1, max_trozo))
+        seq, bloque = decodificador.alimentar(datos[i:i + n])
+        seqs.append(seq)
+        filas.append(bloque)
+        i += n
+    return np.concatenate(seqs).astype(np.int64), np.vstack(filas)
+
+
+def indices_originales(seqs):
+    """Deshace la vuelta del uint16 para comparar con las filas de origen."""
+    return np.concatenate(([seqs[0]], seqs[0] + np.cumsum(np.diff(seqs) % 65536)))
+
+
+# === FLUJO LIMPIO ===
+decodificador = DecodificadorTramas()
+seqs, filas = decodificar_en_trozos(flujo, decodificador)
+print(f"📦 Limpio: {decodificador.contadores}")
+assert np.array_equal(filas, canales), "❌ El flujo limpio no se reproduce exacto"
+assert decodificador.contadores["perdidas"] == 0 and decodificador.contadores["bytes_descartados"] == 0
+
+# === FLUJO DAÑADO: tramas perdidas, bytes alterados y basura intercalada ===
+danado = bytearray(flujo)
+perdidas = alteradas = 0
+for j in sorted(rng.choice(N_TRAMAS, N_DANADAS, replace=False), reverse=True):
+    inicio = j * TAMANO_TRAMA
+    tipo = rng.integers(3)
+    if tipo == 0:
+        del danado[inicio:inicio + TAMANO_TRAMA]
+        perdidas += 1
+    elif tipo == 1:
+        danado[inicio + int(rng.integers(2, TAMANO_TRAMA))] ^= 0xFF
+        alteradas += 1
+    else:
+        danado[inicio:inicio] = rng.integers(0, 256, size=int(rng.integers(1, 40)), dtype=np.uint8).tobytes()
+
+decodificador = DecodificadorTramas()
+seqs, filas = decodificar_en_trozos(bytes(danado), decodificador)
+print(f"🩹 Dañado ({perdidas} borradas, {alteradas} alteradas): {decodificador.contadores}")
+assert np.array_equal(filas, canales[indices_originales(seqs)]), "❌ Se aceptó una trama con datos erróneos"
+assert decodificador.contadores["perdidas"] == perdidas + alteradas, "❌ Recuento de tramas perdidas incorrecto"
+
+# === RENDIMIENTO FRENTE A CSV ===
+t0 = time.perf_counter()
+decodificador = DecodificadorTramas()
+for i in range(0, len(flujo), 4096 * TAMANO_TRAMA):
+    decodificador.alimentar(flujo[i:i + 4096 * TAMANO_TRAMA])
+t_binario = (time.perf_counter() - t0) / N_TRAMAS
+
+lineas = [(",".join(f"{v:.4f}" for v in fila) + "\n").encode() for fila in canales[:N_LINEAS_CSV]]
+t0 = time.perf_counter()
+for linea in lineas:
+    [float(x) for x in linea.decode(errors="ignore").strip().split(",")]
+t_csv = (time.perf_counter() - t0) / N_LINEAS_CSV
+
+print(f"\n⏱️ Binario: {t_binario * 1e6:.2f} µs/muestra | CSV: {t_csv * 1e6:.2f} µs/muestra "
+      f"({t_csv / t_binario:.0f}× más lento)")
+print(f"📏 Bytes por muestra: binario {TAMANO_TRAMA} | CSV ~{np.mean([len(l) for l in lineas]):.0f}")
+print("✅ Tramas binarias decodificadas y resincronizadas correctamente.")
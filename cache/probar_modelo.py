@@ -1,12 +1,8 @@
 import pandas as pd
 import numpy as np
-from tensorflow.keras.models import load_model
 import joblib
-import seaborn as sns
-import matplotlib.pyplot as plt
 import os
 from datetime import datetime
-from sklearn.metrics import confusion_matrix, ConfusionMatrixDisplay, classification_report, accuracy_score
 
 # === CONFIGURACIÓN ===
 os.makedirs("resultados", exist_ok=True)
@@ -20,6 +16,10 @@ if not os.path.exists(modelo_path):
 print("🔍 Usando modelo combinado (reales + aumentados).")
 
 # === CARGAR MODELO Y PREPROCESADORES ===
+# TensorFlow y sklearn se importan solo después de comprobar que el modelo existe
+from tensorflow.keras.models import load_model
+from sklearn.metrics import confusion_matrix, ConfusionMatrixDisplay, classification_report, accuracy_score
+
 model = load_model(modelo_path)
 scaler = joblib.load("models/scaler.pkl")
 encoder = joblib.load("models/encoder.pkl")
@@ -73,6 +73,10 @@ csv_path = f"resultados/predicciones_combinadas_{timestamp}.csv"
 resultados.to_csv(csv_path, index=False)
 print(f"💾 Predicciones guardadas en '{csv_path}'")
 
+# === GRÁFICOS (matplotlib/seaborn solo se importan al graficar) ===
+import seaborn as sns
+import matplotlib.pyplot as plt
+
 # === 1️⃣ COMPARACIÓN DE ETIQUETAS ===
 plt.figure(figsize=(12,5))
 plt.plot(y_true, 'bo-', label='Real', alpha=0.6)